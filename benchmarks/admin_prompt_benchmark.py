@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: prompt administrativo completo vs. restrito por categoria
+
+Uso:
+    python benchmarks/admin_prompt_benchmark.py          # só contagem estimada de tokens
+    python benchmarks/admin_prompt_benchmark.py --live   # chamadas reais (requer GROQ_API_KEY)
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.utils.action_catalog import build_admin_prompt, classify_category
+
+SAMPLE_MESSAGES = [
+    "cria um canal chamado avisos e um cargo Moderador",
+    "quero ver as estatísticas detalhadas do servidor",
+    "coloca modo lento de 10 segundos no geral",
+    "dá timeout de 5 minutos no usuário joao",
+    "ativa a mensagem de boas vindas e o sistema de level",
+    "vamos jogar pedra papel tesoura",
+    "me conta uma curiosidade",
+    "faz backup dos cargos e depois bloqueia o canal regras",
+    "qual a melhor forma de organizar um servidor de estudos?",
+    "bane os usuários que entraram hoje",
+]
+
+MODEL = "llama-3.3-70b-versatile"
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa grosseira (~4 caracteres por token)"""
+    return max(1, len(text) // 4)
+
+def percentile(values, pct: float) -> float:
+    """Percentil simples por posição"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def offline_report():
+    """Compara o tamanho estimado dos prompts"""
+    full = estimate_tokens(build_admin_prompt())
+    scoped_tokens = []
+
+    print(f"{'mensagem':<60} {'categoria':<16} {'completo':>9} {'restrito':>9}")
+    for message in SAMPLE_MESSAGES:
+        category = classify_category(message)
+        scoped = estimate_tokens(build_admin_prompt(category))
+        scoped_tokens.append(scoped)
+        print(f"{message[:58]:<60} {str(category):<16} {full:>9} {scoped:>9}")
+
+    mean_scoped = statistics.mean(scoped_tokens)
+    print(f"\nMédia de tokens de entrada: completo={full} restrito={mean_scoped:.0f} "
+          f"(redução de {1 - mean_scoped / full:.0%})")
+
+async def live_report(runs: int):
+    """Mede tokens reais e latência com a API Groq"""
+    from groq import AsyncGroq
+
+    client = AsyncGroq(api_key=os.environ["GROQ_API_KEY"])
+    results = {"completo": ([], []), "restrito": ([], [])}
+
+    for _ in range(runs):
+        for message in SAMPLE_MESSAGES:
+            prompts = {
+                "completo": build_admin_prompt(),
+                "restrito": build_admin_prompt(classify_category(message)),
+            }
+            for mode, prompt in prompts.items():
+                started = time.perf_counter()
+                response = await client.chat.completions.create(
+                    model=MODEL,
+                    messages=[
+                        {"role": "system", "content": prompt},
+                        {"role": "user", "content": message},
+                    ],
+                    temperature=0.7,
+                    max_tokens=1000
+                )
+                latencies, tokens = results[mode]
+                latencies.append(time.perf_counter() - started)
+                tokens.append(response.usage.prompt_tokens)
+
+    await client.close()
+
+    print(f"{'modo':<10} {'tokens (média)':>15} {'p50 (s)':>9} {'p95 (s)':>9}")
+    for mode, (latencies, tokens) in results.items():
+        print(f"{mode:<10} {statistics.mean(tokens):>15.0f} "
+              f"{percentile(latencies, 50):>9.2f} {percentile(latencies, 95):>9.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--live", action="store_true", help="faz chamadas reais à API Groq")
+    parser.add_argument("--runs", type=int, default=3, help="repetições por mensagem no modo --live")
+    args = parser.parse_args()
+
+    offline_report()
+    if args.live:
+        if not os.getenv("GROQ_API_KEY"):
+            sys.exit("GROQ_API_KEY não definida")
+        print()
+        asyncio.run(live_report(args.runs))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Teste de carga: interações /chat e /skgpt simuladas contra o servidor Groq simulado
+
+Uso:
+    python benchmarks/load_test.py --rate 20 --interactions 500
+    python benchmarks/load_test.py --rate 50 --rpm 300 --rate-429 0.02 --keys 3
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8089   # servidor já em execução
+
+Monta o bot com a mesma configuração do .env (escalonador, cache, roteador, retries,
+hedging...), troca só o endpoint do Groq e o Discord por objetos falsos, e mede
+vazão, latência por comando, tempo até a primeira resposta e espera na fila.
+/chat passa pelo SuperCommands.chat_ai e /skgpt pelo ChatCommands.handle_skgpt, como
+em produção. Respostas de erro contam na taxa de erro; acima de --max-error-rate o
+teste termina com código 1.
+"""
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+
+from benchmarks.mock_groq_server import add_server_arguments, server_from_arguments
+from bot.commands.super_commands import SuperCommands
+from bot.config import load_config
+from bot.core.bot import DiscordBot
+from bot.services.groq_service import ERROR_MESSAGE
+
+CHAT_MESSAGES = [
+    "oi, tudo bem?",
+    "me conta uma curiosidade sobre o espaço",
+    "explique detalhadamente como funciona o sistema de permissões do discord",
+    "qual a melhor forma de organizar um servidor de estudos?",
+    "me dá uma dica rápida de produtividade",
+    "compare python e javascript para quem está começando",
+]
+
+SKGPT_MESSAGES = [
+    "cria um canal chamado avisos e um cargo Moderador",
+    "quero ver as estatísticas detalhadas do servidor",
+    "coloca modo lento de 10 segundos no geral",
+    "dá timeout de 5 minutos no usuário joao",
+    "ativa a mensagem de boas vindas e o sistema de level",
+    "vamos jogar pedra papel tesoura",
+    "me conta uma piada",
+    "faz backup dos cargos e depois bloqueia o canal regras",
+]
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentil simples por posição"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def classify_outputs(outputs: List[str]) -> str:
+    """Resultado de uma interação pelo que o usuário recebeu: ok, rejected ou error"""
+    if any(ERROR_MESSAGE in text or "❌" in text for text in outputs):
+        return "error"
+    # Recusas do escalonador (fila cheia, limite do usuário) são descarte de carga, não falhas
+    if any(text.startswith(("🚦", "⏱️")) for text in outputs):
+        return "rejected"
+    return "ok" if outputs else "error"
+
+class FakeMessage:
+    """Mensagem enviada pelo followup; edições custam a latência do Discord"""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+
+    async def edit(self, content=None, embed=None, **kwargs):
+        self.interaction.record_output(content, embed)
+        await self.interaction.discord_call()
+
+class FakeFollowup:
+    """interaction.followup"""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+
+    async def send(self, content=None, embed=None, **kwargs):
+        self.interaction.record_output(content, embed)
+        await self.interaction.discord_call(output=True)
+        self.interaction.messages += 1
+        return FakeMessage(self.interaction)
+
+class FakeResponse:
+    """interaction.response"""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+
+    async def defer(self, **kwargs):
+        await self.interaction.discord_call()
+
+    async def send_message(self, content=None, embed=None, **kwargs):
+        self.interaction.record_output(content, embed)
+        await self.interaction.discord_call(output=True)
+
+class FakeInteraction:
+    """O mínimo de discord.Interaction que os comandos de chat usam"""
+
+    def __init__(self, guild_id: int, user_id: int, channel_id: int, discord_latency: float):
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.guild = None
+        self.command = None
+        self.created_at = discord.utils.utcnow()
+        self.user = SimpleNamespace(
+            id=user_id,
+            display_name=f"usuario{user_id}",
+            display_avatar=SimpleNamespace(url="https://cdn.discordapp.com/embed/avatars/0.png"),
+            guild_permissions=SimpleNamespace(administrator=True)
+        )
+        self.channel = SimpleNamespace(id=channel_id, name="geral")
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.discord_latency = discord_latency
+        self.started = time.monotonic()
+        self.first_output: Optional[float] = None
+        self.messages = 0
+        # Textos entregues ao usuário (conteúdo, título e descrição dos embeds)
+        self.outputs: List[str] = []
+
+    def record_output(self, content: Optional[str] = None, embed: Optional[discord.Embed] = None):
+        """Guarda o que o usuário veria, para a taxa de erro"""
+        texts = [content or ""]
+        if embed is not None:
+            texts += [embed.title or "", embed.description or ""]
+        text = "\n".join(text for text in texts if text)
+        if text:
+            self.outputs.append(text)
+
+    async def discord_call(self, output: bool = False):
+        """Simula a ida e volta à API do Discord"""
+        if output and self.first_output is None:
+            self.first_output = time.monotonic() - self.started
+        await asyncio.sleep(random.uniform(0.5, 1.5) * self.discord_latency)
+
+    async def edit_original_response(self, content=None, embed=None, **kwargs):
+        # O aviso de fila não é a resposta: não conta como saída
+        if not (content or "").startswith("⏳"):
+            self.record_output(content, embed)
+        await self.discord_call(output=True)
+
+class RecordingExecutor:
+    """Substitui o AdminActionExecutor: registra as ações sem tocar no Discord"""
+
+    def __init__(self, discord_latency: float):
+        self.discord_latency = discord_latency
+        self.actions: Dict[str, int] = defaultdict(int)
+
+    async def execute_action(self, action: dict, guild, interaction) -> str:
+        action_type = action.get("action", "resposta")
+        self.actions[action_type] += 1
+        if action_type == "resposta":
+            await interaction.followup.send(action.get("resposta", ""))
+            return "✅ Resposta enviada"
+        await asyncio.sleep(random.uniform(0.5, 1.5) * self.discord_latency)
+        return f"✅ {action_type} executada"
+
+async def run_load(args: argparse.Namespace) -> dict:
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = server_from_arguments(args)
+        base_url = await server.start(port=args.port)
+
+    keys = [f"gsk_loadtest_{index:04d}" for index in range(args.keys)]
+    # load_config exige as credenciais; sem .env, valores falsos bastam
+    os.environ.setdefault("DISCORD_TOKEN", "load-test")
+    os.environ.setdefault("GROQ_API_KEY", keys[0])
+    config = dataclasses.replace(
+        load_config(),
+        discord_token="load-test",
+        groq_api_key=keys[0],
+        groq_extra_api_keys=keys[1:],
+        groq_base_url=base_url,
+        tenor_api_key=None,
+        usage_db_path=None,
+        usage_metrics_path=None
+    )
+    app = DiscordBot(config)
+    chat_commands = app.chat_commands
+    executor = RecordingExecutor(args.discord_latency)
+    chat_commands.admin_executor = executor
+    # O /chat real é o do SuperCommands; o bot falso só precisa do avatar usado no rodapé
+    fake_bot = SimpleNamespace(user=SimpleNamespace(
+        display_avatar=SimpleNamespace(url="https://cdn.discordapp.com/embed/avatars/0.png")
+    ))
+    super_commands = SuperCommands(
+        fake_bot, app.groq_service,
+        admin_executor=executor,
+        usage_tracker=app.usage_tracker,
+        interactions=app.interaction_tracker
+    )
+
+    records = []
+
+    async def one(command: str):
+        guild_id = 1000 + random.randrange(args.guilds)
+        user_id = 5000 + random.randrange(args.users)
+        interaction = FakeInteraction(guild_id, user_id, guild_id * 10 + random.randrange(3), args.discord_latency)
+        if command == "skgpt":
+            await chat_commands.handle_skgpt(interaction, random.choice(SKGPT_MESSAGES))
+        else:
+            await super_commands.chat_ai.callback(super_commands, interaction, random.choice(CHAT_MESSAGES))
+        records.append({
+            "command": command,
+            "latency": time.monotonic() - interaction.started,
+            "first_output": interaction.first_output,
+            "messages": interaction.messages,
+            "outcome": classify_outputs(interaction.outputs)
+        })
+
+    print(f"▶️ {args.interactions} interações a ~{args.rate}/s contra {base_url} ({args.keys} chave(s))")
+    started = time.monotonic()
+    tasks = []
+    for _ in range(args.interactions):
+        command = "skgpt" if random.random() < args.skgpt_ratio else "chat"
+        tasks.append(asyncio.create_task(one(command)))
+        # Chegadas de Poisson
+        await asyncio.sleep(random.expovariate(args.rate))
+    await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - started
+
+    await app.groq_service.close()
+    await app.usage_tracker.close()
+    if server:
+        await server.stop()
+
+    errors = sum(1 for record in records if record["outcome"] == "error")
+    report = {
+        "interactions": len(records),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_per_s": round(len(records) / elapsed, 2),
+        "errors": errors,
+        "rejected": sum(1 for record in records if record["outcome"] == "rejected"),
+        "error_rate": round(errors / len(records), 4) if records else 0.0,
+        "commands": {},
+        "queue_delay": {
+            "samples": len(app.llm_scheduler.queue_delays),
+            "p50_s": round(percentile(list(app.llm_scheduler.queue_delays), 50), 3),
+            "p95_s": round(percentile(list(app.llm_scheduler.queue_delays), 95), 3),
+            "p99_s": round(percentile(list(app.llm_scheduler.queue_delays), 99), 3)
+        },
+        "scheduler": app.llm_scheduler.stats(),
+        "retry": app.retry_policy.stats(),
+        "interactions_tracker": app.interaction_tracker.stats(),
+        "executed_actions": dict(executor.actions)
+    }
+    for command in sorted({record["command"] for record in records}):
+        rows = [record for record in records if record["command"] == command]
+        latencies = [record["latency"] for record in rows]
+        first = [record["first_output"] for record in rows if record["first_output"] is not None]
+        report["commands"][command] = {
+            "count": len(rows),
+            "errors": sum(1 for record in rows if record["outcome"] == "error"),
+            "latency_p50_s": round(percentile(latencies, 50), 3),
+            "latency_p95_s": round(percentile(latencies, 95), 3),
+            "latency_p99_s": round(percentile(latencies, 99), 3),
+            "first_output_p50_s": round(percentile(first, 50), 3),
+            "first_output_p95_s": round(percentile(first, 95), 3)
+        }
+    if app.hedger:
+        report["hedging"] = app.hedger.stats()
+    if server:
+        report["mock_server"] = server.stats()
+
+    print(json.dumps(report, indent=2, ensure_ascii=False, default=str))
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=10.0, help="interações por segundo (média)")
+    parser.add_argument("--interactions", type=int, default=200, help="total de interações")
+    parser.add_argument("--skgpt-ratio", type=float, default=0.4, help="fração de /skgpt (o resto é /chat)")
+    parser.add_argument("--users", type=int, default=200, help="usuários distintos")
+    parser.add_argument("--guilds", type=int, default=10, help="servidores distintos")
+    parser.add_argument("--keys", type=int, default=1, help="chaves Groq simuladas no pool")
+    parser.add_argument("--discord-latency", type=float, default=0.08, help="latência média da API do Discord (s)")
+    parser.add_argument("--base-url", help="usar um servidor já em execução em vez de subir um local")
+    parser.add_argument("--port", type=int, default=8089, help="porta do servidor simulado local")
+    parser.add_argument("--seed", type=int, help="semente para repetir a mesma carga")
+    parser.add_argument("--max-error-rate", type=float, default=0.0,
+                        help="taxa de erro máxima aceita antes de falhar (0 a 1)")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    report = asyncio.run(run_load(args))
+    if report["error_rate"] > args.max_error_rate:
+        print(f"❌ Taxa de erro {report['error_rate']:.2%} acima do limite de {args.max_error_rate:.2%}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
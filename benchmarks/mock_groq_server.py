@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP local compatível com a API de chat do Groq, para testes de carga sem gastar cota
+
+Uso:
+    python benchmarks/mock_groq_server.py --port 8089 --latency lognormal:0.6,0.5 --rate-429 0.02
+    GROQ_BASE_URL=http://127.0.0.1:8089 python main.py
+
+Simula latência até o primeiro token, velocidade de geração, streaming SSE, limites
+por chave (cabeçalhos x-ratelimit-*), 429/503 aleatórios e planos de ações prontos
+para o prompt administrativo.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.utils.action_catalog import ACTION_CATEGORIES, classify_category
+
+# Planos devolvidos ao prompt admin, pela categoria detectada na mensagem
+CANNED_PLANS: Dict[Optional[str], List[dict]] = {
+    "BÁSICO": [
+        {"action": "criar_canal", "nome": "avisos"},
+        {"action": "criar_cargo", "nome": "Moderador", "cor": "5865F2"}
+    ],
+    "INFORMAÇÕES": [{"action": "stats_detalhadas"}],
+    "GERENCIAMENTO": [{"action": "slowmode", "nome": "geral", "valor": 10}],
+    "MODERAÇÃO": [{"action": "timeout_usuario", "nome": "joao", "valor": 5}],
+    "AUTOMAÇÃO": [{"action": "welcome_msg"}, {"action": "level_system"}],
+    "ENTRETENIMENTO": [{"action": "rock_paper"}],
+    None: [{"action": "resposta", "resposta": "Claro! Posso ajudar com isso. O que mais você precisa?"}],
+}
+
+WORDS = ("o servidor pode organizar canais por tema e usar cargos para separar permissões "
+         "uma boa prática é manter regras claras fixadas e um canal de avisos").split()
+
+def parse_distribution(spec: str):
+    """
+    Cria um amostrador de latência a partir de "tipo:parâmetros"
+
+    fixed:0.5 | uniform:0.2,1.5 | exp:0.6 (média) | lognormal:0.6,0.5 (mediana, sigma)
+    """
+    kind, _, raw = spec.partition(":")
+    params = [float(value) for value in raw.split(",") if value]
+    if kind == "fixed":
+        return lambda: params[0]
+    if kind == "uniform":
+        return lambda: random.uniform(params[0], params[1])
+    if kind == "exp":
+        return lambda: random.expovariate(1.0 / params[0])
+    if kind == "lognormal":
+        return lambda: random.lognormvariate(math.log(params[0]), params[1])
+    raise ValueError(f"Distribuição desconhecida: {spec}")
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa grosseira (~4 caracteres por token)"""
+    return max(1, len(text) // 4)
+
+class _KeyWindow:
+    """Janela de um minuto de requisições e tokens de uma chave"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.tokens = 0
+
+class MockGroqServer:
+    """Implementa POST /openai/v1/chat/completions com comportamento configurável"""
+
+    def __init__(self, ttft=None, token_rate: float = 250.0, rpm: int = 0, tpm: int = 0,
+                 rate_429: float = 0.0, rate_503: float = 0.0, retry_after: float = 1.0,
+                 plans: Optional[Dict[Optional[str], List[dict]]] = None):
+        self.ttft = ttft or parse_distribution("lognormal:0.5,0.4")
+        self.token_rate = token_rate
+        self.rpm = rpm
+        self.tpm = tpm
+        self.rate_429 = rate_429
+        self.rate_503 = rate_503
+        self.retry_after = retry_after
+        self.plans = plans or CANNED_PLANS
+        self._windows: Dict[str, _KeyWindow] = {}
+        self.requests = 0
+        self.streams = 0
+        self.rejected_429 = 0
+        self.failed_503 = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    def app(self) -> web.Application:
+        """Aplicação aiohttp do servidor"""
+        app = web.Application()
+        app.router.add_post("/openai/v1/chat/completions", self.chat_completions)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8089) -> str:
+        """Sobe o servidor no loop atual e retorna a URL base (port=0 escolhe uma porta livre)"""
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        """Derruba o servidor"""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _window(self, api_key: str) -> _KeyWindow:
+        """Janela atual da chave (reinicia a cada minuto)"""
+        window = self._windows.get(api_key)
+        if window is None or time.monotonic() - window.started >= 60.0:
+            window = self._windows[api_key] = _KeyWindow()
+        return window
+
+    def _rate_headers(self, window: _KeyWindow) -> Dict[str, str]:
+        """Cabeçalhos x-ratelimit-* no formato do Groq"""
+        reset = max(0.0, 60.0 - (time.monotonic() - window.started))
+        headers = {}
+        if self.rpm:
+            headers["x-ratelimit-limit-requests"] = str(self.rpm)
+            headers["x-ratelimit-remaining-requests"] = str(max(0, self.rpm - window.requests))
+            headers["x-ratelimit-reset-requests"] = f"{reset:.2f}s"
+        if self.tpm:
+            headers["x-ratelimit-limit-tokens"] = str(self.tpm)
+            headers["x-ratelimit-remaining-tokens"] = str(max(0, self.tpm - window.tokens))
+            headers["x-ratelimit-reset-tokens"] = f"{reset:.2f}s"
+        return headers
+
+    def _reply(self, body: dict) -> Tuple[str, str]:
+        """Conteúdo da resposta e finish_reason, conforme o tipo de prompt"""
+        messages = body.get("messages", [])
+        system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+        user = messages[-1]["content"] if messages else ""
+        max_tokens = body.get("max_tokens") or 1000
+
+        if system.startswith("Classifique"):
+            category = classify_category(user)
+            return category or "CHAT", "stop"
+        if "Retorne SEMPRE um JSON" in system:
+            # Prompt restrito a uma categoria: usa o plano dela; catálogo completo: classifica a mensagem
+            scoped = [name for name in ACTION_CATEGORIES if f"\n{name} (" in system]
+            category = scoped[0] if len(scoped) == 1 else classify_category(user)
+            plan = self.plans.get(category, self.plans[None])
+            if (body.get("response_format") or {}).get("type") == "json_object":
+                return json.dumps({"actions": plan}, ensure_ascii=False), "stop"
+            return json.dumps(plan, ensure_ascii=False), "stop"
+
+        length = random.randint(20, 400)
+        finish_reason = "length" if length > max_tokens else "stop"
+        text = " ".join(random.choice(WORDS) for _ in range(min(length, max_tokens)))
+        return text.capitalize() + ".", finish_reason
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        """Endpoint de chat (com e sem streaming)"""
+        self.requests += 1
+        body = await request.json()
+        api_key = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        window = self._window(api_key)
+        prompt_tokens = sum(estimate_tokens(m.get("content", "")) for m in body.get("messages", []))
+
+        over_limit = ((self.rpm and window.requests >= self.rpm)
+                      or (self.tpm and window.tokens + prompt_tokens > self.tpm))
+        if over_limit or random.random() < self.rate_429:
+            self.rejected_429 += 1
+            retry_after = (60.0 - (time.monotonic() - window.started)) if over_limit else self.retry_after
+            headers = self._rate_headers(window)
+            headers["retry-after"] = f"{max(retry_after, 0.0):.2f}"
+            return web.json_response(
+                {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}},
+                status=429, headers=headers
+            )
+        if random.random() < self.rate_503:
+            self.failed_503 += 1
+            return web.json_response({"error": {"message": "Service unavailable"}}, status=503)
+
+        window.requests += 1
+        content, finish_reason = self._reply(body)
+        completion_tokens = estimate_tokens(content)
+        window.tokens += prompt_tokens + completion_tokens
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        model = body.get("model", "llama-3.3-70b-versatile")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        await asyncio.sleep(self.ttft())
+        if not body.get("stream"):
+            await asyncio.sleep(completion_tokens / self.token_rate)
+            return web.json_response({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": finish_reason
+                }],
+                "usage": usage
+            }, headers=self._rate_headers(window))
+
+        self.streams += 1
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", **self._rate_headers(window)})
+        await response.prepare(request)
+
+        def chunk(delta: dict, finish: Optional[str] = None, extra: Optional[dict] = None) -> bytes:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                **(extra or {})
+            }
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8")
+
+        # Pedaços de ~4 tokens, no ritmo de token_rate
+        pieces = [content[i:i + 16] for i in range(0, len(content), 16)]
+        for index, piece in enumerate(pieces):
+            delta = {"content": piece}
+            if index == 0:
+                delta["role"] = "assistant"
+            await response.write(chunk(delta))
+            await asyncio.sleep(estimate_tokens(piece) / self.token_rate)
+        await response.write(chunk({}, finish_reason, {"x_groq": {"id": completion_id, "usage": usage}}))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores do servidor simulado"""
+        return {
+            "requests": self.requests,
+            "streams": self.streams,
+            "rejected_429": self.rejected_429,
+            "failed_503": self.failed_503
+        }
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    """Opções do servidor simulado (compartilhadas com o teste de carga)"""
+    parser.add_argument("--latency", default="lognormal:0.5,0.4",
+                        help="distribuição do tempo até o primeiro token (fixed/uniform/exp/lognormal)")
+    parser.add_argument("--token-rate", type=float, default=250.0, help="tokens gerados por segundo")
+    parser.add_argument("--rpm", type=int, default=0, help="limite de requisições por minuto por chave (0 = sem)")
+    parser.add_argument("--tpm", type=int, default=0, help="limite de tokens por minuto por chave (0 = sem)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fração de respostas 429 aleatórias")
+    parser.add_argument("--rate-503", type=float, default=0.0, help="fração de respostas 503 aleatórias")
+    parser.add_argument("--plans", help="arquivo JSON {categoria: [ações]} com planos prontos")
+
+def server_from_arguments(args: argparse.Namespace) -> MockGroqServer:
+    """Cria o servidor a partir das opções da linha de comando"""
+    plans = None
+    if args.plans:
+        with open(args.plans, encoding="utf-8") as file:
+            raw = json.load(file)
+        plans = {**CANNED_PLANS, **{(None if key in ("", "CHAT") else key): value for key, value in raw.items()}}
+        unknown = set(plans) - set(ACTION_CATEGORIES) - {None}
+        if unknown:
+            sys.exit(f"Categorias desconhecidas em {args.plans}: {', '.join(sorted(unknown))}")
+    return MockGroqServer(
+        ttft=parse_distribution(args.latency),
+        token_rate=args.token_rate,
+        rpm=args.rpm,
+        tpm=args.tpm,
+        rate_429=args.rate_429,
+        rate_503=args.rate_503,
+        plans=plans
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = server_from_arguments(args)
+    print(f"Servidor Groq simulado em http://{args.host}:{args.port}")
+    web.run_app(server.app(), host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
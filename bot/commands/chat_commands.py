@@ -10,8 +10,17 @@ from typing import Optional
 from bot.config import BotConfig
 from bot.services.groq_service import GroqService
 from bot.services.gif_service import GifService
+from bot.services.gif_suggestions import GifSuggestions
+from bot.services.request_context import RequestContext
+from bot.services.llm_scheduler import SchedulerRejectedError
+from bot.services.interaction_tracker import InteractionTracker, SUPERSEDED
+from bot.services.guild_snapshot import GuildSnapshotCache
+from bot.services.guild_index import GuildNameIndex
 from bot.utils.security import SecurityValidator
-from bot.utils.admin_actions import AdminActionExecutor
+from bot.utils.admin_actions import ADMIN_ACTIONS, AdminActionExecutor
+from bot.utils.intent_router import IntentRouter
+from bot.utils.plan_executor import PlanExecutor
+from bot.utils.stream_renderer import StreamingRenderer
 
 logger = logging.getLogger(__name__)
 
@@ -19,20 +28,44 @@ class ChatCommands:
     """Comandos de chat do bot"""
     
     def __init__(self, bot: commands.Bot, groq_service: GroqService, 
-                 gif_service: Optional[GifService], config: BotConfig):
+                 gif_service: Optional[GifService], config: BotConfig,
+                 interactions: Optional[InteractionTracker] = None,
+                 guild_snapshots: Optional[GuildSnapshotCache] = None,
+                 gif_suggestions: Optional[GifSuggestions] = None,
+                 plan_executor: Optional[PlanExecutor] = None,
+                 guild_index: Optional[GuildNameIndex] = None):
         self.bot = bot
         self.groq_service = groq_service
         self.gif_service = gif_service
         self.config = config
         self.security = SecurityValidator()
-        self.admin_executor = AdminActionExecutor()
+        self.admin_executor = AdminActionExecutor(names=guild_index)
+        self.intent_router = IntentRouter()
+        self.interactions = interactions or InteractionTracker()
+        self.guild_snapshots = guild_snapshots
+        self.gif_suggestions = gif_suggestions
+        self.plan_executor = plan_executor or PlanExecutor(ADMIN_ACTIONS)
         
         logger.info("✅ Comandos de chat inicializados")
     
+    async def _track(self, interaction: discord.Interaction, context: RequestContext, work):
+        """Executa o trabalho da interação, cancelando-o se expirar ou for substituído"""
+        if await self.interactions.run(context, work) == SUPERSEDED:
+            try:
+                await interaction.edit_original_response(
+                    content="⏭️ Pedido substituído pelo seu pedido mais recente."
+                )
+            except discord.HTTPException:
+                pass
+    
     async def handle_skgpt(self, interaction: discord.Interaction, mensagem: str):
         """Chatbot IA com funcionalidades administrativas"""
         await interaction.response.defer(ephemeral=False)
+        context = RequestContext.from_interaction(interaction, command="skgpt")
+        await self._track(interaction, context, self._run_skgpt(interaction, mensagem, context))
         
+    async def _run_skgpt(self, interaction: discord.Interaction, mensagem: str, context: RequestContext):
+        """Pipeline do /skgpt: validação, plano de ações e execução"""
         try:
             # Validar entrada
             if not self.security.validate_input(mensagem):
@@ -49,31 +82,38 @@ class ChatCommands:
                     await interaction.followup.send(f"❌ Não encontrei GIF para: {mensagem}")
                     return
             
-            # Analisar comando com IA
-            actions = await self.groq_service.parse_admin_command(mensagem)
+            # Frases comuns são resolvidas localmente; o resto vai para a IA
+            channel_name = getattr(interaction.channel, "name", None)
+            routed = self.intent_router.route(mensagem, channel_name=channel_name)
+            if routed is None:
+                # Nomes reais de canais e cargos evitam que o modelo invente alvos
+                guild_info = self.guild_snapshots.get(interaction.guild) if self.guild_snapshots else None
+                actions = self.groq_service.stream_admin_actions(mensagem, context=context, guild_info=guild_info)
+            else:
+                actions = self._iterate(routed)
             
-            # Executar ações
-            results = []
-            for action in actions:
-                action_type = action.get("action", "resposta")
-                
+            def reject(action):
                 # Verificar permissões para comandos admin
-                if (action_type != "resposta" and 
+                if (action.get("action", "resposta") != "resposta" and 
                     not interaction.user.guild_permissions.administrator):
-                    results.append("❌ Apenas administradores podem executar comandos administrativos.")
-                    continue
+                    return "❌ Apenas administradores podem executar comandos administrativos."
+                return None
                 
-                # Executar ação
-                result = await self.admin_executor.execute_action(
-                    action, interaction.guild, interaction
-                )
-                results.append(result)
+            # Cada ação começa assim que chega do stream e as anteriores de que depende terminam;
+            # se a interação for cancelada, as ações em curso terminam mas as pendentes não começam
+            results = await self.plan_executor.run(
+                actions,
+                lambda action: self.admin_executor.execute_action(action, interaction.guild, interaction),
+                reject=reject
+            )
             
             # Enviar resultados se houver
             if results and not any("✅ Resposta enviada" in r for r in results):
                 response = "\n".join(results)[:2000]  # Limitar a 2000 chars
                 await interaction.followup.send(response)
                 
+        except SchedulerRejectedError as e:
+            await interaction.edit_original_response(content=str(e))
         except discord.NotFound:
             logger.warning("⚠️ Mensagem não encontrada - possivelmente expirou")
             # Não tenta responder se a mensagem não existe mais
@@ -85,6 +125,12 @@ class ChatCommands:
                 # Ignora se não conseguir responder
                 pass
     
+    @staticmethod
+    async def _iterate(actions):
+        """Expõe uma lista de ações pronta como iterador assíncrono"""
+        for action in actions:
+            yield action
+    
     async def handle_gif(self, interaction: discord.Interaction, termo: str):
         """Busca GIF pelo termo especificado"""
         if not self.gif_service or not self.gif_service.is_available():
@@ -109,6 +155,8 @@ class ChatCommands:
                 )
                 embed.set_image(url=gif_url)
                 await interaction.followup.send(embed=embed)
+                if self.gif_suggestions:
+                    self.gif_suggestions.record(termo)
             else:
                 await interaction.followup.send(f"❌ Não encontrei GIF para: {termo}")
                 
@@ -214,19 +262,33 @@ class ChatCommands:
     async def handle_chat_only(self, interaction: discord.Interaction, mensagem: str):
         """Handler para chat simples com IA (sem funcionalidades admin)"""
         await interaction.response.defer()
+        context = RequestContext.from_interaction(interaction, command="chat")
+        await self._track(interaction, context, self._run_chat_only(interaction, mensagem, context))
         
+    async def _run_chat_only(self, interaction: discord.Interaction, mensagem: str, context: RequestContext):
+        """Resposta em streaming do chat simples"""
         try:
-            response = await self.groq_service.chat_completion(mensagem)
+            message = None
             
-            embed = discord.Embed(
-                title="🤖 Chat IA",
-                description=response,
-                color=0x5865F2
-            )
-            embed.set_footer(text=f"Pergunta de {interaction.user.display_name}")
+            async def render(text: str, final: bool):
+                nonlocal message
+                embed = discord.Embed(
+                    title="🤖 Chat IA",
+                    description=text,
+                    color=0x5865F2
+                )
+                embed.set_footer(text=f"Pergunta de {interaction.user.display_name}")
             
-            await interaction.followup.send(embed=embed)
+                if message is None:
+                    message = await interaction.followup.send(embed=embed, wait=True)
+                else:
+                    await message.edit(embed=embed)
             
+            renderer = StreamingRenderer(render, edit_interval=self.config.stream_edit_interval)
+            await renderer.consume(self.groq_service.stream_completion(mensagem, context=context, remember=True))
+        
+        except SchedulerRejectedError as e:
+            await interaction.edit_original_response(content=str(e))
         except Exception as e:
             logger.error(f"Erro no chat IA: {e}")
             await interaction.followup.send("❌ Erro na IA. Tente novamente.", ephemeral=True)
@@ -8,15 +8,21 @@ from typing import Optional
 import logging
 
 from ..services.groq_service import GroqService
+from ..services.request_context import RequestContext
+from ..services.llm_scheduler import SchedulerRejectedError
+from ..services.interaction_tracker import InteractionTracker, SUPERSEDED
 from ..utils.admin_actions import AdminActionExecutor
+from ..utils.stream_renderer import StreamingRenderer
 
 logger = logging.getLogger(__name__)
 
 class SuperCommands(commands.Cog):
-    def __init__(self, bot, groq_service=None, admin_executor=None):
+    def __init__(self, bot, groq_service=None, admin_executor=None, usage_tracker=None, interactions=None):
         self.bot = bot
         self.groq_service = groq_service
         self.admin_executor = admin_executor or AdminActionExecutor()
+        self.usage_tracker = usage_tracker
+        self.interactions = interactions or InteractionTracker()
         logger.info("✅ Super comandos com autocomplete inicializados")
 
     # ==================== COMANDO DE CHAT IA ====================
@@ -25,27 +31,50 @@ class SuperCommands(commands.Cog):
     async def chat_ai(self, interaction: discord.Interaction, mensagem: str):
         """Chat simples com IA sem funcionalidades administrativas"""
         await interaction.response.defer(ephemeral=True)
+        context = RequestContext.from_interaction(interaction, command="chat")
         
+        # Cancela a resposta se a interação expirar ou o usuário mandar outro pedido no canal
+        if await self.interactions.run(context, self._chat_reply(interaction, mensagem, context)) == SUPERSEDED:
+            try:
+                await interaction.edit_original_response(
+                    content="⏭️ Pedido substituído pelo seu pedido mais recente."
+                )
+            except discord.HTTPException:
+                pass
+            
+    async def _chat_reply(self, interaction: discord.Interaction, mensagem: str, context: RequestContext):
+        """Resposta em streaming do /chat"""
         try:
-            response = await self.groq_service.chat_completion(mensagem)
+            message = None
             
-            embed = discord.Embed(
-                title="🤖💭 Chat IA",
-                description=f"**📝 Sua pergunta:**\n> {mensagem}\n\n**🧠 Resposta da IA:**\n{response}",
-                color=0x00D4FF,
-                timestamp=discord.utils.utcnow()
-            )
-            embed.set_author(
-                name=f"Chat para {interaction.user.display_name}",
-                icon_url=interaction.user.display_avatar.url
-            )
-            embed.set_footer(
-                text="🔒 Resposta privada • Chat IA Simples",
-                icon_url=self.bot.user.display_avatar.url
-            )
+            async def render(text: str, final: bool):
+                nonlocal message
+                embed = discord.Embed(
+                    title="🤖💭 Chat IA",
+                    description=f"**📝 Sua pergunta:**\n> {mensagem}\n\n**🧠 Resposta da IA:**\n{text}",
+                    color=0x00D4FF,
+                    timestamp=discord.utils.utcnow()
+                )
+                embed.set_author(
+                    name=f"Chat para {interaction.user.display_name}",
+                    icon_url=interaction.user.display_avatar.url
+                )
+                embed.set_footer(
+                    text="🔒 Resposta privada • Chat IA Simples",
+                    icon_url=self.bot.user.display_avatar.url
+                )
             
-            await interaction.followup.send(embed=embed, ephemeral=True)
+                if message is None:
+                    message = await interaction.followup.send(embed=embed, ephemeral=True, wait=True)
+                else:
+                    await message.edit(embed=embed)
             
+            # Pergunta + resposta precisam caber no limite de 4096 do embed
+            renderer = StreamingRenderer(render, max_length=max(3900 - len(mensagem), 500))
+            await renderer.consume(self.groq_service.stream_completion(mensagem, context=context, remember=True))
+        
+        except SchedulerRejectedError as e:
+            await interaction.edit_original_response(content=str(e))
         except Exception as e:
             logger.error(f"Erro no chat IA: {e}")
             
@@ -128,6 +157,84 @@ class SuperCommands(commands.Cog):
                 color=0xFFAA00
             )
             await interaction.followup.send(embed=error_embed, ephemeral=True)
+    
+    # ==================== USO DA IA ====================
+    @app_commands.command(name="uso", description="📈 Consumo de tokens e custo da IA neste servidor")
+    @app_commands.describe(agrupar="Como agrupar o consumo", dias="Período em dias (com histórico salvo)")
+    @app_commands.choices(agrupar=[
+        app_commands.Choice(name="👥 Por Usuário", value="usuario"),
+        app_commands.Choice(name="⌨️ Por Comando", value="comando"),
+        app_commands.Choice(name="🧠 Por Modelo", value="modelo"),
+        app_commands.Choice(name="⚙️ Perfis de Geração (economia)", value="perfis")
+    ])
+    async def uso_ia(self, interaction: discord.Interaction, agrupar: str = "usuario", dias: int = 30):
+        """Relatório de uso do LLM para administradores"""
+        if not interaction.user.guild_permissions.administrator:
+            error_embed = discord.Embed(
+                title="🔒 Acesso Negado",
+                description="Este comando está disponível apenas para **administradores**.",
+                color=0xFF4B4B
+            )
+            await interaction.response.send_message(embed=error_embed, ephemeral=True)
+            return
+        
+        if not self.usage_tracker:
+            await interaction.response.send_message("❌ Contabilidade de uso desativada.", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        if agrupar == "perfis":
+            await interaction.followup.send(embed=self._profiles_embed(), ephemeral=True)
+            return
+        
+        total, rows = await self.usage_tracker.report(interaction.guild_id, agrupar, days=dias)
+        embed = discord.Embed(
+            title="📈 Uso da IA",
+            description=(
+                f"**Chamadas:** {total.calls} ({total.cache_hits} do cache, {total.errors} com erro)\n"
+                f"**Tokens:** {total.prompt_tokens} de entrada • {total.completion_tokens} de saída\n"
+                f"**Custo estimado:** US$ {total.cost:.4f}"
+            ),
+            color=0x5865F2,
+            timestamp=discord.utils.utcnow()
+        )
+        
+        lines = []
+        for key, totals in rows:
+            if agrupar == "usuario":
+                label = f"<@{key}>" if key else "Desconhecido"
+            else:
+                label = f"`{key or 'outro'}`"
+            average = totals.latency / max(totals.calls - totals.cache_hits, 1)
+            lines.append(f"{label}: {totals.tokens} tokens • {totals.calls} chamadas • "
+                         f"US$ {totals.cost:.4f} • {average:.2f}s")
+        embed.add_field(name="🏆 Maiores consumidores", value="\n".join(lines) or "Sem uso registrado", inline=False)
+        embed.set_footer(text="Custo estimado pela tabela de preços por modelo")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+    
+    def _profiles_embed(self) -> discord.Embed:
+        """Relatório dos perfis de geração (todos os servidores)"""
+        profiles = getattr(self.groq_service, "profiles", None)
+        rows = profiles.report() if profiles else []
+        lines = []
+        for row in rows:
+            line = (f"`{row['profile']}`: {row['calls']} chamadas • {row['avg_completion_tokens']:.0f} tokens • "
+                    f"{row['avg_latency']:.2f}s • {row['truncated_rate']:.0%} truncadas • "
+                    f"{row['reserved_tokens_saved']} tokens reservados a menos")
+            if "tokens_saved_pct" in row:
+                line += (f" • vs baseline: {row['tokens_saved_pct']:.0%} tokens, "
+                         f"{row['latency_saved_pct']:.0%} tempo")
+            lines.append(line)
+        
+        embed = discord.Embed(
+            title="⚙️ Perfis de Geração",
+            description="\n".join(lines)[:4000] or "Sem chamadas registradas",
+            color=0x5865F2,
+            timestamp=discord.utils.utcnow()
+        )
+        embed.set_footer(text="Comparação com baseline requer PROFILE_BASELINE_RATE > 0")
+        return embed
 
     # ==================== COMANDOS DE GERENCIAMENTO ====================
     @app_commands.command(name="gerenciar", description="🔧 Gerenciar e administrar servidor")
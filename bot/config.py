@@ -3,8 +3,8 @@ Configurações do bot
 """
 import os
 import logging
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
@@ -18,6 +18,114 @@ class BotConfig:
     log_channel_id: Optional[int] = None
     command_prefix: str = "!"
     
+    # Endpoint alternativo compatível com Groq (proxy ou servidor simulado)
+    groq_base_url: Optional[str] = None
+    
+    # Pool HTTP compartilhado do cliente Groq
+    groq_max_connections: int = 50
+    groq_max_keepalive: int = 20
+    groq_keepalive_expiry: float = 30.0
+    groq_timeout: float = 30.0
+    groq_connect_timeout: float = 5.0
+    
+    # Sessão HTTP do Tenor (GIFs)
+    tenor_max_connections: int = 10
+    tenor_timeout: float = 10.0
+    
+    # Cache de buscas de GIF (lote por termo em rodízio)
+    gif_cache_enabled: bool = True
+    gif_cache_max_terms: int = 500
+    gif_cache_ttl: float = 21600.0
+    gif_negative_ttl: float = 600.0
+    gif_batch_size: int = 20
+    gif_cache_path: Optional[str] = None
+    # Autocomplete do /gif (índice de prefixos em memória)
+    gif_suggestions_enabled: bool = True
+    gif_suggestions_refresh: float = 3600.0
+    
+    # Intervalo mínimo entre edições de respostas em streaming
+    stream_edit_interval: float = 1.2
+    
+    # Cache de respostas do LLM
+    cache_enabled: bool = True
+    cache_max_entries: int = 1000
+    cache_ttl: float = 3600.0
+    cache_db_path: Optional[str] = None
+    cache_db_max_entries: int = 10000
+    cache_disabled_guilds: List[int] = field(default_factory=list)
+    
+    # Prompt administrativo em duas etapas
+    admin_prompt_mode: str = "scoped"
+    category_classifier: str = "local"
+    classifier_model: str = "llama-3.1-8b-instant"
+    admin_streaming: bool = True
+    admin_json_mode: bool = False
+    admin_plan_validation: bool = True
+    # Ações independentes do plano executam em paralelo (total e por rota do Discord)
+    admin_plan_concurrency: int = 4
+    admin_route_concurrency: int = 2
+    # Semelhança mínima (0-1) para aceitar um nome de canal/cargo aproximado
+    name_fuzzy_cutoff: float = 0.8
+    
+    # Chaves Groq adicionais (pool) e quarentena
+    groq_extra_api_keys: List[str] = field(default_factory=list)
+    key_hard_limit_seconds: float = 60.0
+    key_auth_quarantine: float = 3600.0
+    
+    # Novo pedido do mesmo usuário no mesmo canal cancela o anterior
+    supersede_requests: bool = True
+    
+    # Hedging: requisição de reserva após o percentil de latência sem resposta
+    hedge_enabled: bool = False
+    hedge_percentile: float = 95.0
+    hedge_budget: float = 0.1
+    hedge_fallback: bool = False
+    
+    # Perfis de geração (temperature/max_tokens por tipo de chamada)
+    generation_profiles: bool = True
+    profile_baseline_rate: float = 0.0
+    
+    # Novas tentativas com backoff (429/5xx)
+    retry_max_attempts: int = 4
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 8.0
+    retry_deadline: float = 45.0
+    
+    # Contabilidade de uso do LLM
+    usage_db_path: Optional[str] = None
+    usage_flush_interval: float = 60.0
+    usage_metrics_path: Optional[str] = None
+    
+    # Modelos e roteamento por latência
+    model_large: str = "llama-3.3-70b-versatile"
+    model_small: str = "llama-3.1-8b-instant"
+    model_tiering: bool = True
+    simple_max_chars: int = 200
+    breaker_error_threshold: float = 0.5
+    breaker_cooldown: float = 30.0
+    slow_call_seconds: float = 10.0
+    
+    # Escalonador de chamadas ao LLM
+    scheduler_global_limit: int = 8
+    scheduler_guild_limit: int = 2
+    scheduler_max_queue: int = 100
+    scheduler_max_guild_queue: int = 10
+    user_rate_per_minute: float = 10.0
+    user_burst: int = 3
+    guild_weights: Dict[int, float] = field(default_factory=dict)
+    
+    # Memória de conversa do /chat
+    memory_enabled: bool = True
+    memory_max_turns: int = 20
+    memory_token_budget: int = 1500
+    memory_max_conversations: int = 5000
+    memory_ttl: float = 1800.0
+    
+    # Estrutura do servidor (canais, categorias, cargos) no prompt admin
+    guild_snapshot_enabled: bool = True
+    guild_snapshot_tokens: int = 600
+    guild_snapshot_ttl: float = 600.0
+    
     def __post_init__(self):
         """Validação das configurações"""
         if not self.discord_token:
@@ -25,6 +133,19 @@ class BotConfig:
         if not self.groq_api_key:
             raise ValueError("GROQ_API_KEY é obrigatório")
 
+def _parse_id_list(value: str) -> List[int]:
+    """Converte uma lista de IDs separados por vírgula"""
+    return [int(item) for item in value.split(",") if item.strip()]
+
+def _parse_weights(value: str) -> Dict[int, float]:
+    """Converte pesos no formato id:peso,id:peso"""
+    weights = {}
+    for item in value.split(","):
+        if ":" in item:
+            guild_id, weight = item.split(":", 1)
+            weights[int(guild_id)] = float(weight)
+    return weights
+
 def load_config() -> BotConfig:
     """Carrega as configurações do arquivo .env"""
     load_dotenv()
@@ -34,8 +155,79 @@ def load_config() -> BotConfig:
             discord_token=os.getenv("DISCORD_TOKEN", ""),
             groq_api_key=os.getenv("GROQ_API_KEY", ""),
             tenor_api_key=os.getenv("TENOR_API_KEY"),
+            groq_base_url=os.getenv("GROQ_BASE_URL") or None,
             log_channel_id=int(os.getenv("LOG_CHANNEL_ID", "0")) or None,
-            command_prefix=os.getenv("COMMAND_PREFIX", "!")
+            command_prefix=os.getenv("COMMAND_PREFIX", "!"),
+            groq_max_connections=int(os.getenv("GROQ_MAX_CONNECTIONS", "50")),
+            groq_max_keepalive=int(os.getenv("GROQ_MAX_KEEPALIVE", "20")),
+            groq_keepalive_expiry=float(os.getenv("GROQ_KEEPALIVE_EXPIRY", "30")),
+            groq_timeout=float(os.getenv("GROQ_TIMEOUT", "30")),
+            groq_connect_timeout=float(os.getenv("GROQ_CONNECT_TIMEOUT", "5")),
+            tenor_max_connections=int(os.getenv("TENOR_MAX_CONNECTIONS", "10")),
+            tenor_timeout=float(os.getenv("TENOR_TIMEOUT", "10")),
+            gif_cache_enabled=os.getenv("GIF_CACHE_ENABLED", "true").lower() == "true",
+            gif_cache_max_terms=int(os.getenv("GIF_CACHE_MAX_TERMS", "500")),
+            gif_cache_ttl=float(os.getenv("GIF_CACHE_TTL", "21600")),
+            gif_negative_ttl=float(os.getenv("GIF_NEGATIVE_TTL", "600")),
+            gif_batch_size=int(os.getenv("GIF_BATCH_SIZE", "20")),
+            gif_cache_path=os.getenv("GIF_CACHE_PATH") or None,
+            gif_suggestions_enabled=os.getenv("GIF_SUGGESTIONS_ENABLED", "true").lower() == "true",
+            gif_suggestions_refresh=float(os.getenv("GIF_SUGGESTIONS_REFRESH", "3600")),
+            stream_edit_interval=float(os.getenv("STREAM_EDIT_INTERVAL", "1.2")),
+            cache_enabled=os.getenv("CACHE_ENABLED", "true").lower() == "true",
+            cache_max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "1000")),
+            cache_ttl=float(os.getenv("CACHE_TTL", "3600")),
+            cache_db_path=os.getenv("CACHE_DB_PATH") or None,
+            cache_db_max_entries=int(os.getenv("CACHE_DB_MAX_ENTRIES", "10000")),
+            cache_disabled_guilds=_parse_id_list(os.getenv("CACHE_DISABLED_GUILDS", "")),
+            admin_prompt_mode=os.getenv("ADMIN_PROMPT_MODE", "scoped"),
+            category_classifier=os.getenv("CATEGORY_CLASSIFIER", "local"),
+            classifier_model=os.getenv("CLASSIFIER_MODEL", "llama-3.1-8b-instant"),
+            admin_streaming=os.getenv("ADMIN_STREAMING", "true").lower() == "true",
+            admin_json_mode=os.getenv("ADMIN_JSON_MODE", "false").lower() == "true",
+            admin_plan_validation=os.getenv("ADMIN_PLAN_VALIDATION", "true").lower() == "true",
+            admin_plan_concurrency=int(os.getenv("ADMIN_PLAN_CONCURRENCY", "4")),
+            admin_route_concurrency=int(os.getenv("ADMIN_ROUTE_CONCURRENCY", "2")),
+            name_fuzzy_cutoff=float(os.getenv("NAME_FUZZY_CUTOFF", "0.8")),
+            groq_extra_api_keys=[key.strip() for key in os.getenv("GROQ_API_KEYS", "").split(",") if key.strip()],
+            key_hard_limit_seconds=float(os.getenv("KEY_HARD_LIMIT_SECONDS", "60.0")),
+            key_auth_quarantine=float(os.getenv("KEY_AUTH_QUARANTINE", "3600.0")),
+            supersede_requests=os.getenv("SUPERSEDE_REQUESTS", "true").lower() == "true",
+            hedge_enabled=os.getenv("HEDGE_ENABLED", "false").lower() == "true",
+            hedge_percentile=float(os.getenv("HEDGE_PERCENTILE", "95.0")),
+            hedge_budget=float(os.getenv("HEDGE_BUDGET", "0.1")),
+            hedge_fallback=os.getenv("HEDGE_FALLBACK", "false").lower() == "true",
+            generation_profiles=os.getenv("GENERATION_PROFILES", "true").lower() == "true",
+            profile_baseline_rate=float(os.getenv("PROFILE_BASELINE_RATE", "0.0")),
+            retry_max_attempts=int(os.getenv("RETRY_MAX_ATTEMPTS", "4")),
+            retry_base_delay=float(os.getenv("RETRY_BASE_DELAY", "0.5")),
+            retry_max_delay=float(os.getenv("RETRY_MAX_DELAY", "8.0")),
+            retry_deadline=float(os.getenv("RETRY_DEADLINE", "45.0")),
+            usage_db_path=os.getenv("USAGE_DB_PATH") or None,
+            usage_flush_interval=float(os.getenv("USAGE_FLUSH_INTERVAL", "60.0")),
+            usage_metrics_path=os.getenv("USAGE_METRICS_PATH") or None,
+            model_large=os.getenv("MODEL_LARGE", "llama-3.3-70b-versatile"),
+            model_small=os.getenv("MODEL_SMALL", "llama-3.1-8b-instant"),
+            model_tiering=os.getenv("MODEL_TIERING", "true").lower() == "true",
+            simple_max_chars=int(os.getenv("SIMPLE_MAX_CHARS", "200")),
+            breaker_error_threshold=float(os.getenv("BREAKER_ERROR_THRESHOLD", "0.5")),
+            breaker_cooldown=float(os.getenv("BREAKER_COOLDOWN", "30")),
+            slow_call_seconds=float(os.getenv("SLOW_CALL_SECONDS", "10")),
+            scheduler_global_limit=int(os.getenv("SCHEDULER_GLOBAL_LIMIT", "8")),
+            scheduler_guild_limit=int(os.getenv("SCHEDULER_GUILD_LIMIT", "2")),
+            scheduler_max_queue=int(os.getenv("SCHEDULER_MAX_QUEUE", "100")),
+            scheduler_max_guild_queue=int(os.getenv("SCHEDULER_MAX_GUILD_QUEUE", "10")),
+            user_rate_per_minute=float(os.getenv("USER_RATE_PER_MINUTE", "10")),
+            user_burst=int(os.getenv("USER_BURST", "3")),
+            guild_weights=_parse_weights(os.getenv("GUILD_WEIGHTS", "")),
+            memory_enabled=os.getenv("MEMORY_ENABLED", "true").lower() == "true",
+            memory_max_turns=int(os.getenv("MEMORY_MAX_TURNS", "20")),
+            memory_token_budget=int(os.getenv("MEMORY_TOKEN_BUDGET", "1500")),
+            memory_max_conversations=int(os.getenv("MEMORY_MAX_CONVERSATIONS", "5000")),
+            memory_ttl=float(os.getenv("MEMORY_TTL", "1800")),
+            guild_snapshot_enabled=os.getenv("GUILD_SNAPSHOT_ENABLED", "true").lower() == "true",
+            guild_snapshot_tokens=int(os.getenv("GUILD_SNAPSHOT_TOKENS", "600")),
+            guild_snapshot_ttl=float(os.getenv("GUILD_SNAPSHOT_TTL", "600"))
         )
         
         logger.info("✅ Configurações carregadas com sucesso")
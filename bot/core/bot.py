@@ -3,12 +3,28 @@ Classe principal do bot do Discord
 """
 import logging
 import discord
+from discord import app_commands
 from discord.ext import commands
 from typing import Optional
 
 from bot.config import BotConfig
 from bot.services.groq_service import GroqService
 from bot.services.gif_service import GifService
+from bot.services.gif_cache import GifCache
+from bot.services.gif_suggestions import GifSuggestions
+from bot.services.response_cache import ResponseCache
+from bot.services.llm_scheduler import LLMScheduler
+from bot.services.conversation_memory import ConversationMemory
+from bot.services.model_router import ModelRouter
+from bot.services.retry_policy import RetryPolicy
+from bot.services.usage_tracker import UsageTracker
+from bot.services.interaction_tracker import InteractionTracker
+from bot.services.hedging import Hedger
+from bot.services.generation_profiles import GenerationProfiles
+from bot.services.guild_snapshot import GuildSnapshotCache
+from bot.services.guild_index import GuildNameIndex
+from bot.utils.admin_actions import ADMIN_ACTIONS
+from bot.utils.plan_executor import PlanExecutor
 from bot.commands.chat_commands import ChatCommands
 from bot.commands.super_commands import SuperCommands
 from bot.handlers.error_handler import ErrorHandler
@@ -36,12 +52,118 @@ class DiscordBot:
         )
         
         # Inicializar serviços
-        self.groq_service = GroqService(config.groq_api_key)
-        self.gif_service = GifService(config.tenor_api_key) if config.tenor_api_key else None
+        self.response_cache = ResponseCache(
+            max_entries=config.cache_max_entries,
+            ttl=config.cache_ttl,
+            db_path=config.cache_db_path,
+            db_max_entries=config.cache_db_max_entries,
+            disabled_guilds=config.cache_disabled_guilds
+        ) if config.cache_enabled else None
+        self.llm_scheduler = LLMScheduler(
+            global_limit=config.scheduler_global_limit,
+            guild_limit=config.scheduler_guild_limit,
+            max_queue=config.scheduler_max_queue,
+            max_guild_queue=config.scheduler_max_guild_queue,
+            user_rate_per_minute=config.user_rate_per_minute,
+            user_burst=config.user_burst,
+            guild_weights=config.guild_weights
+        )
+        self.conversation_memory = ConversationMemory(
+            max_turns=config.memory_max_turns,
+            token_budget=config.memory_token_budget,
+            max_conversations=config.memory_max_conversations,
+            ttl=config.memory_ttl
+        ) if config.memory_enabled else None
+        self.model_router = ModelRouter(
+            large_model=config.model_large,
+            small_model=config.model_small,
+            simple_max_chars=config.simple_max_chars,
+            error_threshold=config.breaker_error_threshold,
+            cooldown=config.breaker_cooldown,
+            slow_call_seconds=config.slow_call_seconds,
+            tiering=config.model_tiering
+        )
+        self.retry_policy = RetryPolicy(
+            max_attempts=config.retry_max_attempts,
+            base_delay=config.retry_base_delay,
+            max_delay=config.retry_max_delay,
+            deadline=config.retry_deadline
+        )
+        self.usage_tracker = UsageTracker(
+            db_path=config.usage_db_path,
+            flush_interval=config.usage_flush_interval,
+            metrics_path=config.usage_metrics_path
+        )
+        self.hedger = Hedger(
+            percentile=config.hedge_percentile,
+            budget=config.hedge_budget,
+            fallback=config.hedge_fallback
+        ) if config.hedge_enabled else None
+        self.generation_profiles = GenerationProfiles(
+            enabled=config.generation_profiles,
+            baseline_rate=config.profile_baseline_rate,
+            simple_max_chars=config.simple_max_chars
+        )
+        self.groq_service = GroqService(
+            config.groq_api_key,
+            max_connections=config.groq_max_connections,
+            max_keepalive=config.groq_max_keepalive,
+            keepalive_expiry=config.groq_keepalive_expiry,
+            timeout=config.groq_timeout,
+            connect_timeout=config.groq_connect_timeout,
+            cache=self.response_cache,
+            admin_prompt_mode=config.admin_prompt_mode,
+            category_classifier=config.category_classifier,
+            classifier_model=config.classifier_model,
+            admin_streaming=config.admin_streaming,
+            admin_json_mode=config.admin_json_mode,
+            scheduler=self.llm_scheduler,
+            memory=self.conversation_memory,
+            router=self.model_router,
+            retry=self.retry_policy,
+            usage=self.usage_tracker,
+            extra_api_keys=config.groq_extra_api_keys,
+            key_hard_limit_seconds=config.key_hard_limit_seconds,
+            key_auth_quarantine=config.key_auth_quarantine,
+            hedger=self.hedger,
+            profiles=self.generation_profiles,
+            base_url=config.groq_base_url,
+            validate_plans=config.admin_plan_validation
+        )
+        self.interaction_tracker = InteractionTracker(supersede=config.supersede_requests)
+        self.gif_cache = GifCache(
+            max_terms=config.gif_cache_max_terms,
+            ttl=config.gif_cache_ttl,
+            negative_ttl=config.gif_negative_ttl,
+            snapshot_path=config.gif_cache_path
+        ) if config.tenor_api_key and config.gif_cache_enabled else None
+        self.gif_service = GifService(
+            config.tenor_api_key,
+            max_connections=config.tenor_max_connections,
+            timeout=config.tenor_timeout,
+            cache=self.gif_cache,
+            batch_size=config.gif_batch_size
+        ) if config.tenor_api_key else None
+        self.gif_suggestions = GifSuggestions(
+            self.gif_service,
+            cache=self.gif_cache,
+            refresh_interval=config.gif_suggestions_refresh
+        ) if self.gif_service and config.gif_suggestions_enabled else None
+        self.guild_snapshots = GuildSnapshotCache(
+            token_budget=config.guild_snapshot_tokens,
+            ttl=config.guild_snapshot_ttl
+        ) if config.guild_snapshot_enabled else None
+        self.guild_index = GuildNameIndex(fuzzy_cutoff=config.name_fuzzy_cutoff)
+        self.plan_executor = PlanExecutor(
+            ADMIN_ACTIONS,
+            max_concurrency=config.admin_plan_concurrency,
+            route_concurrency=config.admin_route_concurrency
+        )
         
         # Configurar handlers
         self.error_handler = ErrorHandler(self.bot)
-        self.event_handler = EventHandler(self.bot, config)
+        self.event_handler = EventHandler(self.bot, config, guild_snapshots=self.guild_snapshots,
+                                          guild_index=self.guild_index)
         
         # Registrar comandos
         self._setup_commands()
@@ -56,8 +178,14 @@ class DiscordBot:
             self.bot, 
             self.groq_service, 
             self.gif_service,
-            self.config
+            self.config,
+            interactions=self.interaction_tracker,
+            guild_snapshots=self.guild_snapshots,
+            gif_suggestions=self.gif_suggestions,
+            plan_executor=self.plan_executor,
+            guild_index=self.guild_index
         )
+        self.usage_tracker.add_collector(self.chat_commands.intent_router.export_metrics)
         
         @self.bot.tree.command(name="skgpt", description="Chatbot IA com funcionalidades administrativas")
         async def skgpt(interaction: discord.Interaction, mensagem: str):
@@ -69,6 +197,14 @@ class DiscordBot:
             """Busca GIF pelo termo especificado"""
             await self.chat_commands.handle_gif(interaction, termo)
         
+        @gif.autocomplete("termo")
+        async def gif_termo_autocomplete(interaction: discord.Interaction, current: str):
+            """Sugestões de termos respondidas só da memória"""
+            if not self.gif_suggestions:
+                return []
+            return [app_commands.Choice(name=term[:100], value=term[:100])
+                    for term in self.gif_suggestions.complete(current, limit=25)]
+        
         @self.bot.tree.command(name="help", description="Mostra ajuda dos comandos do bot")
         async def help_cmd(interaction: discord.Interaction):
             """Mostra ajuda dos comandos do bot"""
@@ -81,7 +217,12 @@ class DiscordBot:
     
     async def load_super_commands(self):
         """Carrega os super comandos com autocomplete"""
-        await self.bot.add_cog(SuperCommands(self.bot, self.groq_service))
+        await self.bot.add_cog(SuperCommands(
+            self.bot, self.groq_service,
+            admin_executor=self.chat_commands.admin_executor,
+            usage_tracker=self.usage_tracker,
+            interactions=self.interaction_tracker
+        ))
         logger.info("✨ Super comandos com autocomplete carregados")
     
     async def start(self):
@@ -89,6 +230,11 @@ class DiscordBot:
         try:
             # Carregar super comandos antes de iniciar
             await self.load_super_commands()
+            self.usage_tracker.start()
+            if self.gif_service:
+                await self.gif_service.start()
+            if self.gif_suggestions:
+                self.gif_suggestions.start()
             await self.bot.start(self.config.discord_token)
         except discord.LoginFailure:
             logger.error("❌ Token do Discord inválido")
@@ -100,4 +246,10 @@ class DiscordBot:
     async def close(self):
         """Encerra o bot"""
         await self.bot.close()
+        await self.groq_service.close()
+        if self.gif_suggestions:
+            await self.gif_suggestions.close()
+        if self.gif_service:
+            await self.gif_service.close()
+        await self.usage_tracker.close()
         logger.info("🛑 Bot encerrado")
\ No newline at end of file
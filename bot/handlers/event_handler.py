@@ -4,16 +4,23 @@ Handler para eventos do Discord
 import logging
 import discord
 from discord.ext import commands
+from typing import Optional
 from bot.config import BotConfig
+from bot.services.guild_snapshot import GuildSnapshotCache
+from bot.services.guild_index import GuildNameIndex
 
 logger = logging.getLogger(__name__)
 
 class EventHandler:
     """Handler para eventos do Discord"""
     
-    def __init__(self, bot: commands.Bot, config: BotConfig):
+    def __init__(self, bot: commands.Bot, config: BotConfig,
+                 guild_snapshots: Optional[GuildSnapshotCache] = None,
+                 guild_index: Optional[GuildNameIndex] = None):
         self.bot = bot
         self.config = config
+        self.guild_snapshots = guild_snapshots
+        self.guild_index = guild_index
         self.setup_events()
         logger.info("✅ Handler de eventos configurado")
     
@@ -31,6 +38,70 @@ class EventHandler:
         @self.bot.event
         async def on_guild_remove(guild):
             await self.on_guild_remove_handler(guild)
+        
+        # Mudanças na estrutura invalidam o resumo usado no prompt admin e atualizam o índice de nomes
+        @self.bot.event
+        async def on_guild_channel_create(channel):
+            self.invalidate_structure(channel.guild)
+            if self.guild_index:
+                self.guild_index.channel_saved(channel)
+        
+        @self.bot.event
+        async def on_guild_channel_delete(channel):
+            self.invalidate_structure(channel.guild)
+            if self.guild_index:
+                self.guild_index.channel_deleted(channel)
+        
+        @self.bot.event
+        async def on_guild_channel_update(before, after):
+            if (before.name, before.category_id, before.position) != (after.name, after.category_id, after.position):
+                self.invalidate_structure(after.guild)
+            if self.guild_index and before.name != after.name:
+                self.guild_index.channel_saved(after)
+        
+        @self.bot.event
+        async def on_guild_role_create(role):
+            self.invalidate_structure(role.guild)
+            if self.guild_index:
+                self.guild_index.role_saved(role)
+        
+        @self.bot.event
+        async def on_guild_role_delete(role):
+            self.invalidate_structure(role.guild)
+            if self.guild_index:
+                self.guild_index.role_deleted(role)
+        
+        @self.bot.event
+        async def on_guild_role_update(before, after):
+            if (before.name, before.position) != (after.name, after.position):
+                self.invalidate_structure(after.guild)
+            if self.guild_index and before.name != after.name:
+                self.guild_index.role_saved(after)
+        
+        # Membros (só chegam com o intent de membros ativo)
+        @self.bot.event
+        async def on_member_join(member):
+            if self.guild_index:
+                self.guild_index.member_saved(member)
+        
+        @self.bot.event
+        async def on_member_remove(member):
+            if self.guild_index:
+                self.guild_index.member_removed(member)
+        
+        @self.bot.event
+        async def on_member_update(before, after):
+            if self.guild_index and before.display_name != after.display_name:
+                self.guild_index.member_saved(after)
+        
+        @self.bot.event
+        async def on_user_update(before, after):
+            if not self.guild_index or (before.name, before.global_name) == (after.name, after.global_name):
+                return
+            for guild in after.mutual_guilds:
+                member = guild.get_member(after.id)
+                if member:
+                    self.guild_index.member_saved(member)
     
     async def on_ready_handler(self):
         """Executado quando o bot fica online"""
@@ -68,6 +139,14 @@ class EventHandler:
     async def on_guild_remove_handler(self, guild: discord.Guild):
         """Executado quando o bot sai de um servidor"""
         logger.info(f"📉 Bot removido do servidor: {guild.name} ({guild.id})")
+        self.invalidate_structure(guild)
+        if self.guild_index:
+            self.guild_index.forget(guild.id)
+    
+    def invalidate_structure(self, guild: discord.Guild):
+        """Descarta o resumo de canais e cargos do servidor"""
+        if self.guild_snapshots:
+            self.guild_snapshots.invalidate(guild.id)
     
     async def send_log_message(self, guild: discord.Guild, message: str):
         """Envia mensagem para o canal de logs se configurado"""
@@ -0,0 +1,117 @@
+"""
+Parser incremental das ações JSON geradas pelo LLM
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class ActionStreamParser:
+    """
+    Recebe o texto aos pedaços e devolve cada objeto de ação assim que ele fecha
+
+    Só uma lista no topo ([{...}, {...}]) é emitida aos pedaços, elemento a elemento.
+    Um objeto no topo (uma ação só ou o formato do modo JSON, {"actions": [{...}]})
+    é decodificado inteiro em close(): arrays dentro dele são parâmetros.
+    """
+
+    def __init__(self):
+        self._text: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._array_depth: Optional[int] = None
+        self._array_closed = False
+        self._top_object = False
+        self._object: Optional[List[str]] = None
+        self.emitted = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Processa um pedaço do stream e retorna as ações completas encontradas"""
+        actions = []
+        self._text.append(chunk)
+
+        for char in chunk:
+            if self._object is not None:
+                self._object.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if self._array_closed:
+                continue
+
+            if char == '"' and self._depth > 0:
+                self._in_string = True
+            elif char in "[{":
+                self._depth += 1
+                if char == "{" and self._depth == 1 and self._array_depth is None:
+                    self._top_object = True
+                elif char == "[" and self._depth == 1 and self._array_depth is None and not self._top_object:
+                    self._array_depth = self._depth
+                elif char == "{" and self._array_depth is not None and self._depth == self._array_depth + 1:
+                    self._object = ["{"]
+            elif char in "]}" and self._depth > 0:
+                if char == "}" and self._object is not None and self._depth == self._array_depth + 1:
+                    action = self._decode("".join(self._object))
+                    if action is not None:
+                        actions.append(action)
+                    self._object = None
+                self._depth -= 1
+                if char == "]" and self._array_depth is not None and self._depth < self._array_depth:
+                    self._array_closed = True
+
+        self.emitted += len(actions)
+        return actions
+
+    @staticmethod
+    def _decode(raw: str) -> Optional[Dict[str, Any]]:
+        """Decodifica um objeto de ação isolado"""
+        try:
+            action = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.warning("⚠️ Ação da IA não é JSON válido")
+            return None
+        return action if isinstance(action, dict) else None
+
+    @property
+    def text(self) -> str:
+        """Texto completo recebido até agora"""
+        return "".join(self._text)
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        Finaliza o stream: se nenhuma ação foi emitida, tenta o texto inteiro
+        e, por fim, trata a resposta como chat simples
+        """
+        if self.emitted:
+            return []
+
+        text = self.text.strip()
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            data = None
+
+        if isinstance(data, dict):
+            actions = data.get("actions", [data])
+            if isinstance(actions, list):
+                return [action for action in actions if isinstance(action, dict)]
+        if isinstance(data, list):
+            return [action for action in data if isinstance(action, dict)]
+
+        if text.startswith("[") or text.startswith("{"):
+            logger.warning("⚠️ Resposta da IA não é JSON válido")
+        return [{"action": "resposta", "resposta": text}]
+
+def parse_actions(text: str) -> List[Dict[str, Any]]:
+    """Analisa uma resposta completa (caminho sem streaming)"""
+    parser = ActionStreamParser()
+    return parser.feed(text) + parser.close()
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""
+Memória de conversa por canal/usuário com orçamento de tokens
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (canal, usuário)
+ConversationKey = Tuple[Optional[int], Optional[int]]
+
+# summarizer(resumo_anterior, turnos_removidos) -> novo resumo
+Summarizer = Callable[[str, List[Dict[str, str]]], Awaitable[str]]
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa barata de tokens (~4 caracteres por token)"""
+    return len(text) // 4 + 4
+
+class _Conversation:
+    """Turnos recentes em buffer circular, mais um resumo do que saiu"""
+    
+    def __init__(self, max_turns: int):
+        self.turns: Deque[Dict[str, str]] = deque(maxlen=max_turns)
+        self.tokens = 0
+        self.summary = ""
+        self.updated = time.monotonic()
+        self.summarizing: Optional["asyncio.Task"] = None
+        # Turnos removidos que ainda não entraram no resumo
+        self.pending: List[Dict[str, str]] = []
+
+class ConversationMemory:
+    """Guarda o histórico recente de cada conversa, limitado em tokens e em quantidade"""
+    
+    def __init__(self, max_turns: int = 20, token_budget: int = 1500, max_conversations: int = 5000,
+                 ttl: float = 1800.0, summarizer: Optional[Summarizer] = None):
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.max_conversations = max_conversations
+        self.ttl = ttl
+        self.summarizer = summarizer
+        self._conversations: "OrderedDict[ConversationKey, _Conversation]" = OrderedDict()
+        logger.info(f"✅ Memória de conversa inicializada (orçamento de {token_budget} tokens)")
+    
+    def _evict(self):
+        """Remove conversas ociosas (TTL) e as menos recentes acima do limite"""
+        now = time.monotonic()
+        while self._conversations:
+            key, conversation = next(iter(self._conversations.items()))
+            if now - conversation.updated < self.ttl and len(self._conversations) <= self.max_conversations:
+                break
+            del self._conversations[key]
+    
+    def history(self, key: ConversationKey) -> List[Dict[str, str]]:
+        """Mensagens anteriores prontas para enviar ao modelo"""
+        self._evict()
+        conversation = self._conversations.get(key)
+        if conversation is None:
+            return []
+        
+        messages = []
+        if conversation.summary:
+            messages.append({"role": "system", "content": f"Resumo da conversa até aqui: {conversation.summary}"})
+        messages.extend({"role": turn["role"], "content": turn["content"]} for turn in conversation.turns)
+        return messages
+    
+    def append(self, key: ConversationKey, user_message: str, reply: str):
+        """Registra uma troca e aplica o orçamento de tokens"""
+        conversation = self._conversations.get(key)
+        if conversation is None:
+            conversation = self._conversations[key] = _Conversation(self.max_turns)
+        self._conversations.move_to_end(key)
+        conversation.updated = time.monotonic()
+        
+        removed: List[Dict[str, str]] = []
+        for role, content in (("user", user_message), ("assistant", reply)):
+            if len(conversation.turns) == conversation.turns.maxlen:
+                removed.append(conversation.turns[0])
+                conversation.tokens -= estimate_tokens(conversation.turns[0]["content"])
+            conversation.turns.append({"role": role, "content": content})
+            conversation.tokens += estimate_tokens(content)
+        
+        # Mantém pelo menos a última troca, mesmo que ela sozinha passe do orçamento
+        while conversation.tokens > self.token_budget and len(conversation.turns) > 2:
+            turn = conversation.turns.popleft()
+            conversation.tokens -= estimate_tokens(turn["content"])
+            removed.append(turn)
+        
+        if removed:
+            self._summarize(conversation, removed)
+        self._evict()
+    
+    def _summarize(self, conversation: _Conversation, removed: List[Dict[str, str]]):
+        """Resume em segundo plano os turnos que saíram do buffer"""
+        if self.summarizer is None:
+            return
+        # Turnos removidos durante um resumo em andamento ficam pendentes e entram na próxima rodada
+        conversation.pending.extend(removed)
+        if conversation.summarizing and not conversation.summarizing.done():
+            return
+        
+        async def run():
+            while conversation.pending:
+                batch, conversation.pending = conversation.pending, []
+                try:
+                    conversation.summary = await self.summarizer(conversation.summary, batch)
+                except Exception as e:
+                    logger.warning(f"⚠️ Falha ao resumir conversa: {e}")
+                    # Guarda os turnos para a próxima tentativa, sem crescer além do buffer
+                    conversation.pending[:0] = batch
+                    del conversation.pending[:-self.max_turns]
+                    return
+        
+        conversation.summarizing = asyncio.ensure_future(run())
+    
+    def clear(self, key: ConversationKey):
+        """Esquece uma conversa"""
+        self._conversations.pop(key, None)
+    
+    def stats(self) -> Dict[str, int]:
+        """Quantidade de conversas e tokens guardados"""
+        return {
+            "conversations": len(self._conversations),
+            "tokens": sum(c.tokens for c in self._conversations.values())
+        }
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Perfis de geração (temperature e max_tokens) por ponto de chamada e intenção
+"""
+import logging
+import random
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from bot.services.model_router import COMPLEX_HINTS
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    """Parâmetros de geração de um tipo de chamada"""
+    temperature: float
+    max_tokens: int
+
+# Valores usados antes dos perfis; também o braço de comparação do relatório
+BASELINE = GenerationProfile(temperature=0.7, max_tokens=1000)
+
+# Conversa social (saudações, agradecimentos): a resposta é curta pela intenção, não pelo
+# tamanho da pergunta; uma pergunta curta ainda pode pedir uma resposta longa
+_SMALL_TALK_WORD = (r"(?:oi+|ol[áa]|opa|eae|e a[íi]|bom dia|boa tarde|boa noite|obrigad[oa]|valeu|vlw|"
+                    r"tudo bem|tudo bom|beleza|blz|tchau|até mais|ate mais|ok|certo|show|kk+|(?:ha)+|rs+|"
+                    r"bot|pessoal|galera)")
+SMALL_TALK = re.compile(rf"\W*{_SMALL_TALK_WORD}(?:\W+{_SMALL_TALK_WORD})*\W*", re.IGNORECASE)
+
+PROFILES: Dict[str, GenerationProfile] = {
+    # Só para conversa social (SMALL_TALK); respostas cortadas avisam o usuário
+    "chat_curto": GenerationProfile(0.7, 300),
+    "chat": GenerationProfile(0.7, 1000),
+    # O embed do chat mostra até ~4000 caracteres (~1000 tokens); gerar mais que isso é descartado
+    "chat_longo": GenerationProfile(0.7, 1000),
+    # Plano admin: JSON determinístico; o teto não fica abaixo do baseline porque um plano
+    # cortado no meio é JSON inválido
+    "admin": GenerationProfile(0.1, 1000),
+    "admin:BÁSICO": GenerationProfile(0.2, 1000),
+    "admin:INFORMAÇÕES": GenerationProfile(0.0, 1000),
+    "admin:GERENCIAMENTO": GenerationProfile(0.0, 1000),
+    "admin:MODERAÇÃO": GenerationProfile(0.0, 1000),
+    "admin:AUTOMAÇÃO": GenerationProfile(0.1, 1000),
+    "admin:ENTRETENIMENTO": GenerationProfile(0.3, 1000),
+}
+
+class _ProfileStats:
+    """Somatórios de um perfil em um braço (perfil ou baseline)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.completion_tokens = 0
+        self.latency = 0.0
+        self.truncated = 0
+        self.reserved_tokens = 0
+
+class GenerationProfiles:
+    """
+    Escolhe o perfil de cada chamada e mede o efeito
+
+    Com baseline_rate > 0, uma fração das chamadas usa os valores antigos (BASELINE)
+    para comparar tokens gerados e tempo de geração com os do perfil.
+    """
+
+    def __init__(self, enabled: bool = True, baseline_rate: float = 0.0, simple_max_chars: int = 200,
+                 profiles: Optional[Dict[str, GenerationProfile]] = None):
+        self.enabled = enabled
+        self.baseline_rate = baseline_rate
+        self.simple_max_chars = simple_max_chars
+        self.profiles = profiles or PROFILES
+        self._stats: Dict[Tuple[str, str], _ProfileStats] = {}
+        logger.info(f"✅ Perfis de geração {'ativos' if enabled else 'desativados'}"
+                    f"{f' (baseline em {baseline_rate:.0%})' if baseline_rate else ''}")
+
+    def for_chat(self, message: str) -> str:
+        """Perfil de chat pelo tamanho esperado da resposta, deduzido da intenção da mensagem"""
+        if COMPLEX_HINTS.search(message):
+            return "chat_longo"
+        if len(message) <= self.simple_max_chars and SMALL_TALK.fullmatch(message):
+            return "chat_curto"
+        return "chat"
+
+    def for_admin(self, category: Optional[str]) -> str:
+        """Perfil do plano admin pela categoria detectada"""
+        name = f"admin:{category}"
+        return name if category and name in self.profiles else "admin"
+
+    def resolve(self, name: str) -> Tuple[str, GenerationProfile]:
+        """Braço ("perfil" ou "baseline") e parâmetros para a chamada"""
+        profile = self.profiles.get(name)
+        if not self.enabled or profile is None:
+            return "baseline", BASELINE
+        if self.baseline_rate and random.random() < self.baseline_rate:
+            return "baseline", BASELINE
+        return "perfil", profile
+
+    def record(self, name: str, arm: str, max_tokens: int, completion_tokens: int,
+               latency: float, truncated: bool):
+        """Registra o resultado de uma chamada feita com o perfil"""
+        key = (name, arm)
+        if key not in self._stats:
+            self._stats[key] = _ProfileStats()
+        stats = self._stats[key]
+        stats.calls += 1
+        stats.completion_tokens += completion_tokens
+        stats.latency += latency
+        stats.truncated += 1 if truncated else 0
+        stats.reserved_tokens += max_tokens
+
+    def report(self) -> List[Dict[str, float]]:
+        """
+        Por perfil: médias de tokens gerados e tempo, truncamentos e economia
+
+        A economia de tokens reservados (max_tokens) vale sempre; a de tokens gerados
+        e tempo só é calculada quando há chamadas no braço baseline para comparar
+        """
+        rows = []
+        for name in sorted({name for name, _ in self._stats}):
+            current = self._stats.get((name, "perfil"))
+            baseline = self._stats.get((name, "baseline"))
+            if current is None:
+                continue
+            row = {
+                "profile": name,
+                "calls": current.calls,
+                "avg_completion_tokens": current.completion_tokens / current.calls,
+                "avg_latency": current.latency / current.calls,
+                "truncated_rate": current.truncated / current.calls,
+                "reserved_tokens_saved": current.calls * BASELINE.max_tokens - current.reserved_tokens
+            }
+            if baseline and baseline.calls:
+                baseline_tokens = baseline.completion_tokens / baseline.calls
+                baseline_latency = baseline.latency / baseline.calls
+                row["baseline_calls"] = baseline.calls
+                row["tokens_saved_pct"] = (
+                    1 - row["avg_completion_tokens"] / baseline_tokens if baseline_tokens else 0.0
+                )
+                row["latency_saved_pct"] = (
+                    1 - row["avg_latency"] / baseline_latency if baseline_latency else 0.0
+                )
+            rows.append(row)
+        return rows
+
+    def export_metrics(self) -> str:
+        """Somatórios por perfil e braço no formato texto do Prometheus"""
+        metrics = [
+            ("skzgpt_llm_profile_calls_total", "calls"),
+            ("skzgpt_llm_profile_completion_tokens_total", "completion_tokens"),
+            ("skzgpt_llm_profile_latency_seconds_sum", "latency"),
+            ("skzgpt_llm_profile_truncated_total", "truncated"),
+            ("skzgpt_llm_profile_reserved_tokens_total", "reserved_tokens"),
+        ]
+        lines = []
+        for metric, attribute in metrics:
+            lines.append(f"# TYPE {metric} counter")
+            for (name, arm), stats in sorted(self._stats.items()):
+                lines.append(f'{metric}{{profile="{name}",arm="{arm}"}} {getattr(stats, attribute)}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,190 @@
+"""
+Cache de buscas de GIF: lote de resultados por termo, servido em rodízio
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from bot.services.response_cache import normalize_message
+from bot.services.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# fetch(termo) -> URLs encontradas ([] = nenhum resultado), ou None em caso de erro
+Fetcher = Callable[[str], Awaitable[Optional[List[str]]]]
+
+class _GifEntry:
+    """Lote de URLs de um termo e a posição do rodízio"""
+
+    __slots__ = ("urls", "created", "position")
+
+    def __init__(self, urls: List[str], created: float):
+        self.urls = urls
+        self.created = created
+        self.position = 0
+
+    def next_url(self) -> Optional[str]:
+        """Próxima URL do rodízio"""
+        if not self.urls:
+            return None
+        url = self.urls[self.position % len(self.urls)]
+        self.position += 1
+        return url
+
+class GifCache:
+    """
+    Guarda um lote de GIFs por termo normalizado e devolve um diferente a cada uso
+
+    Termos populares são renovados em segundo plano antes do TTL; buscas sem resultado
+    ficam em cache por menos tempo. O conjunto é limitado por LRU e pode ser salvo em
+    disco para sobreviver a reinícios.
+    """
+
+    def __init__(self, max_terms: int = 500, ttl: float = 6 * 3600.0, refresh_ahead: float = 0.8,
+                 negative_ttl: float = 600.0, snapshot_path: Optional[str] = None):
+        self.max_terms = max_terms
+        self.ttl = ttl
+        # Fração do TTL a partir da qual um acerto dispara a renovação em segundo plano
+        self.refresh_ahead = refresh_ahead
+        self.negative_ttl = negative_ttl
+        self.snapshot_path = snapshot_path
+        self._entries: "OrderedDict[str, _GifEntry]" = OrderedDict()
+        self._refreshing: Dict[str, "asyncio.Task"] = {}
+        self.singleflight = SingleFlight("gif")
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.stale_served = 0
+        logger.info(f"✅ Cache de GIFs inicializado ({max_terms} termos"
+                    f"{', snapshot em ' + snapshot_path if snapshot_path else ''})")
+
+    @staticmethod
+    def normalize(term: str) -> str:
+        """Termo normalizado (caixa e espaços)"""
+        return normalize_message(term)
+
+    def _ttl(self, entry: _GifEntry) -> float:
+        return self.ttl if entry.urls else self.negative_ttl
+
+    async def get(self, term: str, fetch: Fetcher) -> Optional[str]:
+        """URL de um GIF para o termo, do cache quando possível"""
+        key = self.normalize(term)
+        entry = self._entries.get(key)
+        now = time.time()
+
+        if entry is not None:
+            age = now - entry.created
+            if age < self._ttl(entry):
+                self._entries.move_to_end(key)
+                if not entry.urls:
+                    self.negative_hits += 1
+                    return None
+                self.hits += 1
+                if age >= self.refresh_ahead * self.ttl and key not in self._refreshing:
+                    task = asyncio.ensure_future(self._refresh(key, fetch))
+                    self._refreshing[key] = task
+                    task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+                return entry.next_url()
+
+        self.misses += 1
+        urls = await self.singleflight.do(key, lambda: fetch(key))
+        if urls is None:
+            # Tenor fora do ar: um lote vencido ainda serve
+            if entry is not None and entry.urls:
+                self.stale_served += 1
+                return entry.next_url()
+            return None
+
+        # Chamadas agrupadas na mesma busca: só a primeira grava, as demais seguem o rodízio
+        current = self._entries.get(key)
+        if current is None or current.created < now:
+            current = self._store(key, urls)
+        return current.next_url()
+
+    async def _refresh(self, key: str, fetch: Fetcher):
+        """Renova o lote em segundo plano, mantendo o atual se a busca falhar"""
+        try:
+            urls = await self.singleflight.do(key, lambda: fetch(key))
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao renovar GIFs de '{key}': {e}")
+            return
+        if urls is not None:
+            self.refreshes += 1
+            self._store(key, urls)
+
+    def _store(self, key: str, urls: List[str], created: Optional[float] = None) -> _GifEntry:
+        """Insere o lote embaralhado no LRU"""
+        urls = list(urls)
+        random.shuffle(urls)
+        entry = _GifEntry(urls, time.time() if created is None else created)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_terms:
+            self._entries.popitem(last=False)
+        return entry
+
+    def terms(self) -> List[str]:
+        """Termos com resultados, do mais para o menos recente"""
+        return [key for key, entry in reversed(self._entries.items()) if entry.urls]
+
+    async def load(self):
+        """Carrega o snapshot do disco, descartando termos já vencidos"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            data = await asyncio.to_thread(self._read_snapshot)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Snapshot de GIFs ignorado: {e}")
+            return
+
+        now = time.time()
+        loaded = 0
+        for key, urls, created in data:
+            ttl = self.ttl if urls else self.negative_ttl
+            if now - created < ttl:
+                self._store(key, urls, created)
+                loaded += 1
+        logger.info(f"📂 {loaded} termo(s) de GIF carregados do snapshot")
+
+    async def save(self):
+        """Grava o conjunto atual no disco (escrita atômica)"""
+        if not self.snapshot_path:
+            return
+        data = [[key, entry.urls, entry.created] for key, entry in self._entries.items()]
+        try:
+            await asyncio.to_thread(self._write_snapshot, data)
+        except OSError as e:
+            logger.error(f"❌ Erro ao salvar snapshot de GIFs: {e}")
+
+    def _read_snapshot(self) -> list:
+        with open(self.snapshot_path, encoding="utf-8") as file:
+            return json.load(file)
+
+    def _write_snapshot(self, data: list):
+        temporary = f"{self.snapshot_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(temporary, self.snapshot_path)
+
+    async def close(self):
+        """Cancela renovações pendentes e salva o snapshot"""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await self.save()
+
+    def stats(self) -> Dict[str, int]:
+        """Termos em cache e contadores de acertos, falhas e renovações"""
+        return {
+            "terms": len(self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "stale_served": self.stale_served
+        }
@@ -2,54 +2,97 @@
 Serviço para buscar GIFs do Tenor
 """
 import logging
-import requests
-from typing import Optional
+import httpx
+from typing import List, Optional
+
+from bot.services.gif_cache import GifCache
 
 logger = logging.getLogger(__name__)
 
 class GifService:
     """Serviço para buscar GIFs usando a API Tenor"""
     
-    def __init__(self, api_key: Optional[str]):
+    def __init__(self, api_key: Optional[str], max_connections: int = 10, max_keepalive: int = 5,
+                 keepalive_expiry: float = 30.0, timeout: float = 10.0, connect_timeout: float = 5.0,
+                 cache: Optional[GifCache] = None, batch_size: int = 20):
         self.api_key = api_key
-        self.base_url = "https://tenor.googleapis.com/v2/search"
+        self.cache = cache
+        # Resultados buscados por termo quando há cache (rodízio)
+        self.batch_size = batch_size
+        self.base_url = "https://tenor.googleapis.com/v2"
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        # Sessão HTTP compartilhada (keep-alive), aberta em start() e fechada em close()
+        self.http_client: Optional[httpx.AsyncClient] = None
         
         if not api_key:
             logger.warning("⚠️ TENOR_API_KEY não fornecida - funcionalidade de GIF desabilitada")
         else:
             logger.info("✅ Serviço GIF inicializado")
     
-    async def search_gif(self, query: str, limit: int = 1) -> Optional[str]:
+    async def start(self):
+        """Abre a sessão HTTP compartilhada e carrega o snapshot do cache"""
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+            if self.cache:
+                await self.cache.load()
+    
+    async def close(self):
+        """Salva o cache e fecha a sessão HTTP"""
+        if self.cache:
+            await self.cache.close()
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+            logger.info("🛑 Serviço GIF encerrado")
+    
+    async def search_gif(self, query: str) -> Optional[str]:
         """
         Busca GIF pelo termo especificado
+        
+        Com cache, cada termo busca um lote no Tenor e os usos seguintes alternam entre eles
         """
         if not self.api_key:
             logger.warning("⚠️ Tentativa de buscar GIF sem API key")
             return None
         
+        if self.cache:
+            return await self.cache.get(query, self._fetch)
+        
+        urls = await self._fetch(query)
+        return urls[0] if urls else None
+    
+    async def _fetch(self, query: str) -> Optional[List[str]]:
+        """Consulta o Tenor; retorna as URLs ([] sem resultados) ou None em caso de erro"""
         try:
             params = {
                 "q": query,
                 "key": self.api_key,
-                "limit": limit,
+                "limit": self.batch_size if self.cache else 1,
                 "media_filter": "gif"
             }
             
-            response = requests.get(self.base_url, params=params, timeout=10)
+            if self.http_client is None:
+                await self.start()
+            response = await self.http_client.get(f"{self.base_url}/search", params=params)
             response.raise_for_status()
             
             data = response.json()
             results = data.get("results", [])
             
             if results:
-                gif_url = results[0]["media_formats"]["gif"]["url"]
-                logger.info(f"✅ GIF encontrado para: {query}")
-                return gif_url
+                urls = [result["media_formats"]["gif"]["url"] for result in results]
+                logger.info(f"✅ {len(urls)} GIF(s) encontrado(s) para: {query}")
+                return urls
             else:
                 logger.info(f"ℹ️ Nenhum GIF encontrado para: {query}")
-                return None
-                
-        except requests.RequestException as e:
+                return []
+        
+        except httpx.HTTPError as e:
             logger.error(f"❌ Erro na requisição Tenor: {e}")
             return None
         except KeyError as e:
@@ -59,6 +102,34 @@ class GifService:
             logger.error(f"❌ Erro inesperado ao buscar GIF: {e}")
             return None
     
+    async def autocomplete_terms(self, prefix: str, limit: int = 20) -> Optional[List[str]]:
+        """Termos sugeridos pelo Tenor para um prefixo; None em caso de erro"""
+        return await self._terms("autocomplete", {"q": prefix, "limit": limit})
+    
+    async def trending_terms(self, limit: int = 20) -> Optional[List[str]]:
+        """Termos em alta no Tenor; None em caso de erro"""
+        return await self._terms("trending_terms", {"limit": limit})
+    
+    async def _terms(self, endpoint: str, params: dict) -> Optional[List[str]]:
+        """Consulta um endpoint do Tenor que devolve uma lista de termos"""
+        if not self.api_key:
+            return None
+        try:
+            if self.http_client is None:
+                await self.start()
+            response = await self.http_client.get(
+                f"{self.base_url}/{endpoint}", params={**params, "key": self.api_key}
+            )
+            response.raise_for_status()
+            return [term for term in response.json().get("results", []) if isinstance(term, str)]
+        
+        except httpx.HTTPError as e:
+            logger.warning(f"⚠️ Erro ao buscar termos do Tenor ({endpoint}): {e}")
+            return None
+        except ValueError as e:
+            logger.warning(f"⚠️ Resposta inválida do Tenor ({endpoint}): {e}")
+            return None
+    
     def is_available(self) -> bool:
         """Verifica se o serviço está disponível"""
         return self.api_key is not None
\ No newline at end of file
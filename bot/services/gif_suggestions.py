@@ -0,0 +1,196 @@
+"""
+Sugestões de termos para o autocomplete do /gif (índice de prefixos em memória)
+"""
+import asyncio
+import heapq
+import logging
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from bot.services.gif_cache import GifCache
+from bot.services.gif_service import GifService
+
+logger = logging.getLogger(__name__)
+
+# Peso de cada origem; termos que já deram resultado aqui vêm primeiro
+WEIGHT_SEARCHED = 3.0
+WEIGHT_TRENDING = 2.0
+WEIGHT_SUGGESTED = 1.0
+
+def normalize_term(term: str) -> str:
+    """Forma de comparação: minúsculas, sem acentos e espaços repetidos"""
+    decomposed = unicodedata.normalize("NFD", term.casefold())
+    stripped = "".join(c for c in decomposed if unicodedata.category(c) != "Mn")
+    return " ".join(stripped.split())
+
+class _TrieNode:
+    """Nó do índice: filhos por caractere e o termo que termina aqui"""
+
+    __slots__ = ("children", "term")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.term: Optional[str] = None
+
+class PrefixTrie:
+    """Árvore de prefixos sobre os termos normalizados, com peso por termo"""
+
+    def __init__(self, max_terms: int = 5000):
+        self.max_terms = max_terms
+        self._root = _TrieNode()
+        # normalizado -> (peso, termo como exibido)
+        self._terms: Dict[str, Tuple[float, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add(self, term: str, weight: float):
+        """Insere o termo ou soma peso a ele"""
+        key = normalize_term(term)
+        if not key:
+            return
+        current = self._terms.get(key)
+        if current is not None:
+            self._terms[key] = (current[0] + weight, current[1])
+            return
+
+        if len(self._terms) >= self.max_terms:
+            # Índice cheio: sai o termo de menor peso, se for menor que o novo
+            lowest = min(self._terms, key=lambda k: self._terms[k][0])
+            if self._terms[lowest][0] >= weight:
+                return
+            self.remove(lowest)
+
+        node = self._root
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+        node.term = key
+        self._terms[key] = (weight, term.strip())
+
+    def remove(self, key: str):
+        """Remove um termo já normalizado (os nós vazios ficam para o próximo uso)"""
+        node = self._root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return
+        node.term = None
+        self._terms.pop(key, None)
+
+    def complete(self, prefix: str, limit: int = 25) -> List[str]:
+        """Termos que começam com o prefixo, do maior para o menor peso"""
+        node = self._root
+        for char in normalize_term(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        found = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.term is not None:
+                found.append(self._terms[node.term])
+            stack.extend(node.children.values())
+        return [term for _, term in heapq.nlargest(limit, found)]
+
+class GifSuggestions:
+    """
+    Responde o autocomplete do /gif só com o índice em memória
+
+    O índice começa com os termos do cache de GIFs e os em alta no Tenor; prefixos com
+    poucas sugestões disparam uma consulta ao autocomplete do Tenor em segundo plano,
+    que enriquece as próximas teclas. Um laço renova o índice periodicamente.
+    """
+
+    def __init__(self, gif_service: GifService, cache: Optional[GifCache] = None, max_terms: int = 5000,
+                 refresh_interval: float = 3600.0, min_prefix: int = 2, prefix_ttl: float = 3600.0,
+                 max_fetches: int = 2):
+        self.gif_service = gif_service
+        self.cache = cache
+        self.trie = PrefixTrie(max_terms)
+        self.refresh_interval = refresh_interval
+        self.min_prefix = min_prefix
+        self.prefix_ttl = prefix_ttl
+        self.max_fetches = max_fetches
+        # Prefixos já consultados no Tenor (normalizado -> instante)
+        self._fetched: "OrderedDict[str, float]" = OrderedDict()
+        self._fetching: Dict[str, "asyncio.Task"] = {}
+        self._task: Optional["asyncio.Task"] = None
+        self.completions = 0
+        self.prefix_fetches = 0
+        logger.info("✅ Autocomplete de GIFs inicializado")
+
+    def start(self):
+        """Inicia o laço de renovação (a primeira carga é imediata)"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._refresh_loop())
+
+    async def close(self):
+        """Para a renovação e as consultas pendentes"""
+        tasks = list(self._fetching.values()) + ([self._task] if self._task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def _refresh_loop(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    async def refresh(self):
+        """Recarrega termos do cache de GIFs e os em alta no Tenor"""
+        if self.cache:
+            for term in self.cache.terms():
+                self.trie.add(term, WEIGHT_SEARCHED)
+        trending = await self.gif_service.trending_terms()
+        for rank, term in enumerate(trending or []):
+            self.trie.add(term, WEIGHT_TRENDING * (1 - rank / 100))
+        logger.info(f"🔤 Índice de autocomplete de GIFs com {len(self.trie)} termo(s)")
+
+    def record(self, term: str):
+        """Registra um termo que acabou de dar resultado"""
+        self.trie.add(term, WEIGHT_SEARCHED)
+
+    def complete(self, prefix: str, limit: int = 25) -> List[str]:
+        """Sugestões para o que o usuário digitou, sem acesso à rede"""
+        self.completions += 1
+        results = self.trie.complete(prefix, limit)
+        if len(results) < limit:
+            self._schedule_fetch(prefix)
+        return results
+
+    def _schedule_fetch(self, prefix: str):
+        """Consulta o autocomplete do Tenor em segundo plano, uma vez por prefixo e TTL"""
+        key = normalize_term(prefix)
+        if len(key) < self.min_prefix or key in self._fetching or len(self._fetching) >= self.max_fetches:
+            return
+        fetched = self._fetched.get(key)
+        if fetched is not None and time.monotonic() - fetched < self.prefix_ttl:
+            return
+
+        self._fetched[key] = time.monotonic()
+        self._fetched.move_to_end(key)
+        while len(self._fetched) > self.trie.max_terms:
+            self._fetched.popitem(last=False)
+
+        task = asyncio.ensure_future(self._fetch_prefix(key))
+        self._fetching[key] = task
+        task.add_done_callback(lambda _: self._fetching.pop(key, None))
+
+    async def _fetch_prefix(self, prefix: str):
+        terms = await self.gif_service.autocomplete_terms(prefix)
+        self.prefix_fetches += 1
+        for rank, term in enumerate(terms or []):
+            self.trie.add(term, WEIGHT_SUGGESTED * (1 - rank / 100))
+
+    def stats(self) -> Dict[str, int]:
+        """Termos no índice, consultas respondidas e prefixos buscados no Tenor"""
+        return {
+            "terms": len(self.trie),
+            "completions": self.completions,
+            "prefix_fetches": self.prefix_fetches
+        }
@@ -1,191 +1,641 @@
 """
 Serviço para integração com Groq AI
 """
-import json
+import time
 import logging
-from typing import List, Dict, Any, Optional
-from groq import Groq
+import contextlib
+import httpx
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+from groq import AsyncGroq
+
+from bot.services.response_cache import ResponseCache
+from bot.services.request_context import RequestContext
+from bot.services.llm_scheduler import LLMScheduler, SchedulerRejectedError
+from bot.services.singleflight import SingleFlight
+from bot.services.conversation_memory import ConversationMemory
+from bot.services.model_router import ModelRouter
+from bot.services.action_parser import ActionStreamParser, parse_actions
+from bot.services.retry_policy import RetryPolicy
+from bot.services.key_pool import KeyPool
+from bot.services.hedging import Hedger
+from bot.services.generation_profiles import GenerationProfiles
+from bot.services.usage_tracker import UsageTracker
+from bot.services.conversation_memory import estimate_tokens
+from bot.utils.action_catalog import (
+    CATEGORY_CLASSIFIER_PROMPT, build_admin_prompt, classify_category, parse_category
+)
+from bot.utils.action_schema import build_repair_message, validate_plan
 
 logger = logging.getLogger(__name__)
 
+ERROR_MESSAGE = "Desculpe, ocorreu um erro ao processar sua mensagem. Tente novamente."
+# Anexado às respostas de chat cortadas pelo max_tokens do perfil
+TRUNCATED_NOTICE = "\n\n✂️ *Resposta cortada pelo limite de tamanho. Peça para continuar se quiser o resto.*"
+
 class GroqService:
     """Serviço para interação com a API Groq"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_connections: int = 50, max_keepalive: int = 20,
+                 keepalive_expiry: float = 30.0, timeout: float = 30.0,
+                 connect_timeout: float = 5.0, cache: Optional[ResponseCache] = None,
+                 admin_prompt_mode: str = "scoped", category_classifier: str = "local",
+                 classifier_model: str = "llama-3.1-8b-instant",
+                 scheduler: Optional[LLMScheduler] = None,
+                 memory: Optional[ConversationMemory] = None,
+                 router: Optional[ModelRouter] = None,
+                 admin_streaming: bool = True, admin_json_mode: bool = False,
+                 retry: Optional[RetryPolicy] = None,
+                 usage: Optional[UsageTracker] = None,
+                 extra_api_keys: Optional[List[str]] = None, key_hard_limit_seconds: float = 60.0,
+                 key_auth_quarantine: float = 3600.0, hedger: Optional[Hedger] = None,
+                 profiles: Optional[GenerationProfiles] = None, base_url: Optional[str] = None,
+                 validate_plans: bool = True):
         if not api_key:
             raise ValueError("GROQ_API_KEY é obrigatório")
         
-        self.client = Groq(api_key=api_key)
-        self.model = "llama-3.3-70b-versatile"
-        logger.info("✅ Serviço Groq inicializado")
+        # Conexão HTTP compartilhada (keep-alive) entre todas as chamadas
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry
+            ),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout)
+        )
+        # Um cliente por chave, todos sobre o mesmo pool HTTP; novas tentativas ficam com a
+        # RetryPolicy, que conhece a cota de cada chave e o prazo
+        api_keys = list(dict.fromkeys([api_key] + (extra_api_keys or [])))
+        self.keys = KeyPool(
+            [(key, AsyncGroq(api_key=key, http_client=self.http_client, max_retries=0, base_url=base_url))
+             for key in api_keys],
+            hard_limit_seconds=key_hard_limit_seconds,
+            auth_quarantine=key_auth_quarantine
+        )
+        self.client = self.keys.keys[0].client
+        self.retry = retry or RetryPolicy()
+        self.usage = usage
+        # Hedging é opcional: sem Hedger cada chamada vai uma vez só
+        self.hedger = hedger
+        # temperature/max_tokens por tipo de chamada (sem perfis: 0.7 e 1000 em tudo)
+        self.profiles = profiles
+        if usage:
+            usage.add_collector(self.keys.export_metrics)
+            if hedger:
+                usage.add_collector(hedger.export_metrics)
+            if profiles:
+                usage.add_collector(profiles.export_metrics)
+            if cache:
+                usage.add_collector(cache.export_metrics)
+        self.model = router.large_model if router else "llama-3.3-70b-versatile"
+        self.temperature = 0.7
+        self.cache = cache
+        self.scheduler = scheduler
+        self.singleflight = SingleFlight("llm")
+        if usage:
+            usage.add_collector(self.singleflight.export_metrics)
+        self.memory = memory
+        self.router = router
+        if memory and memory.summarizer is None:
+            memory.summarizer = self._summarize_turns
+        
+        # "monolithic" envia o catálogo inteiro; "scoped" só a categoria detectada
+        self.admin_prompt_mode = admin_prompt_mode
+        self.category_classifier = category_classifier
+        self.classifier_model = classifier_model
+        
+        # Plano admin: streaming com parser incremental ou modo JSON da API (sem streaming)
+        self.admin_streaming = admin_streaming
+        self.admin_json_mode = admin_json_mode
+        # Plano admin conferido por inteiro antes de qualquer chamada ao Discord
+        self.validate_plans = validate_plans
+        self.plan_repairs = 0
+        self.plan_rejections = 0
+        logger.info(f"✅ Serviço Groq inicializado (pool de {max_connections} conexões, "
+                    f"{len(self.keys)} chave(s))")
+    
+    async def close(self):
+        """Fecha o pool de conexões HTTP"""
+        for key in self.keys.keys:
+            await key.client.close()
+        await self.http_client.aclose()
+        if self.cache:
+            self.cache.close()
+        logger.info("🛑 Serviço Groq encerrado")
+    
+    def _build_messages(self, message: str, system_prompt: Optional[str] = None,
+                        history: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
+        """Monta a lista de mensagens enviada ao modelo"""
+        messages = []
+        
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        
+        if history:
+            messages.extend(history)
+        
+        messages.append({"role": "user", "content": message})
+        return messages
+    
+    def _memory_key(self, context: RequestContext, remember: bool):
+        """Chave da conversa, ou None se a memória não se aplica"""
+        if not remember or not self.memory or (context.channel_id is None and context.user_id is None):
+            return None
+        return (context.channel_id, context.user_id)
+    
+    def _remember(self, memory_key, message: str, reply: str):
+        """Guarda a troca na memória (respostas de erro não entram)"""
+        if memory_key and reply and not reply.endswith(ERROR_MESSAGE):
+            self.memory.append(memory_key, message, reply)
+    
+    async def _summarize_turns(self, summary: str, turns: List[Dict[str, str]]) -> str:
+        """Resume turnos antigos da conversa com o modelo pequeno"""
+        transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+        prompt = (
+            "Atualize o resumo de uma conversa entre um usuário e um assistente. "
+            "Responda só com o novo resumo, em até 5 frases, mantendo fatos e pedidos importantes."
+        )
+        new_summary = await self.chat_completion(
+            f"Resumo anterior: {summary or '(vazio)'}\n\nNovos trechos:\n{transcript}",
+            prompt, model=self.classifier_model, temperature=0.3, max_tokens=200, purpose="resumo"
+        )
+        return summary if new_summary == ERROR_MESSAGE else new_summary
+    
+    @staticmethod
+    def _estimate_request_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """Tokens que a chamada deve consumir da cota (entrada estimada + saída máxima)"""
+        return sum(estimate_tokens(m["content"]) for m in messages) + max_tokens
+    
+    def _select_model(self, message: str, purpose: str, history: List[Dict[str, str]]) -> str:
+        """Modelo para a requisição (o grande quando não há roteador)"""
+        if not self.router:
+            return self.model
+        return self.router.select(message, purpose, has_history=bool(history))
+    
+    def _candidates(self, model: str) -> List[str]:
+        """Modelos a tentar, em ordem, considerando o disjuntor"""
+        return self.router.candidates(model) if self.router else [model]
+    
+    def _record(self, model: str, started: float, ok: bool):
+        """Alimenta as métricas de latência/erro do roteador"""
+        if self.router:
+            self.router.record(model, time.monotonic() - started, ok)
+    
+    def _release(self, model: str):
+        """Chamada cancelada: sem resultado para o roteador, mas a chamada de teste do disjuntor volta"""
+        if self.router:
+            self.router.release(model)
+    
+    def _account(self, context: RequestContext, model: str, started: float, ok: bool,
+                 prompt_tokens: int = 0, completion_tokens: int = 0):
+        """Registra tokens e latência da chamada na contabilidade de uso"""
+        if self.usage:
+            self.usage.record(context, model, prompt_tokens, completion_tokens,
+                              time.monotonic() - started, ok=ok)
+    
+    def _account_cache_hit(self, context: RequestContext, model: str):
+        """Registra uma resposta servida pelo cache"""
+        if self.usage:
+            self.usage.record(context, model, cached=True)
+    
+    def _slot(self, context: RequestContext):
+        """Vaga no escalonador (sem restrição quando não há escalonador)"""
+        if self.scheduler is None:
+            return contextlib.nullcontext()
+        return self.scheduler.slot(context)
+    
+    def _generation(self, message: str, purpose: str, profile: Optional[str],
+                    temperature: Optional[float], max_tokens: Optional[int]):
+        """
+        Perfil e parâmetros da chamada; valores passados explicitamente têm prioridade
+        
+        Retorna ((perfil, braço) ou None, temperature, max_tokens)
+        """
+        tag = None
+        if self.profiles:
+            if profile is None and purpose == "chat":
+                profile = self.profiles.for_chat(message)
+            if profile is not None:
+                arm, params = self.profiles.resolve(profile)
+                tag = (profile, arm)
+                temperature = params.temperature if temperature is None else temperature
+                max_tokens = params.max_tokens if max_tokens is None else max_tokens
+        temperature = self.temperature if temperature is None else temperature
+        max_tokens = 1000 if max_tokens is None else max_tokens
+        return tag, temperature, max_tokens
+    
+    def _profile_record(self, tag: Optional[Tuple[str, str]], max_tokens: int, completion_tokens: int,
+                        started: float, truncated: bool):
+        """Alimenta o relatório dos perfis de geração"""
+        if self.profiles and tag:
+            self.profiles.record(tag[0], tag[1], max_tokens, completion_tokens,
+                                 time.monotonic() - started, truncated)
+    
+    def _cache_key(self, message: str, system_prompt: Optional[str], context: RequestContext,
+                   model: str, temperature: float, max_tokens: int) -> Optional[str]:
+        """Chave de cache da requisição, ou None se o cache não se aplica"""
+        if not self.cache or not self.cache.is_enabled_for(context.guild_id):
+            return None
+        return ResponseCache.make_key(model, system_prompt, message, temperature, max_tokens)
+    
+    def _flight_key(self, message: str, system_prompt: Optional[str], context: RequestContext,
+                    model: str, temperature: float, max_tokens: int) -> str:
+        """
+        Chave do agrupamento de requisições idênticas
+        
+        Servidores que desativaram o cache só agrupam entre si mesmos: a resposta
+        de um não é entregue a outro servidor
+        """
+        key = ResponseCache.make_key(model, system_prompt, message, temperature, max_tokens)
+        if self.cache and not self.cache.is_enabled_for(context.guild_id):
+            key = f"{key}:sem-cache:{context.guild_id}"
+        return key
     
-    async def chat_completion(self, message: str, system_prompt: Optional[str] = None) -> str:
+    async def chat_completion(self, message: str, system_prompt: Optional[str] = None,
+                              context: Optional[RequestContext] = None, model: Optional[str] = None,
+                              temperature: Optional[float] = None, max_tokens: Optional[int] = None,
+                              remember: bool = False, purpose: str = "chat", json_mode: bool = False,
+                              profile: Optional[str] = None) -> str:
         """
         Gera uma resposta de chat usando Groq
+        
+        Com remember=True, o histórico da conversa (canal + usuário) entra no contexto.
+        temperature/max_tokens não informados vêm do perfil de geração
         """
-        try:
-            messages = []
-            
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            
-            messages.append({"role": "user", "content": message})
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1000
+        context = context or RequestContext()
+        tag, temperature, max_tokens = self._generation(message, purpose, profile, temperature, max_tokens)
+        memory_key = self._memory_key(context, remember)
+        history = self.memory.history(memory_key) if memory_key else []
+        model = model or self._select_model(message, purpose, history)
+        
+        # Respostas que dependem do histórico não são compartilhadas nem cacheadas
+        if history:
+            async with self._slot(context):
+                reply = await self._complete(message, system_prompt, context, model, temperature,
+                                             max_tokens, None, history, json_mode, tag)
+            self._remember(memory_key, message, reply)
+            return reply
+        
+        cache_key = self._cache_key(message, system_prompt, context, model, temperature, max_tokens)
+        if cache_key:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                self._account_cache_hit(context, model)
+                self._remember(memory_key, message, cached)
+                return cached
+        
+        # Requisições idênticas simultâneas compartilham uma única chamada; a vaga no
+        # escalonador é de cada usuário, só a chamada upstream é compartilhada
+        flight_key = self._flight_key(message, system_prompt, context, model, temperature, max_tokens)
+        async with self._slot(context):
+            reply = await self.singleflight.do(
+                flight_key,
+                lambda: self._complete(message, system_prompt, context, model, temperature,
+                                       max_tokens, cache_key, json_mode=json_mode, profile=tag)
             )
+        self._remember(memory_key, message, reply)
+        return reply
+    
+    def _request(self, model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int,
+                 context: RequestContext, **options):
+        """Chamada ao Groq pela RetryPolicy, na chave escolhida pelo pool"""
+        return self.retry.run(
+            model,
+            lambda client: client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **options
+            ),
+            context,
+            self.keys,
+            tokens=self._estimate_request_tokens(messages, max_tokens)
+        )
+    
+    async def _hedged(self, model: str, attempt, kind: str, discard=None):
+        """Executa attempt(modelo), com requisição de reserva quando o hedging está ativo"""
+        if not self.hedger:
+            return await attempt(model), model
+        
+        hedge_model = None
+        if self.hedger.fallback and self.router:
+            alternate = self.router.alternate(model)
+            hedge_model = alternate if self.router.is_healthy(alternate) else None
+        # A tentativa que perdeu também alimenta o roteador (ou devolve a chamada de teste do disjuntor)
+        record = release = None
+        if self.router:
+            record, release = self.router.record, self.router.release
+        return await self.hedger.race(model, attempt, kind, hedge_model, discard, record=record, release=release)
+    
+    async def _complete(self, message: str, system_prompt: Optional[str], context: RequestContext,
+                        model: str, temperature: float, max_tokens: int, cache_key: Optional[str],
+                        history: Optional[List[Dict[str, str]]] = None, json_mode: bool = False,
+                        profile: Optional[Tuple[str, str]] = None) -> str:
+        """Chamada upstream ao Groq (sem cache nem agrupamento); quem chama segura a vaga no escalonador"""
+        extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+        messages = self._build_messages(message, system_prompt, history)
+        for candidate in self._candidates(model):
+            started = time.monotonic()
+            try:
+                response, used = await self._hedged(
+                    candidate,
+                    lambda m: self._request(m, messages, temperature, max_tokens, context, **extra),
+                    "complete"
+                )
+                self._record(used, started, True)
+                usage = response.usage
+                self._account(context, used, started, True,
+                              usage.prompt_tokens if usage else 0, usage.completion_tokens if usage else 0)
+                
+                content = response.choices[0].message.content
+                truncated = response.choices[0].finish_reason == "length"
+                self._profile_record(profile, max_tokens,
+                                     usage.completion_tokens if usage else estimate_tokens(content or ""),
+                                     started, truncated)
+                # Planos JSON e classificadores não levam aviso; só respostas de chat
+                if truncated and content and profile and profile[0].startswith("chat"):
+                    content += TRUNCATED_NOTICE
+                if cache_key and content:
+                    await self.cache.set(cache_key, content)
+                return content
             
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            logger.error(f"❌ Erro no chat completion: {e}")
-            return "Desculpe, ocorreu um erro ao processar sua mensagem. Tente novamente."
+            except Exception as e:
+                self._record(candidate, started, False)
+                self._account(context, candidate, started, False)
+                logger.error(f"❌ Erro no chat completion ({candidate}): {e}")
+            except BaseException:
+                self._release(candidate)
+                raise
+        
+        return ERROR_MESSAGE
     
-    async def parse_admin_command(self, message: str) -> List[Dict[str, Any]]:
+    async def stream_completion(self, message: str, system_prompt: Optional[str] = None,
+                                context: Optional[RequestContext] = None,
+                                remember: bool = False, purpose: str = "chat",
+                                temperature: Optional[float] = None, max_tokens: Optional[int] = None,
+                                profile: Optional[str] = None) -> AsyncIterator[str]:
         """
-        Analisa comandos administrativos usando IA
+        Gera uma resposta de chat em streaming, produzindo os tokens conforme chegam
         """
-        system_prompt = """
-Você é um assistente inteligente para servidor Discord com 95+ funcionalidades administrativas.
-Retorne SEMPRE um JSON válido com a lista de ações a executar.
-
-BÁSICO (10):
-- "resposta": Resposta simples de chat
-- "criar_embed": Criar embed personalizado
-- "criar_canal": Criar canal texto/voz
-- "criar_cargo": Criar cargo/role
-- "limpar_mensagens": Limpar mensagens
-- "enviar_dm": Enviar mensagem privada
-- "anuncio_global": Anúncio em todos os canais
-- "criar_poll": Criar enquete/votação
-- "auto_react": Auto reagir mensagens
-- "canal_temp": Criar canal temporário
-
-INFORMAÇÕES (15):
-- "listar_cargos": Todos os cargos
-- "listar_canais": Todos os canais
-- "listar_membros": Stats membros
-- "info_servidor": Info completa servidor
-- "listar_bots": Todos os bots
-- "audit_log": Log auditoria
-- "listar_convites": Convites ativos
-- "top_usuarios": Ranking usuários
-- "stats_detalhadas": Estatísticas avançadas
-- "historico_mensagens": Histórico canal
-- "member_info": Info detalhada membro
-- "canal_stats": Estatísticas canal
-- "emoji_stats": Stats emojis servidor
-- "boost_info": Info boost servidor
-- "permissions_check": Verificar permissões
-
-GERENCIAMENTO (20):
-- "slowmode": Modo lento canal
-- "bloquear_canal": Bloquear canal
-- "desbloquear_canal": Desbloquear canal
-- "criar_categoria": Nova categoria
-- "mover_canal": Mover canal
-- "duplicar_canal": Duplicar canal
-- "webhook_create": Criar webhook
-- "backup_cargos": Backup cargos
-- "restore_cargos": Restaurar cargos
-- "bulk_create_channels": Criar múltiplos canais
-- "channel_template": Template de canal
-- "auto_archive": Auto arquivar threads
-- "mass_role_assign": Atribuir cargo em massa
-- "server_template": Template servidor
-- "channel_sync": Sincronizar permissões
-- "role_hierarchy": Reorganizar hierarquia
-- "bulk_permissions": Permissões em massa
-- "server_backup": Backup completo
-- "clone_server": Clonar estrutura
-- "mass_move": Mover canais em massa
-
-MODERAÇÃO (20):
-- "timeout_usuario": Timeout usuário
-- "remover_timeout": Remover timeout
-- "add_reacao": Adicionar reação
-- "pin_mensagem": Fixar mensagem
-- "unpin_mensagem": Desfixar mensagens
-- "nick_usuario": Alterar apelido
-- "reset_nicks": Reset apelidos
-- "mass_ban": Ban em massa
-- "mass_kick": Kick em massa
-- "auto_mod": Auto moderação
-- "word_filter": Filtro palavras
-- "spam_protection": Proteção spam
-- "raid_protection": Proteção raid
-- "auto_warn": Sistema warnings
-- "mute_sistema": Sistema mute
-- "captcha_verify": Verificação captcha
-- "anti_bot": Proteção anti bot
-- "link_filter": Filtro links
-- "image_filter": Filtro imagens
-- "toxic_filter": Filtro toxicidade
-
-AUTOMAÇÃO (15):
-- "auto_role": Auto cargo entrada
-- "welcome_msg": Mensagem boas vindas
-- "goodbye_msg": Mensagem saída
-- "level_system": Sistema level
-- "xp_rewards": Recompensas XP
-- "daily_backup": Backup diário
-- "scheduled_msg": Mensagens agendadas
-- "auto_clean": Limpeza automática
-- "activity_monitor": Monitor atividade
-- "inactive_cleanup": Limpar inativos
-- "auto_promote": Promoção automática
-- "event_scheduler": Agendar eventos
-- "reminder_system": Sistema lembretes
-- "auto_archive_old": Arquivar antigos
-- "smart_notifications": Notificações IA
-
-ENTRETENIMENTO (15):
-- "mini_games": Mini jogos
-- "quiz_system": Sistema quiz
-- "music_queue": Fila música
-- "meme_generator": Gerador memes
-- "random_facts": Fatos aleatórios
-- "daily_quote": Frase do dia
-- "fortune_teller": Adivinhação
-- "rock_paper": Pedra papel tesoura
-- "coin_flip": Cara ou coroa
-- "dice_roll": Rolar dados
-- "8ball": Bola mágica
-- "trivia_game": Jogo trivia
-- "word_game": Jogo palavras
-- "emoji_game": Jogo emoji
-- "riddle_game": Jogo charadas
-
-Formato de resposta:
-[{"action": "tipo_acao", "resposta": "texto", "titulo": "titulo", "descricao": "desc", "cor": "5865F2", "nome": "nome", "valor": 30, "categoria": "Geral", "emoji": "👍"}]
-
-IMPORTANTE: Sempre retorne JSON válido, mesmo para erros.
-"""
+        context = context or RequestContext()
+        tag, temperature, max_tokens = self._generation(message, purpose, profile, temperature, max_tokens)
+        memory_key = self._memory_key(context, remember)
+        history = self.memory.history(memory_key) if memory_key else []
+        model = self._select_model(message, purpose, history)
+        parts = []
         
-        try:
-            response = await self.chat_completion(message, system_prompt)
+        if history:
+            # Respostas que dependem do histórico não são compartilhadas nem cacheadas
+            source = self._stream_upstream(message, system_prompt, context, model, temperature,
+                                           max_tokens, None, history, tag)
+        else:
+            cache_key = self._cache_key(message, system_prompt, context, model, temperature, max_tokens)
+            cached = await self.cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                self._account_cache_hit(context, model)
+                self._remember(memory_key, message, cached)
+                yield cached
+                return
             
-            # Tentar extrair JSON da resposta
+            flight_key = self._flight_key(message, system_prompt, context, model, temperature, max_tokens) + ":stream"
+            source = self.singleflight.stream(
+                flight_key,
+                lambda: self._stream_upstream(message, system_prompt, context, model, temperature,
+                                              max_tokens, cache_key, profile=tag)
+            )
+        
+        # A vaga no escalonador é de cada usuário, mesmo quando o stream é compartilhado
+        async with self._slot(context):
+            async for part in source:
+                parts.append(part)
+                yield part
+        
+        self._remember(memory_key, message, "".join(parts))
+    
+    async def _open_stream(self, model: str, messages: List[Dict[str, str]], temperature: float,
+                           max_tokens: int, context: RequestContext):
+        """Abre o stream e lê até o primeiro token; retorna (stream, iterador, chunks já lidos)"""
+        stream = await self._request(model, messages, temperature, max_tokens, context, stream=True)
+        chunks = stream.__aiter__()
+        head = []
+        try:
+            async for chunk in chunks:
+                head.append(chunk)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    break
+        except BaseException:
+            await stream.close()
+            raise
+        return stream, chunks, head
+    
+    @staticmethod
+    async def _chain(head: list, rest):
+        """Os chunks já lidos seguidos do restante do stream"""
+        for chunk in head:
+            yield chunk
+        async for chunk in rest:
+            yield chunk
+    
+    async def _stream_upstream(self, message: str, system_prompt: Optional[str], context: RequestContext,
+                               model: str, temperature: float, max_tokens: int, cache_key: Optional[str],
+                               history: Optional[List[Dict[str, str]]] = None,
+                               profile: Optional[Tuple[str, str]] = None) -> AsyncIterator[str]:
+        """Stream upstream do Groq (sem cache nem agrupamento); quem chama segura a vaga no escalonador"""
+        produced = False
+        messages = self._build_messages(message, system_prompt, history)
+        for candidate in self._candidates(model):
+            started = time.monotonic()
+            used = candidate
             try:
-                # Procurar por JSON na resposta
-                start = response.find('[')
-                end = response.rfind(']') + 1
+                # Só a abertura do stream é repetida (ou disputada pelo hedging);
+                # depois do primeiro token não há volta
+                (stream, chunks, head), used = await self._hedged(
+                    candidate,
+                    lambda m: self._open_stream(m, messages, temperature, max_tokens, context),
+                    "stream",
+                    discard=lambda opened: opened[0].close()
+                )
                 
-                if start != -1 and end != -1:
-                    json_str = response[start:end]
-                    actions = json.loads(json_str)
-                    return actions if isinstance(actions, list) else [actions]
+                parts = []
+                usage = None
+                finish_reason = None
+                async for chunk in self._chain(head, chunks):
+                    # O Groq envia o uso de tokens no último chunk (x_groq.usage)
+                    usage = getattr(getattr(chunk, "x_groq", None), "usage", None) or usage
+                    if not chunk.choices:
+                        continue
+                    finish_reason = chunk.choices[0].finish_reason or finish_reason
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        produced = True
+                        parts.append(delta)
+                        yield delta
+                self._record(used, started, True)
+                if usage:
+                    self._account(context, used, started, True,
+                                  usage.prompt_tokens, usage.completion_tokens)
                 else:
-                    # Se não encontrou JSON, retornar resposta simples
-                    return [{"action": "resposta", "resposta": response}]
-                    
-            except json.JSONDecodeError:
-                logger.warning("⚠️ Resposta da IA não é JSON válido")
-                return [{"action": "resposta", "resposta": response}]
+                    self._account(context, used, started, True,
+                                  sum(estimate_tokens(m["content"]) for m in messages),
+                                  estimate_tokens("".join(parts)))
+                self._profile_record(profile, max_tokens,
+                                     usage.completion_tokens if usage else estimate_tokens("".join(parts)),
+                                     started, finish_reason == "length")
                 
+                # Avisa que a resposta foi cortada pelo max_tokens (o aviso também vai para o cache)
+                if finish_reason == "length" and parts:
+                    parts.append(TRUNCATED_NOTICE)
+                    yield TRUNCATED_NOTICE
+                if cache_key and parts:
+                    await self.cache.set(cache_key, "".join(parts))
+                return
+            
+            except Exception as e:
+                self._record(used, started, False)
+                self._account(context, used, started, False)
+                logger.error(f"❌ Erro no chat completion em streaming ({used}): {e}")
+                # Depois do primeiro token não dá para trocar de modelo sem repetir texto
+                if produced:
+                    break
+            except BaseException:
+                # Cancelada ou abandonada pelo consumidor
+                self._release(candidate)
+                raise
+        
+        yield ("\n\n" if produced else "") + ERROR_MESSAGE
+    
+    async def select_admin_category(self, message: str, context: Optional[RequestContext] = None) -> Optional[str]:
+        """
+        Primeira etapa: escolhe a categoria de ações (None = catálogo completo)
+        """
+        if self.admin_prompt_mode != "scoped":
+            return None
+        
+        category = classify_category(message)
+        if category is None and self.category_classifier == "model":
+            answer = await self.chat_completion(
+                message, CATEGORY_CLASSIFIER_PROMPT, context=context,
+                model=self.classifier_model, temperature=0.0, max_tokens=8, purpose="classificador"
+            )
+            category = parse_category(answer)
+        
+        return category
+    
+    async def _admin_system_prompt(self, message: str, context: Optional[RequestContext],
+                                   json_object: bool = False,
+                                   guild_info: Optional[str] = None) -> Tuple[str, Optional[str]]:
+        """
+        Monta o prompt de sistema do parse_admin_command; retorna (prompt, perfil de geração)
+        
+        A estrutura do servidor vai no fim, depois da parte fixa do prompt
+        """
+        category = await self.select_admin_category(message, context)
+        if category:
+            logger.info(f"🎯 Prompt admin restrito à categoria {category}")
+        profile = self.profiles.for_admin(category) if self.profiles else None
+        prompt = build_admin_prompt(category, json_object=json_object)
+        if guild_info:
+            prompt += "\n" + guild_info
+        return prompt, profile
+    
+    async def parse_admin_command(self, message: str, context: Optional[RequestContext] = None,
+                                  guild_info: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Analisa comandos administrativos usando IA
+        
+        guild_info: canais, categorias e cargos existentes (GuildSnapshotCache)
+        """
+        try:
+            system_prompt, profile = await self._admin_system_prompt(message, context,
+                                                                     json_object=self.admin_json_mode,
+                                                                     guild_info=guild_info)
+            response = await self.chat_completion(message, system_prompt, context=context, purpose="admin",
+                                                  json_mode=self.admin_json_mode, profile=profile)
+            actions = parse_actions(response)
+            if self.validate_plans:
+                actions = await self._validated_plan(actions, message, system_prompt, context, profile)
+            return actions
+        
+        except SchedulerRejectedError:
+            raise
         except Exception as e:
             logger.error(f"❌ Erro ao analisar comando admin: {e}")
-            return [{"action": "resposta", "resposta": "Erro ao processar comando administrativo."}]
\ No newline at end of file
+            return [{"action": "resposta", "resposta": "Erro ao processar comando administrativo."}]
+    
+    async def stream_admin_actions(self, message: str, context: Optional[RequestContext] = None,
+                                   guild_info: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Produz cada ação do plano assim que o objeto JSON dela fecha no stream
+        
+        No modo JSON a API não faz streaming; o plano inteiro chega de uma vez
+        """
+        if self.admin_json_mode or not self.admin_streaming:
+            for action in await self.parse_admin_command(message, context, guild_info):
+                yield action
+            return
+        
+        parser = ActionStreamParser()
+        # Com validação, as ações são conferidas conforme chegam e só saem com o plano inteiro
+        plan = []
+        try:
+            system_prompt, profile = await self._admin_system_prompt(message, context, guild_info=guild_info)
+            async for token in self.stream_completion(message, system_prompt, context=context,
+                                                      purpose="admin", profile=profile):
+                for action in parser.feed(token):
+                    if self.validate_plans:
+                        plan.append(action)
+                    else:
+                        yield action
+        
+        except SchedulerRejectedError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erro ao analisar comando admin em streaming: {e}")
+            if not parser.emitted:
+                yield {"action": "resposta", "resposta": "Erro ao processar comando administrativo."}
+                return
+            if not self.validate_plans:
+                return
+        else:
+            if not self.validate_plans:
+                for action in parser.close():
+                    yield action
+                return
+            plan.extend(parser.close())
+        
+        for action in await self._validated_plan(plan, message, system_prompt, context, profile):
+            yield action
+    
+    async def _validated_plan(self, actions: List[Dict[str, Any]], message: str, system_prompt: str,
+                              context: Optional[RequestContext], profile: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Confere e converte o plano; se houver erros, pede uma única correção ao modelo
+        
+        Um plano que continua inválido não é executado (nenhuma ação parcial)
+        """
+        plan, errors = validate_plan(actions)
+        if not errors:
+            return plan
+        
+        self.plan_repairs += 1
+        logger.warning(f"🔧 Plano admin inválido; pedindo correção: {'; '.join(errors)}")
+        try:
+            response = await self.chat_completion(
+                build_repair_message(message, actions, errors), system_prompt, context=context,
+                purpose="admin", json_mode=self.admin_json_mode, profile=profile
+            )
+            plan, errors = validate_plan(parse_actions(response))
+        except SchedulerRejectedError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erro ao pedir correção do plano admin: {e}")
+        
+        if not errors:
+            return plan
+        self.plan_rejections += 1
+        logger.error(f"❌ Plano admin continua inválido após a correção: {'; '.join(errors)}")
+        return [{
+            "action": "resposta",
+            "resposta": "❌ Não consegui montar um plano válido para esse pedido:\n"
+                        + "\n".join(f"• {error}" for error in errors[:5])
+        }]
\ No newline at end of file
@@ -0,0 +1,236 @@
+"""
+Índice por servidor de canais, categorias, cargos e membros por nome (exato, normalizado e aproximado)
+"""
+import difflib
+import logging
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "canal"
+CATEGORY = "categoria"
+ROLE = "cargo"
+MEMBER = "membro"
+
+def fold_name(name: str) -> str:
+    """
+    Chave tolerante: sem acentos, sem caixa, sem # ou @ no início e com espaços,
+    hífens e sublinhados unificados (o Discord grava "Geral Chat" como "geral-chat")
+    """
+    decomposed = unicodedata.normalize("NFKD", str(name).casefold())
+    stripped = "".join(c for c in decomposed if unicodedata.category(c) != "Mn").strip().lstrip("#@")
+    return "-".join(stripped.replace("_", " ").replace("-", " ").split())
+
+class _NameTable:
+    """Nomes de um tipo de objeto: chave exata e chave normalizada -> IDs, na ordem de inserção"""
+
+    __slots__ = ("names", "exact", "folded")
+
+    def __init__(self):
+        self.names: Dict[int, Tuple[str, ...]] = {}
+        self.exact: Dict[str, Dict[int, None]] = {}
+        self.folded: Dict[str, Dict[int, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, object_id: int, names: Iterable[str]):
+        self.remove(object_id)
+        names = tuple(dict.fromkeys(name for name in names if name))
+        self.names[object_id] = names
+        for name in names:
+            self.exact.setdefault(name, {})[object_id] = None
+            self.folded.setdefault(fold_name(name), {})[object_id] = None
+
+    def remove(self, object_id: int):
+        for name in self.names.pop(object_id, ()):
+            for table, key in ((self.exact, name), (self.folded, fold_name(name))):
+                ids = table.get(key)
+                if ids is not None:
+                    ids.pop(object_id, None)
+                    if not ids:
+                        del table[key]
+
+    def candidates(self, name: str) -> List[Tuple[str, List[int]]]:
+        """IDs por nível de correspondência: exato, depois normalizado"""
+        return [
+            ("exato", list(self.exact.get(name, ()))),
+            ("normalizado", list(self.folded.get(fold_name(name), ()))),
+        ]
+
+    def fuzzy(self, name: str, cutoff: float) -> List[int]:
+        """IDs do nome normalizado mais parecido (varredura só quando o resto falha)"""
+        matches = difflib.get_close_matches(fold_name(name), list(self.folded), n=1, cutoff=cutoff)
+        return list(self.folded[matches[0]]) if matches else []
+
+class _GuildEntry:
+    """Tabelas de um servidor"""
+
+    __slots__ = ("tables",)
+
+    def __init__(self, guild: discord.Guild):
+        self.tables = {kind: _NameTable() for kind in (CHANNEL, CATEGORY, ROLE, MEMBER)}
+        for channel in guild.channels:
+            self.tables[CHANNEL].add(channel.id, (channel.name,))
+            if isinstance(channel, discord.CategoryChannel):
+                self.tables[CATEGORY].add(channel.id, (channel.name,))
+        for role in guild.roles:
+            if not role.is_default():
+                self.tables[ROLE].add(role.id, (role.name,))
+        for member in guild.members:
+            self.tables[MEMBER].add(member.id, _member_names(member))
+
+def _member_names(member: discord.Member) -> Tuple[str, ...]:
+    return (member.name, getattr(member, "global_name", None), member.display_name)
+
+class GuildNameIndex:
+    """
+    Resolve nomes vindos do plano admin para objetos do servidor sem varrer listas
+
+    As tabelas são montadas no primeiro uso e mantidas pelos eventos do gateway. Cada
+    acerto é conferido pelo ID no cache do discord.py; um acerto vencido (evento perdido)
+    ou uma falha com contagem divergente reconstrói o servidor uma vez.
+    """
+
+    def __init__(self, fuzzy_cutoff: float = 0.8, max_guilds: int = 1000):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.max_guilds = max_guilds
+        self._guilds: "OrderedDict[int, _GuildEntry]" = OrderedDict()
+        self.lookups = 0
+        self.fuzzy_hits = 0
+        self.rebuilds = 0
+        logger.info("✅ Índice de nomes dos servidores inicializado")
+
+    # ========== CONSULTAS ==========
+    # fuzzy=False em ações que alteram o servidor: um nome digitado errado não pode apontar para
+    # outro objeto; só consultas de leitura aceitam aproximação
+
+    def channel(self, guild: discord.Guild, name: str, kind: Optional[Type[discord.abc.GuildChannel]] = None,
+                fuzzy: bool = True) -> Optional[discord.abc.GuildChannel]:
+        """Canal pelo nome (opcionalmente só de um tipo, ex.: discord.TextChannel)"""
+        return self._find(guild, CHANNEL, name, guild.get_channel, kind, lambda: len(guild.channels), fuzzy)
+
+    def category(self, guild: discord.Guild, name: str, fuzzy: bool = True) -> Optional[discord.CategoryChannel]:
+        """Categoria pelo nome"""
+        return self._find(guild, CATEGORY, name, guild.get_channel, discord.CategoryChannel,
+                          lambda: len(guild.categories), fuzzy)
+
+    def role(self, guild: discord.Guild, name: str, fuzzy: bool = True) -> Optional[discord.Role]:
+        """Cargo pelo nome (@everyone não entra)"""
+        return self._find(guild, ROLE, name, guild.get_role, None, lambda: len(guild.roles) - 1, fuzzy)
+
+    def member(self, guild: discord.Guild, name: str, fuzzy: bool = True) -> Optional[discord.Member]:
+        """Membro pelo nome de usuário, nome global ou apelido"""
+        return self._find(guild, MEMBER, name, guild.get_member, None, lambda: len(guild.members), fuzzy)
+
+    def _entry(self, guild: discord.Guild, rebuild: bool = False) -> _GuildEntry:
+        entry = self._guilds.get(guild.id)
+        if entry is None or rebuild:
+            if entry is not None:
+                self.rebuilds += 1
+            entry = _GuildEntry(guild)
+            self._guilds[guild.id] = entry
+            while len(self._guilds) > self.max_guilds:
+                self._guilds.popitem(last=False)
+        self._guilds.move_to_end(guild.id)
+        return entry
+
+    def _find(self, guild: discord.Guild, kind: str, name: str, resolve: Callable[[int], object],
+              object_type: Optional[type], current_count: Callable[[], int], fuzzy: bool):
+        if guild is None or not name:
+            return None
+        self.lookups += 1
+        entry = self._entry(guild)
+
+        for attempt in range(2):
+            table = entry.tables[kind]
+            stale = False
+            for level, ids in table.candidates(name):
+                for object_id in ids:
+                    found = resolve(object_id)
+                    if found is None or not self._matches(found, kind, name, level):
+                        stale = True
+                        continue
+                    if object_type is None or isinstance(found, object_type):
+                        return found
+
+            # Acerto vencido ou objeto que ainda não chegou ao índice: reconstrói uma vez
+            if attempt == 0 and (stale or len(table) != current_count()):
+                entry = self._entry(guild, rebuild=True)
+                continue
+            break
+
+        if not fuzzy:
+            return None
+        for object_id in table.fuzzy(name, self.fuzzy_cutoff):
+            found = resolve(object_id)
+            if found is not None and (object_type is None or isinstance(found, object_type)):
+                self.fuzzy_hits += 1
+                logger.info(f"🔎 '{name}' resolvido por aproximação para '{getattr(found, 'name', found)}'")
+                return found
+        return None
+
+    @staticmethod
+    def _matches(found, kind: str, name: str, level: str) -> bool:
+        """O objeto atual ainda tem o nome indexado?"""
+        names = _member_names(found) if kind == MEMBER else (found.name,)
+        if level == "exato":
+            return name in names
+        key = fold_name(name)
+        return any(fold_name(current) == key for current in names if current)
+
+    # ========== EVENTOS DO GATEWAY ==========
+
+    def channel_saved(self, channel: discord.abc.GuildChannel):
+        """Canal criado ou alterado"""
+        entry = self._guilds.get(channel.guild.id)
+        if entry is None:
+            return
+        entry.tables[CHANNEL].add(channel.id, (channel.name,))
+        if isinstance(channel, discord.CategoryChannel):
+            entry.tables[CATEGORY].add(channel.id, (channel.name,))
+
+    def channel_deleted(self, channel: discord.abc.GuildChannel):
+        entry = self._guilds.get(channel.guild.id)
+        if entry is not None:
+            entry.tables[CHANNEL].remove(channel.id)
+            entry.tables[CATEGORY].remove(channel.id)
+
+    def role_saved(self, role: discord.Role):
+        """Cargo criado ou alterado"""
+        entry = self._guilds.get(role.guild.id)
+        if entry is not None and not role.is_default():
+            entry.tables[ROLE].add(role.id, (role.name,))
+
+    def role_deleted(self, role: discord.Role):
+        entry = self._guilds.get(role.guild.id)
+        if entry is not None:
+            entry.tables[ROLE].remove(role.id)
+
+    def member_saved(self, member: discord.Member):
+        """Membro entrou ou mudou de nome/apelido"""
+        entry = self._guilds.get(member.guild.id)
+        if entry is not None:
+            entry.tables[MEMBER].add(member.id, _member_names(member))
+
+    def member_removed(self, member: discord.Member):
+        entry = self._guilds.get(member.guild.id)
+        if entry is not None:
+            entry.tables[MEMBER].remove(member.id)
+
+    def forget(self, guild_id: int):
+        """Descarta o servidor (bot saiu)"""
+        self._guilds.pop(guild_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Servidores indexados, consultas, acertos aproximados e reconstruções"""
+        return {
+            "guilds": len(self._guilds),
+            "lookups": self.lookups,
+            "fuzzy_hits": self.fuzzy_hits,
+            "rebuilds": self.rebuilds
+        }
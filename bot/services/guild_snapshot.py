@@ -0,0 +1,130 @@
+"""
+Resumo compacto da estrutura de cada servidor (categorias, canais e cargos) para o prompt admin
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_HEADER = "Estrutura atual do servidor (use exatamente estes nomes; IDs entre parênteses):"
+
+def _tokens(text: str) -> int:
+    """Estimativa de tokens de um item da lista (~4 caracteres por token, mais o separador)"""
+    return len(text) // 4 + 1
+
+class GuildSnapshotCache:
+    """
+    Guarda por servidor o texto com nomes e IDs de categorias, canais e cargos
+
+    O texto é refeito só quando um evento do gateway muda a estrutura (ou após o TTL,
+    caso algum evento se perca) e é cortado no orçamento de tokens em servidores grandes.
+    """
+
+    def __init__(self, token_budget: int = 600, ttl: float = 600.0, max_guilds: int = 1000):
+        self.token_budget = token_budget
+        self.ttl = ttl
+        self.max_guilds = max_guilds
+        # guild_id -> (texto, criado em)
+        self._snapshots: "OrderedDict[int, Tuple[str, float]]" = OrderedDict()
+        self.hits = 0
+        self.builds = 0
+        self.invalidations = 0
+        logger.info(f"✅ Resumo de estrutura dos servidores ativo (orçamento de {token_budget} tokens)")
+
+    def get(self, guild: Optional[discord.Guild]) -> Optional[str]:
+        """Texto da estrutura do servidor, do cache quando ainda válido"""
+        if guild is None:
+            return None
+
+        cached = self._snapshots.get(guild.id)
+        if cached is not None and time.monotonic() - cached[1] < self.ttl:
+            self._snapshots.move_to_end(guild.id)
+            self.hits += 1
+            return cached[0]
+
+        snapshot = self.build(guild)
+        self.builds += 1
+        self._snapshots[guild.id] = (snapshot, time.monotonic())
+        self._snapshots.move_to_end(guild.id)
+        while len(self._snapshots) > self.max_guilds:
+            self._snapshots.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, guild_id: int):
+        """Descarta o resumo do servidor (estrutura mudou)"""
+        if self._snapshots.pop(guild_id, None) is not None:
+            self.invalidations += 1
+
+    def build(self, guild: discord.Guild) -> str:
+        """
+        Monta o texto dentro do orçamento
+
+        As seções avançam um item por vez, em rodízio, para que nenhuma (ex.: centenas de
+        cargos) tome o orçamento inteiro; o que não couber vira "+N"
+        """
+        sections = self._sections(guild)
+        budget = self.token_budget - _tokens(SNAPSHOT_HEADER)
+        taken = {title: 0 for title, _ in sections}
+
+        progress = True
+        while progress:
+            progress = False
+            for title, items in sections:
+                index = taken[title]
+                if index >= len(items) or _tokens(items[index]) > budget:
+                    continue
+                budget -= _tokens(items[index])
+                taken[title] += 1
+                progress = True
+
+        lines = [SNAPSHOT_HEADER]
+        for title, items in sections:
+            if not items:
+                continue
+            listed = items[:taken[title]]
+            omitted = len(items) - len(listed)
+            line = f"{title}: {', '.join(listed)}"
+            if omitted:
+                line += f"{', ' if listed else ''}+{omitted} não listados"
+            lines.append(line)
+        return "\n".join(lines)
+
+    @staticmethod
+    def _sections(guild: discord.Guild) -> List[Tuple[str, List[str]]]:
+        """Itens de cada seção, na ordem em que aparecem no Discord"""
+        text, voice, categories = [], [], []
+        for category, channels in guild.by_category():
+            if category is not None:
+                categories.append(f"{category.name} ({category.id})")
+            suffix = f" [{category.name}]" if category is not None else ""
+            for channel in channels:
+                if isinstance(channel, (discord.VoiceChannel, discord.StageChannel)):
+                    voice.append(f"{channel.name} ({channel.id}){suffix}")
+                else:
+                    text.append(f"#{channel.name} ({channel.id}){suffix}")
+
+        # Do mais alto para o mais baixo; @everyone e cargos de integrações não são atribuíveis
+        roles = [
+            f"@{role.name} ({role.id})"
+            for role in reversed(guild.roles)
+            if not role.is_default() and not role.managed
+        ]
+        return [
+            ("Canais de texto", text),
+            ("Categorias", categories),
+            ("Cargos", roles),
+            ("Canais de voz", voice),
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        """Resumos em cache, acertos, reconstruções e invalidações"""
+        return {
+            "guilds": len(self._snapshots),
+            "hits": self.hits,
+            "builds": self.builds,
+            "invalidations": self.invalidations
+        }
@@ -0,0 +1,154 @@
+"""
+Requisições de reserva (hedging) contra a cauda de latência do Groq
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class Hedger:
+    """
+    Dispara uma segunda requisição quando a primeira demora mais que o percentil recente
+
+    A que responder primeiro vence e a outra é cancelada. Um orçamento limita as
+    requisições extras a uma fração das requisições normais.
+    """
+
+    def __init__(self, percentile: float = 95.0, budget: float = 0.1, burst: float = 5.0,
+                 min_delay: float = 0.3, default_delay: float = 2.0, min_samples: int = 20,
+                 window: int = 200, fallback: bool = False):
+        self.percentile = percentile
+        self.budget = budget
+        self.burst = burst
+        self.min_delay = min_delay
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+        self.window = window
+        # Reserva no outro modelo em vez de repetir o mesmo
+        self.fallback = fallback
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self._credits = burst
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        logger.info(f"✅ Hedging ativo (p{percentile:g}, orçamento de {budget:.0%})")
+
+    def delay(self, model: str, kind: str) -> float:
+        """Espera pelo primeiro token antes de disparar a reserva"""
+        samples = self._samples.get((model, kind))
+        if not samples or len(samples) < self.min_samples:
+            return self.default_delay
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(self.percentile / 100 * (len(ordered) - 1))))
+        return max(self.min_delay, ordered[index])
+
+    def _observe(self, model: str, kind: str, latency: float):
+        """Registra o tempo até o primeiro token"""
+        key = (model, kind)
+        if key not in self._samples:
+            self._samples[key] = deque(maxlen=self.window)
+        self._samples[key].append(latency)
+
+    def _take_credit(self) -> bool:
+        """Consome o orçamento de uma reserva, se houver"""
+        if self._credits >= 1.0:
+            self._credits -= 1.0
+            return True
+        return False
+
+    async def race(self, model: str, attempt: Callable[[str], Awaitable[Any]], kind: str = "complete",
+                   hedge_model: Optional[str] = None,
+                   discard: Optional[Callable[[Any], Awaitable[None]]] = None,
+                   record: Optional[Callable[[str, float, bool], None]] = None,
+                   release: Optional[Callable[[str], None]] = None) -> Tuple[Any, str]:
+        """
+        Executa attempt(modelo) com uma possível reserva; retorna (resultado, modelo vencedor)
+
+        discard libera o resultado de uma tentativa que terminou mas perdeu (ex.: fechar um stream).
+        Quem chama registra o resultado da tentativa retornada (ou, se todas falharem, o do
+        modelo pedido); as demais são informadas aqui: record(modelo, latência, ok) para as
+        que terminaram e release(modelo) para as canceladas
+        """
+        self.requests += 1
+        self._credits = min(self.burst, self._credits + self.budget)
+        started = time.monotonic()
+        primary = asyncio.ensure_future(attempt(model))
+        models = {primary: model}
+        launched = {primary: started}
+        ended: Dict["asyncio.Future", float] = {}
+        failures: List["asyncio.Future"] = []
+
+        def report(task: "asyncio.Future", ok: bool):
+            if record:
+                record(models[task], ended[task] - launched[task], ok)
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.delay(model, kind))
+            if not done and self._take_credit():
+                hedge_model = hedge_model or model
+                self.hedged += 1
+                logger.info(f"🪁 Sem resposta de {model} em {time.monotonic() - started:.2f}s; "
+                            f"disparando reserva em {hedge_model}")
+                hedge = asyncio.ensure_future(attempt(hedge_model))
+                models[hedge] = hedge_model
+                launched[hedge] = time.monotonic()
+
+            pending = set(models)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                finished = time.monotonic()
+                ended.update(dict.fromkeys(done, finished))
+                winners = [task for task in done if task.exception() is None]
+                failures.extend(task for task in done if task.exception() is not None)
+                # Toda tentativa que respondeu entra na amostra, não só a vencedora
+                for task in winners:
+                    self._observe(models[task], kind, finished - launched[task])
+                if not winners:
+                    continue
+
+                winner = winners[0]
+                if winner is not primary:
+                    self.hedge_wins += 1
+                for task in failures:
+                    report(task, False)
+                for loser in winners[1:]:
+                    report(loser, True)
+                    if discard:
+                        await discard(loser.result())
+                return winner.result(), models[winner]
+
+            # Todas falharam: quem chama registra a falha do modelo pedido; a da reserva é informada aqui
+            for task in failures:
+                if task is not primary:
+                    report(task, False)
+            raise failures[-1].exception()
+        finally:
+            for task in models:
+                if not task.done():
+                    task.cancel()
+                    if release:
+                        release(models[task])
+
+    def stats(self) -> Dict[str, float]:
+        """Taxa de hedging (reservas / requisições) e taxa de vitória das reservas"""
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+            "win_rate": self.hedge_wins / self.hedged if self.hedged else 0.0
+        }
+
+    def export_metrics(self) -> str:
+        """Contadores de hedging no formato texto do Prometheus"""
+        return (
+            "# TYPE skzgpt_llm_hedge_requests_total counter\n"
+            f"skzgpt_llm_hedge_requests_total {self.requests}\n"
+            "# TYPE skzgpt_llm_hedged_total counter\n"
+            f"skzgpt_llm_hedged_total {self.hedged}\n"
+            "# TYPE skzgpt_llm_hedge_wins_total counter\n"
+            f"skzgpt_llm_hedge_wins_total {self.hedge_wins}\n"
+        )
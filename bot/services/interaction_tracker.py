@@ -0,0 +1,92 @@
+"""
+Cancelamento do trabalho de interações expiradas ou substituídas
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Dict, Optional, Tuple
+
+from bot.services.request_context import RequestContext
+
+logger = logging.getLogger(__name__)
+
+SUPERSEDED = "superseded"
+EXPIRED = "expired"
+
+class InteractionTracker:
+    """
+    Executa o trabalho de cada interação como uma tarefa cancelável
+
+    A tarefa é cancelada quando o prazo da interação acaba (a resposta não pode mais
+    ser entregue) ou quando o mesmo usuário repete o comando no mesmo canal; um
+    /chat não substitui um /skgpt em andamento, e vice-versa.
+    O cancelamento chega às chamadas ao Groq na fila ou em andamento.
+    """
+
+    def __init__(self, supersede: bool = True, margin: float = 5.0):
+        self.supersede = supersede
+        # Folga para ainda conseguir enviar a resposta antes do fim do prazo
+        self.margin = margin
+        # (canal, usuário, comando) -> tarefa em andamento
+        self._active: Dict[Tuple[Optional[int], Optional[int], Optional[str]], "asyncio.Task"] = {}
+        self._reasons: Dict["asyncio.Task", str] = {}
+        self.completed = 0
+        self.superseded = 0
+        self.expired = 0
+
+    def _cancel(self, task: "asyncio.Task", reason: str):
+        """Cancela a tarefa registrando o motivo"""
+        if not task.done():
+            self._reasons[task] = reason
+            task.cancel()
+
+    async def run(self, context: RequestContext, work: Awaitable[None]) -> Optional[str]:
+        """
+        Executa o trabalho da interação
+
+        Retorna None quando ele termina, ou SUPERSEDED/EXPIRED quando foi cancelado
+        """
+        key = (context.channel_id, context.user_id, context.command)
+        previous = self._active.get(key)
+        if self.supersede and previous is not None:
+            self._cancel(previous, SUPERSEDED)
+
+        task = asyncio.ensure_future(work)
+        self._active[key] = task
+        timer = None
+        if context.deadline is not None:
+            delay = max(context.deadline - self.margin - time.monotonic(), 0.0)
+            timer = asyncio.get_running_loop().call_later(delay, self._cancel, task, EXPIRED)
+
+        try:
+            await task
+        except asyncio.CancelledError:
+            reason = self._reasons.get(task)
+            if reason is None:
+                # Cancelamento de fora (ex.: bot encerrando)
+                raise
+            if reason == SUPERSEDED:
+                self.superseded += 1
+                logger.info(f"⏭️ Pedido de {context.command} substituído por um mais recente ({key})")
+            else:
+                self.expired += 1
+                logger.warning(f"⌛ Pedido de {context.command} cancelado: interação expirou ({key})")
+            return reason
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._reasons.pop(task, None)
+            if self._active.get(key) is task:
+                del self._active[key]
+
+        self.completed += 1
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        """Interações ativas, concluídas, substituídas e expiradas"""
+        return {
+            "active": len(self._active),
+            "completed": self.completed,
+            "superseded": self.superseded,
+            "expired": self.expired
+        }
@@ -0,0 +1,251 @@
+"""
+Pool de chaves da API Groq com seleção pela cota restante e quarentena
+"""
+import logging
+import re
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from groq import APIStatusError
+
+logger = logging.getLogger(__name__)
+
+# Formato do Groq: "2m59.56s", "7.66s", "450ms"
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+# Primeira quarentena por chave recusada (401/403); dobra a cada recusa seguida
+AUTH_BACKOFF_START = 30.0
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Converte uma duração do cabeçalho em segundos"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    """Inteiro do cabeçalho, ou None"""
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+class RateLimitBudget:
+    """Cota restante de uma chave para um modelo, segundo os cabeçalhos x-ratelimit-*"""
+
+    def __init__(self):
+        self.remaining_requests: Optional[int] = None
+        self.remaining_tokens: Optional[int] = None
+        self.requests_reset_at = 0.0
+        self.tokens_reset_at = 0.0
+        self.blocked_until = 0.0
+
+    def update(self, headers: Mapping[str, str]):
+        """Atualiza a cota com os cabeçalhos da última resposta"""
+        now = time.monotonic()
+        remaining_requests = _parse_int(headers.get("x-ratelimit-remaining-requests"))
+        remaining_tokens = _parse_int(headers.get("x-ratelimit-remaining-tokens"))
+        requests_reset = parse_duration(headers.get("x-ratelimit-reset-requests"))
+        tokens_reset = parse_duration(headers.get("x-ratelimit-reset-tokens"))
+
+        if remaining_requests is not None:
+            self.remaining_requests = remaining_requests
+        if remaining_tokens is not None:
+            self.remaining_tokens = remaining_tokens
+        if requests_reset is not None:
+            self.requests_reset_at = now + requests_reset
+        if tokens_reset is not None:
+            self.tokens_reset_at = now + tokens_reset
+
+    def block(self, seconds: float):
+        """Segura as chamadas deste modelo nesta chave (após um 429)"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def wait_time(self, tokens: int) -> float:
+        """Quanto esperar antes de uma chamada que consome ~tokens"""
+        now = time.monotonic()
+        wait = self.blocked_until - now
+        if self.remaining_requests is not None and self.remaining_requests <= 0:
+            wait = max(wait, self.requests_reset_at - now)
+        if self.remaining_tokens is not None and self.remaining_tokens < tokens:
+            wait = max(wait, self.tokens_reset_at - now)
+        return max(wait, 0.0)
+
+    def reserve(self, tokens: int):
+        """Desconta a chamada da cota antes da resposta, para as chamadas concorrentes"""
+        now = time.monotonic()
+        if self.remaining_requests is not None:
+            self.remaining_requests = self.remaining_requests - 1 if now < self.requests_reset_at else None
+        if self.remaining_tokens is not None:
+            self.remaining_tokens = self.remaining_tokens - tokens if now < self.tokens_reset_at else None
+
+    def headroom(self) -> float:
+        """Requisições ainda livres na janela (infinitas quando desconhecidas)"""
+        if self.remaining_requests is None or time.monotonic() >= self.requests_reset_at:
+            return float("inf")
+        return float(self.remaining_requests)
+
+class ApiKey:
+    """Uma chave do pool: cliente, cota por modelo, quarentena e métricas"""
+
+    def __init__(self, label: str, client: Any):
+        self.label = label
+        self.client = client
+        self.budgets: Dict[str, RateLimitBudget] = {}
+        self.quarantined_until = 0.0
+        self.in_flight = 0
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.quarantines = 0
+        self.auth_failures = 0
+        self.tokens = 0
+
+    def budget(self, model: str) -> RateLimitBudget:
+        """Cota do modelo nesta chave (os limites do Groq são por chave e modelo)"""
+        if model not in self.budgets:
+            self.budgets[model] = RateLimitBudget()
+        return self.budgets[model]
+
+    def is_quarantined(self) -> bool:
+        """A chave está fora de uso no momento"""
+        return time.monotonic() < self.quarantined_until
+
+class KeyPool:
+    """Escolhe a chave menos carregada e isola as que batem em limites rígidos"""
+
+    def __init__(self, clients: List[Tuple[str, Any]], hard_limit_seconds: float = 60.0,
+                 auth_quarantine: float = 3600.0):
+        """
+        clients: pares (chave, cliente AsyncGroq)
+
+        auth_quarantine é o teto da quarentena de chaves recusadas, que cresce a cada recusa seguida
+        """
+        self.keys = [ApiKey(f"…{api_key[-4:]}", client) for api_key, client in clients]
+        self.hard_limit_seconds = hard_limit_seconds
+        self.auth_quarantine = auth_quarantine
+        logger.info(f"✅ Pool de chaves Groq inicializado ({len(self.keys)} chave(s))")
+
+    def __len__(self) -> int:
+        """Quantidade de chaves"""
+        return len(self.keys)
+
+    def choose(self, model: str, tokens: int) -> Tuple[ApiKey, float]:
+        """
+        Chave para a próxima chamada e quanto esperar por ela
+
+        Prefere chaves sem espera, depois a com mais cota livre e menos chamadas em andamento
+        """
+        active = [key for key in self.keys if not key.is_quarantined()]
+        if not active:
+            # Todas em quarentena: a que sai primeiro
+            key = min(self.keys, key=lambda k: k.quarantined_until)
+            return key, key.quarantined_until - time.monotonic()
+
+        def load(key: ApiKey):
+            budget = key.budget(model)
+            return (budget.wait_time(tokens), -budget.headroom(), key.in_flight)
+
+        key = min(active, key=load)
+        return key, key.budget(model).wait_time(tokens)
+
+    def has_alternative(self, key: ApiKey, model: str, tokens: int) -> bool:
+        """Há outra chave utilizável agora, sem espera"""
+        return any(
+            other is not key and not other.is_quarantined() and other.budget(model).wait_time(tokens) == 0
+            for other in self.keys
+        )
+
+    def record_success(self, key: ApiKey, model: str, headers: Mapping[str, str], tokens: int = 0):
+        """
+        Atualiza cota e métricas da chave após uma resposta
+
+        tokens é o uso real informado pela resposta (0 quando ainda desconhecido, como em streams)
+        """
+        key.calls += 1
+        key.auth_failures = 0
+        key.tokens += tokens
+        key.budget(model).update(headers)
+
+    def record_tokens(self, key: ApiKey, tokens: int):
+        """Soma o uso real de tokens informado depois da resposta (fim de um stream)"""
+        key.tokens += tokens
+
+    def record_error(self, key: ApiKey, model: str, error: Exception,
+                     retry_after: Optional[float] = None) -> bool:
+        """
+        Atualiza cota e métricas após um erro; retorna True se a chave entrou em quarentena
+
+        Um 429 só bloqueia o modelo na chave: os limites do Groq são por chave e modelo
+        """
+        key.errors += 1
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        if headers:
+            key.budget(model).update(headers)
+
+        status = error.status_code if isinstance(error, APIStatusError) else None
+        if status == 429:
+            key.rate_limited += 1
+            if retry_after is not None:
+                key.budget(model).block(retry_after)
+                # Espera longa indica limite diário do modelo, não um pico; os outros modelos seguem na chave
+                if retry_after >= self.hard_limit_seconds:
+                    logger.warning(f"🚫 Chave Groq {key.label} sem cota de {model} por {retry_after:.0f}s")
+        elif status in (401, 403):
+            key.auth_failures += 1
+            # Recusa pode ser passageira (ex.: falha do provedor); a última chave ativa nunca sai de uso
+            if not any(other is not key and not other.is_quarantined() for other in self.keys):
+                logger.warning(f"⚠️ Chave Groq {key.label} recusada ({status}), mas é a única ativa")
+                return False
+            seconds = min(self.auth_quarantine, AUTH_BACKOFF_START * 2 ** (key.auth_failures - 1))
+            self._quarantine(key, seconds, f"chave recusada ({status})")
+            return True
+        return False
+
+    def _quarantine(self, key: ApiKey, seconds: float, reason: str):
+        """Tira a chave de uso por um tempo"""
+        key.quarantined_until = time.monotonic() + seconds
+        key.quarantines += 1
+        logger.warning(f"🚫 Chave Groq {key.label} em quarentena por {seconds:.0f}s: {reason}")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Métricas e cota conhecida por chave"""
+        return [
+            {
+                "key": key.label,
+                "calls": key.calls,
+                "errors": key.errors,
+                "rate_limited": key.rate_limited,
+                "quarantines": key.quarantines,
+                "quarantined": key.is_quarantined(),
+                "in_flight": key.in_flight,
+                "tokens": key.tokens,
+                "budgets": {
+                    model: {"requests": budget.remaining_requests, "tokens": budget.remaining_tokens}
+                    for model, budget in key.budgets.items()
+                }
+            }
+            for key in self.keys
+        ]
+
+    def export_metrics(self) -> str:
+        """Métricas por chave no formato texto do Prometheus"""
+        metrics = [
+            ("skzgpt_groq_key_calls_total", "counter", lambda key: key.calls),
+            ("skzgpt_groq_key_errors_total", "counter", lambda key: key.errors),
+            ("skzgpt_groq_key_rate_limited_total", "counter", lambda key: key.rate_limited),
+            ("skzgpt_groq_key_tokens_total", "counter", lambda key: key.tokens),
+            ("skzgpt_groq_key_quarantined", "gauge", lambda key: int(key.is_quarantined())),
+        ]
+        lines = []
+        for metric, kind, value in metrics:
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.extend(f'{metric}{{key="{key.label}"}} {value(key)}' for key in self.keys)
+        return "\n".join(lines) + "\n"
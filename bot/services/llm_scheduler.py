@@ -0,0 +1,233 @@
+"""
+Controle de admissão e fila justa para chamadas ao LLM
+"""
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional
+
+from bot.services.request_context import RequestContext
+
+logger = logging.getLogger(__name__)
+
+class SchedulerRejectedError(Exception):
+    """Requisição recusada pelo escalonador (mensagem pronta para o usuário)"""
+
+class QueueFullError(SchedulerRejectedError):
+    """Fila global ou do servidor cheia"""
+
+class RateLimitedError(SchedulerRejectedError):
+    """Usuário excedeu o limite de requisições"""
+    
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+@dataclass
+class _TokenBucket:
+    """Balde de fichas por usuário"""
+    tokens: float
+    updated: float
+
+@dataclass
+class _GuildQueue:
+    """Estado de um servidor no escalonador"""
+    weight: float = 1.0
+    running: int = 0
+    last_finish: float = 0.0
+    waiters: Deque = field(default_factory=deque)
+
+class LLMScheduler:
+    """
+    Limites globais e por servidor, balde de fichas por usuário e
+    enfileiramento justo ponderado (start-time fair queuing) entre servidores
+    """
+    
+    def __init__(self, global_limit: int = 8, guild_limit: int = 2, max_queue: int = 100,
+                 max_guild_queue: int = 10, user_rate_per_minute: float = 10.0, user_burst: int = 3,
+                 guild_weights: Optional[Dict[int, float]] = None):
+        self.global_limit = global_limit
+        self.guild_limit = guild_limit
+        self.max_queue = max_queue
+        self.max_guild_queue = max_guild_queue
+        self.user_rate = user_rate_per_minute / 60.0
+        self.user_burst = user_burst
+        self.guild_weights = guild_weights or {}
+        
+        self._guilds: Dict[Optional[int], _GuildQueue] = {}
+        self._buckets: Dict[int, _TokenBucket] = {}
+        self._running = 0
+        self._queued = 0
+        self._virtual_time = 0.0
+        self._sequence = itertools.count()
+        
+        self.admitted = 0
+        self.waited = 0
+        self.rejected_queue = 0
+        self.rejected_rate = 0
+        # Espera na fila de cada requisição admitida (segundos)
+        self.queue_delays: Deque[float] = deque(maxlen=10000)
+        
+        logger.info(f"✅ Escalonador LLM inicializado (global={global_limit}, por servidor={guild_limit})")
+    
+    def _guild(self, guild_id: Optional[int]) -> _GuildQueue:
+        """Estado do servidor, criado sob demanda"""
+        queue = self._guilds.get(guild_id)
+        if queue is None:
+            queue = _GuildQueue(weight=self.guild_weights.get(guild_id, 1.0))
+            self._guilds[guild_id] = queue
+        return queue
+    
+    def _take_user_token(self, user_id: Optional[int]):
+        """Consome uma ficha do usuário ou recusa a requisição"""
+        if user_id is None or self.user_rate <= 0:
+            return
+        
+        now = time.monotonic()
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            bucket = self._buckets[user_id] = _TokenBucket(tokens=self.user_burst, updated=now)
+            # Remove baldes já cheios para manter o dicionário pequeno
+            if len(self._buckets) > 10000:
+                self._prune_buckets(now)
+        
+        bucket.tokens = min(self.user_burst, bucket.tokens + (now - bucket.updated) * self.user_rate)
+        bucket.updated = now
+        
+        if bucket.tokens < 1:
+            self.rejected_rate += 1
+            retry_after = (1 - bucket.tokens) / self.user_rate
+            raise RateLimitedError(
+                f"⏱️ Você está enviando mensagens rápido demais. Tente novamente em {retry_after:.0f}s.",
+                retry_after
+            )
+        bucket.tokens -= 1
+    
+    def _prune_buckets(self, now: float):
+        """Descarta baldes que já estariam cheios"""
+        full_after = self.user_burst / self.user_rate
+        for user_id in [uid for uid, b in self._buckets.items() if now - b.updated > full_after]:
+            del self._buckets[user_id]
+    
+    def _position(self, tag: float) -> int:
+        """Posição aproximada na fila (pedidos com marca anterior + 1)"""
+        ahead = sum(1 for queue in self._guilds.values() for waiter in queue.waiters if waiter[0] < tag)
+        return ahead + 1
+    
+    def _dispatch(self):
+        """Libera os próximos pedidos respeitando os limites e a ordem justa"""
+        while self._running < self.global_limit:
+            best: Optional[_GuildQueue] = None
+            for queue in self._guilds.values():
+                if not queue.waiters or queue.running >= self.guild_limit:
+                    continue
+                if best is None or queue.waiters[0][:2] < best.waiters[0][:2]:
+                    best = queue
+            if best is None:
+                return
+            
+            start_tag, _, future = best.waiters.popleft()
+            self._queued -= 1
+            if future.done():
+                continue
+            
+            self._virtual_time = max(self._virtual_time, start_tag)
+            best.running += 1
+            self._running += 1
+            future.set_result(None)
+    
+    async def acquire(self, context: RequestContext):
+        """Espera por uma vaga para a requisição"""
+        if not context.rate_charged:
+            self._take_user_token(context.user_id)
+            context.rate_charged = True
+        queue = self._guild(context.guild_id)
+        
+        # Caminho rápido: há vaga e ninguém esperando
+        if (self._queued == 0 and self._running < self.global_limit
+                and queue.running < self.guild_limit):
+            queue.running += 1
+            self._running += 1
+            self.admitted += 1
+            self.queue_delays.append(0.0)
+            return
+        
+        if self._queued >= self.max_queue or len(queue.waiters) >= self.max_guild_queue:
+            self.rejected_queue += 1
+            raise QueueFullError("🚦 O bot está sobrecarregado no momento. Tente novamente em alguns segundos.")
+        
+        start_tag = max(self._virtual_time, queue.last_finish)
+        queue.last_finish = start_tag + 1.0 / queue.weight
+        future = asyncio.get_running_loop().create_future()
+        enqueued = time.monotonic()
+        waiter = (start_tag, next(self._sequence), future)
+        queue.waiters.append(waiter)
+        self._queued += 1
+        self.waited += 1
+        
+        self._dispatch()
+        try:
+            if context.on_queued and not future.done():
+                await context.on_queued(self._position(start_tag))
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # A vaga já tinha sido concedida; devolvê-la
+                self.release(context)
+            else:
+                future.cancel()
+                self._discard(context.guild_id, waiter)
+            raise
+        self.admitted += 1
+        self.queue_delays.append(time.monotonic() - enqueued)
+    
+    def _discard(self, guild_id: Optional[int], waiter):
+        """Tira da fila um pedido cancelado para não ocupar vaga nem posição"""
+        queue = self._guilds.get(guild_id)
+        if queue is None:
+            return
+        try:
+            queue.waiters.remove(waiter)
+        except ValueError:
+            return
+        self._queued -= 1
+        
+        if queue.running == 0 and not queue.waiters:
+            del self._guilds[guild_id]
+    
+    def release(self, context: RequestContext):
+        """Devolve a vaga e acorda o próximo da fila"""
+        queue = self._guild(context.guild_id)
+        queue.running -= 1
+        self._running -= 1
+        
+        if queue.running == 0 and not queue.waiters:
+            del self._guilds[context.guild_id]
+        
+        self._dispatch()
+    
+    @asynccontextmanager
+    async def slot(self, context: RequestContext):
+        """Context manager que segura uma vaga durante a chamada"""
+        await self.acquire(context)
+        try:
+            yield
+        finally:
+            self.release(context)
+    
+    def stats(self) -> Dict[str, float]:
+        """Métricas do escalonador"""
+        delays = sorted(self.queue_delays)
+        return {
+            "running": self._running,
+            "queued": self._queued,
+            "admitted": self.admitted,
+            "waited": self.waited,
+            "rejected_queue": self.rejected_queue,
+            "rejected_rate": self.rejected_rate,
+            "queue_delay_p95": delays[int(0.95 * (len(delays) - 1))] if delays else 0.0
+        }
\ No newline at end of file
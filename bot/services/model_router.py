@@ -0,0 +1,149 @@
+"""
+Escolha de modelo por complexidade, métricas de latência e disjuntor (circuit breaker)
+"""
+import logging
+import re
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pedidos que costumam exigir o modelo grande mesmo quando curtos
+COMPLEX_HINTS = re.compile(
+    r"```|\b(?:explique|explica|compare|analise|código|codigo|programa|passo a passo|"
+    r"por que|porque|resuma|traduza|escreva|redija|calcule)\b",
+    re.IGNORECASE
+)
+
+class ModelHealth:
+    """Janela móvel de latência/erros e estado do disjuntor de um modelo"""
+    
+    def __init__(self, window: int = 200):
+        # (latência, sucesso, saudável = sucesso e não lenta)
+        self.samples: Deque[Tuple[float, bool, bool]] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+    
+    def percentile(self, pct: float) -> float:
+        """Percentil da latência das chamadas bem-sucedidas"""
+        latencies = sorted(latency for latency, ok, _ in self.samples if ok)
+        if not latencies:
+            return 0.0
+        index = min(len(latencies) - 1, int(round(pct / 100 * (len(latencies) - 1))))
+        return latencies[index]
+    
+    def error_rate(self) -> float:
+        """Fração de falhas na janela"""
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok, _ in self.samples if not ok) / len(self.samples)
+
+class ModelRouter:
+    """Roteia pedidos simples ao modelo pequeno e troca de modelo quando um degrada"""
+    
+    def __init__(self, large_model: str, small_model: str, simple_max_chars: int = 200,
+                 error_threshold: float = 0.5, min_calls: int = 10, failure_streak: int = 5,
+                 cooldown: float = 30.0, slow_call_seconds: float = 10.0, tiering: bool = True):
+        self.large_model = large_model
+        self.small_model = small_model
+        self.simple_max_chars = simple_max_chars
+        self.error_threshold = error_threshold
+        self.min_calls = min_calls
+        self.failure_streak = failure_streak
+        self.cooldown = cooldown
+        self.slow_call_seconds = slow_call_seconds
+        self.tiering = tiering
+        self.health: Dict[str, ModelHealth] = {large_model: ModelHealth(), small_model: ModelHealth()}
+        logger.info(f"✅ Roteador de modelos inicializado ({small_model} / {large_model})")
+    
+    def _health(self, model: str) -> ModelHealth:
+        """Estado do modelo, criado sob demanda"""
+        if model not in self.health:
+            self.health[model] = ModelHealth()
+        return self.health[model]
+    
+    def select(self, message: str, purpose: str = "chat", has_history: bool = False) -> str:
+        """
+        Modelo preferido: planejamento admin e pedidos complexos no grande, conversa curta no pequeno
+        """
+        if not self.tiering or purpose == "admin" or has_history:
+            return self.large_model
+        if len(message) <= self.simple_max_chars and not COMPLEX_HINTS.search(message):
+            return self.small_model
+        return self.large_model
+    
+    def alternate(self, model: str) -> str:
+        """O outro modelo da dupla"""
+        return self.small_model if model == self.large_model else self.large_model
+    
+    def is_available(self, model: str) -> bool:
+        """Disjuntor fechado, ou meio-aberto permitindo uma chamada de teste"""
+        health = self._health(model)
+        if health.opened_at is None:
+            return True
+        if time.monotonic() - health.opened_at >= self.cooldown and not health.probing:
+            health.probing = True
+            return True
+        return False
+    
+    def release(self, model: str):
+        """Devolve a chamada de teste que terminou sem resultado (ex.: cancelada)"""
+        health = self._health(model)
+        if health.opened_at is not None and health.probing:
+            health.probing = False
+    
+    def is_healthy(self, model: str) -> bool:
+        """Disjuntor fechado (sem efeito colateral, ao contrário de is_available)"""
+        return self._health(model).opened_at is None
+    
+    def candidates(self, model: str) -> List[str]:
+        """Ordem de tentativa: o modelo pedido e, se ele estiver degradado ou falhar, o alternativo"""
+        alternate = self.alternate(model)
+        alternate_closed = self.is_healthy(alternate)
+        if not self.is_available(model) and alternate_closed:
+            logger.warning(f"⚡ Disjuntor aberto para {model}; usando {alternate}")
+            return [alternate]
+        return [model, alternate] if alternate_closed else [model]
+    
+    def record(self, model: str, latency: float, ok: bool):
+        """Registra o resultado de uma chamada e atualiza o disjuntor"""
+        health = self._health(model)
+        # Chamadas lentas demais contam como falha para o disjuntor
+        success = ok and latency < self.slow_call_seconds
+        health.samples.append((latency, ok, success))
+        health.consecutive_failures = 0 if success else health.consecutive_failures + 1
+        
+        if health.opened_at is not None:
+            if health.probing:
+                health.probing = False
+                if success:
+                    health.opened_at = None
+                    # Falhas antigas não devem reabrir o disjuntor logo em seguida
+                    health.samples.clear()
+                    logger.info(f"✅ Disjuntor fechado para {model}")
+                else:
+                    health.opened_at = time.monotonic()
+            return
+        
+        recent = list(health.samples)[-self.min_calls:]
+        recent_error_rate = sum(1 for _, _, healthy in recent if not healthy) / len(recent) if recent else 0.0
+        if (health.consecutive_failures >= self.failure_streak
+                or (len(recent) >= self.min_calls and recent_error_rate >= self.error_threshold)):
+            health.opened_at = time.monotonic()
+            logger.warning(f"🔌 Disjuntor aberto para {model} "
+                           f"(erro {health.error_rate():.0%}, p95 {health.percentile(95):.2f}s)")
+    
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95, taxa de erro e estado do disjuntor por modelo"""
+        return {
+            model: {
+                "p50": health.percentile(50),
+                "p95": health.percentile(95),
+                "error_rate": health.error_rate(),
+                "calls": len(health.samples),
+                "open": health.opened_at is not None
+            }
+            for model, health in self.health.items()
+        }
\ No newline at end of file
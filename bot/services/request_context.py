@@ -0,0 +1,51 @@
+"""
+Contexto de uma requisição ao LLM (quem pediu, onde e por qual comando)
+"""
+import logging
+import time
+import discord
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tokens de interação do Discord valem 15 minutos
+INTERACTION_LIFETIME = 15 * 60
+
+@dataclass
+class RequestContext:
+    """Metadados de uma chamada ao LLM"""
+    guild_id: Optional[int] = None
+    user_id: Optional[int] = None
+    channel_id: Optional[int] = None
+    command: Optional[str] = None
+    # Chamado com a posição na fila quando a requisição precisa esperar
+    on_queued: Optional[Callable[[int], Awaitable[None]]] = None
+    # Marcado pelo escalonador para cobrar o limite do usuário uma vez por interação
+    rate_charged: bool = False
+    # Instante (time.monotonic) a partir do qual a resposta não pode mais ser entregue
+    deadline: Optional[float] = None
+    
+    @classmethod
+    def from_interaction(cls, interaction: discord.Interaction, command: Optional[str] = None) -> "RequestContext":
+        """Cria o contexto a partir de uma interação já adiada (defer)"""
+        
+        async def notify_queued(position: int):
+            try:
+                # Após um defer público, followup.send(ephemeral=True) sairia público; editar a
+                # resposta original mantém o aviso no lugar do "pensando..."
+                await interaction.edit_original_response(
+                    content=f"⏳ Você está na fila (posição {position}). Sua resposta chega em instantes."
+                )
+            except discord.HTTPException as e:
+                logger.warning(f"⚠️ Não foi possível avisar posição na fila: {e}")
+        
+        elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+        return cls(
+            guild_id=interaction.guild_id,
+            user_id=interaction.user.id,
+            channel_id=interaction.channel_id,
+            command=interaction.command.name if interaction.command else command,
+            on_queued=notify_queued,
+            deadline=time.monotonic() + INTERACTION_LIFETIME - elapsed
+        )
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Cache de respostas do LLM (memória LRU + SQLite opcional)
+"""
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+def normalize_message(message: str) -> str:
+    """Normaliza a mensagem para comparação (caixa e espaços)"""
+    return re.sub(r"\s+", " ", message.strip().lower())
+
+class ResponseCache:
+    """Cache em dois níveis para respostas do Groq"""
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 3600.0,
+                 db_path: Optional[str] = None, db_max_entries: int = 10000,
+                 disabled_guilds: Optional[Iterable[int]] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_max_entries = db_max_entries
+        self.disabled_guilds = set(disabled_guilds or [])
+
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        # Saídas da memória: por falta de espaço (LRU) e por TTL vencido
+        self.evictions = 0
+        self.expirations = 0
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses (accessed)")
+            self._db.commit()
+
+        logger.info(f"✅ Cache de respostas inicializado ({max_entries} entradas em memória"
+                    f"{', SQLite em ' + db_path if db_path else ''})")
+
+    @staticmethod
+    def make_key(model: str, system_prompt: Optional[str], message: str, temperature: float,
+                 max_tokens: int) -> str:
+        """
+        Chave do cache: modelo, hash do prompt de sistema, mensagem normalizada, temperatura e max_tokens
+
+        max_tokens entra na chave para uma resposta cortada por um teto menor não servir a um pedido maior
+        """
+        prompt_hash = hashlib.sha256((system_prompt or "").encode("utf-8")).hexdigest()
+        raw = f"{model}\x00{prompt_hash}\x00{normalize_message(message)}\x00{temperature:.2f}\x00{max_tokens}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def is_enabled_for(self, guild_id: Optional[int]) -> bool:
+        """Verifica se o servidor não optou por desativar o cache"""
+        return guild_id not in self.disabled_guilds
+
+    def disable_guild(self, guild_id: int):
+        """Desativa o cache para um servidor"""
+        self.disabled_guilds.add(guild_id)
+
+    def enable_guild(self, guild_id: int):
+        """Reativa o cache para um servidor"""
+        self.disabled_guilds.discard(guild_id)
+
+    async def get(self, key: str) -> Optional[str]:
+        """Busca uma resposta, primeiro em memória e depois no SQLite"""
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            created, value = entry
+            if now - created < self.ttl:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                return value
+            del self._memory[key]
+            self.expirations += 1
+
+        if self._db is not None:
+            row = await asyncio.to_thread(self._db_get, key, now)
+            if row is not None:
+                created, value = row
+                self._memory_set(key, value, created)
+                self.hits_disk += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str):
+        """Armazena uma resposta nos dois níveis"""
+        now = time.time()
+        self._memory_set(key, value, now)
+
+        if self._db is not None:
+            await asyncio.to_thread(self._db_set, key, value, now)
+
+    def _memory_set(self, key: str, value: str, created: float):
+        """Insere no LRU em memória, removendo o item menos usado se necessário"""
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _db_get(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        """Leitura no SQLite (executada fora do event loop)"""
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT created, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[0] >= self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            return row[0], row[1]
+
+    def _db_set(self, key: str, value: str, now: float):
+        """Escrita no SQLite com remoção por TTL e por tamanho"""
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY accessed DESC LIMIT ?)",
+                (self.db_max_entries,)
+            )
+            self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de acertos, falhas e remoções"""
+        return {
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries_memory": len(self._memory)
+        }
+
+    def export_metrics(self) -> str:
+        """Contadores do cache no formato texto do Prometheus"""
+        return (
+            "# TYPE skzgpt_response_cache_hits_total counter\n"
+            f'skzgpt_response_cache_hits_total{{tier="memory"}} {self.hits_memory}\n'
+            f'skzgpt_response_cache_hits_total{{tier="disk"}} {self.hits_disk}\n'
+            "# TYPE skzgpt_response_cache_misses_total counter\n"
+            f"skzgpt_response_cache_misses_total {self.misses}\n"
+            "# TYPE skzgpt_response_cache_evictions_total counter\n"
+            f'skzgpt_response_cache_evictions_total{{reason="lru"}} {self.evictions}\n'
+            f'skzgpt_response_cache_evictions_total{{reason="ttl"}} {self.expirations}\n'
+            "# TYPE skzgpt_response_cache_entries gauge\n"
+            f"skzgpt_response_cache_entries {len(self._memory)}\n"
+        )
+
+    def close(self):
+        """Fecha a conexão com o SQLite"""
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+Novas tentativas guiadas pelos cabeçalhos de limite de taxa do Groq
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from groq import APIConnectionError, APIStatusError
+
+from bot.services.key_pool import KeyPool, parse_duration
+from bot.services.request_context import RequestContext
+
+logger = logging.getLogger(__name__)
+
+class RetryDeadlineError(Exception):
+    """A cota só volta depois do prazo da requisição"""
+
+def _status(error: Exception):
+    """Status HTTP do erro da API, se houver"""
+    return error.status_code if isinstance(error, APIStatusError) else None
+
+def is_retryable(error: Exception) -> bool:
+    """Erros transitórios: conexão, timeout, 408/409/429 e 5xx"""
+    if isinstance(error, APIConnectionError):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+class _MeteredStream:
+    """Stream do Groq que registra na chave o uso real informado no último chunk"""
+    
+    def __init__(self, stream: Any, on_usage: Callable[[int], None]):
+        self._stream = stream
+        self._on_usage = on_usage
+    
+    async def __aiter__(self):
+        """Repassa os chunks, anotando o uso quando ele chega"""
+        async for chunk in self._stream:
+            # O Groq envia o uso de tokens no último chunk (x_groq.usage)
+            usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+            if usage:
+                self._on_usage(usage.total_tokens)
+            yield chunk
+    
+    async def close(self):
+        """Fecha o stream original"""
+        await self._stream.close()
+
+class RetryPolicy:
+    """Backoff exponencial com jitter, respeitando retry-after e o prazo da interação"""
+    
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 8.0,
+                 deadline: float = 45.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retries = 0
+        self.throttled = 0
+        self.gave_up = 0
+        logger.info(f"✅ Política de novas tentativas inicializada ({max_attempts} tentativas)")
+    
+    def _deadline(self, context: RequestContext) -> float:
+        """Prazo final: o menor entre o da política e o da interação"""
+        deadline = time.monotonic() + self.deadline
+        if context.deadline is not None:
+            deadline = min(deadline, context.deadline)
+        return deadline
+    
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Espera antes da próxima tentativa"""
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        retry_after = parse_duration(headers.get("retry-after"))
+        if retry_after is None and getattr(error, "status_code", None) == 429:
+            retry_after = parse_duration(headers.get("x-ratelimit-reset-requests"))
+        if retry_after is not None:
+            # Jitter pequeno evita que todos voltem no mesmo instante
+            return retry_after + random.uniform(0, self.base_delay)
+        # Full jitter
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+    
+    async def run(self, model: str, call: Callable[[Any], Awaitable[Any]], context: RequestContext,
+                  keys: KeyPool, tokens: int = 0) -> Any:
+        """
+        Executa call(cliente) com a chave menos carregada do pool e devolve a resposta já analisada
+
+        call deve retornar a resposta bruta (with_raw_response), para a leitura dos cabeçalhos
+        """
+        deadline = self._deadline(context)
+        attempt = 0
+        
+        while True:
+            key, wait = keys.choose(model, tokens)
+            if wait > 0:
+                if time.monotonic() + wait > deadline:
+                    self.gave_up += 1
+                    raise RetryDeadlineError(f"Cota de {model} só volta em {wait:.1f}s")
+                self.throttled += 1
+                logger.info(f"⏳ Aguardando cota de {model} por {wait:.1f}s")
+                await asyncio.sleep(wait)
+                continue
+            
+            key.budget(model).reserve(tokens)
+            key.in_flight += 1
+            try:
+                raw = await call(key.client)
+            except Exception as e:
+                delay = self._backoff(attempt, e)
+                quarantined = keys.record_error(key, model, e, delay if _status(e) == 429 else None)
+                if not is_retryable(e) and not quarantined:
+                    raise
+                
+                # Outra chave livre pode atender já, sem esperar o backoff desta
+                if keys.has_alternative(key, model, tokens):
+                    delay = 0.0
+                attempt += 1
+                if attempt >= self.max_attempts or time.monotonic() + delay > deadline:
+                    self.gave_up += 1
+                    raise
+                
+                self.retries += 1
+                logger.warning(f"🔁 Nova tentativa {attempt}/{self.max_attempts - 1} em {model} "
+                               f"após {delay:.1f}s (chave {key.label}): {e}")
+                await asyncio.sleep(delay)
+                continue
+            finally:
+                key.in_flight -= 1
+            
+            # No cliente assíncrono parse() é uma corrotina
+            parsed = await raw.parse()
+            # A chave registra o uso real, não a estimativa reservada
+            usage = getattr(parsed, "usage", None)
+            keys.record_success(key, model, raw.headers, usage.total_tokens if usage else 0)
+            if usage is None and hasattr(parsed, "__aiter__"):
+                return _MeteredStream(parsed, lambda used: keys.record_tokens(key, used))
+            return parsed
+    
+    def stats(self) -> Dict[str, int]:
+        """Contadores de novas tentativas"""
+        return {
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "gave_up": self.gave_up
+        }
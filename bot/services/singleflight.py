@@ -0,0 +1,138 @@
+"""
+Agrupamento de requisições idênticas em andamento (singleflight)
+"""
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class _Flight:
+    """Chamada compartilhada: uma tarefa upstream e seus interessados"""
+    
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+
+class _SharedStream:
+    """Stream compartilhado: a tarefa produtora grava, os inscritos leem do início"""
+    
+    def __init__(self):
+        self.parts: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.changed = asyncio.Condition()
+        self.task: Optional["asyncio.Task"] = None
+        self.subscribers = 0
+
+class SingleFlight:
+    """Executa uma única chamada por chave e distribui o resultado a todos que esperam"""
+    
+    def __init__(self, name: str = "default"):
+        # Rótulo das métricas (ex.: "llm", "gif")
+        self.name = name
+        self._calls: Dict[str, _Flight] = {}
+        self._streams: Dict[str, _SharedStream] = {}
+        self.leaders = 0
+        self.coalesced = 0
+    
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa fn() uma vez por chave; chamadas concorrentes recebem o mesmo resultado
+        """
+        flight = self._calls.get(key)
+        if flight is None:
+            self.leaders += 1
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._calls[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(self._calls, key, flight))
+        else:
+            self.coalesced += 1
+            logger.debug(f"🔗 Requisição agrupada a uma chamada em andamento ({key[:12]})")
+        
+        flight.waiters += 1
+        try:
+            # shield: um interessado cancelado não derruba a chamada dos outros
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Sai do mapa já no cancelamento para um novo pedido não entrar num voo cancelado
+                self._forget(self._calls, key, flight)
+                flight.task.cancel()
+    
+    async def stream(self, key: str, factory: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        """
+        Versão em streaming: um único stream upstream, repetido para cada inscrito
+        """
+        shared = self._streams.get(key)
+        if shared is None:
+            self.leaders += 1
+            shared = _SharedStream()
+            shared.task = asyncio.ensure_future(self._produce(key, shared, factory))
+            self._streams[key] = shared
+        else:
+            self.coalesced += 1
+            logger.debug(f"🔗 Stream agrupado a uma chamada em andamento ({key[:12]})")
+        
+        shared.subscribers += 1
+        index = 0
+        try:
+            while True:
+                while index < len(shared.parts):
+                    yield shared.parts[index]
+                    index += 1
+                if shared.done:
+                    if shared.error is not None:
+                        raise shared.error
+                    return
+                async with shared.changed:
+                    await shared.changed.wait_for(lambda: len(shared.parts) > index or shared.done)
+        finally:
+            shared.subscribers -= 1
+            if shared.subscribers == 0 and not shared.task.done():
+                self._forget(self._streams, key, shared)
+                shared.task.cancel()
+    
+    async def _produce(self, key: str, shared: _SharedStream, factory: Callable[[], AsyncIterator[str]]):
+        """Consome o stream upstream e acorda os inscritos a cada parte"""
+        try:
+            async for part in factory():
+                shared.parts.append(part)
+                async with shared.changed:
+                    shared.changed.notify_all()
+        except asyncio.CancelledError:
+            shared.error = asyncio.CancelledError()
+        except Exception as e:
+            shared.error = e
+        finally:
+            self._forget(self._streams, key, shared)
+            shared.done = True
+            async with shared.changed:
+                shared.changed.notify_all()
+    
+    @staticmethod
+    def _forget(table: Dict[str, Any], key: str, entry: Any):
+        """Remove a chave só se ainda apontar para esta chamada (e não para uma mais nova)"""
+        if table.get(key) is entry:
+            del table[key]
+    
+    def stats(self) -> Dict[str, int]:
+        """Contadores de chamadas upstream e requisições agrupadas"""
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls) + len(self._streams)
+        }
+    
+    def export_metrics(self) -> str:
+        """Contadores do singleflight no formato texto do Prometheus"""
+        stats = self.stats()
+        return (
+            "# TYPE skzgpt_singleflight_leaders_total counter\n"
+            f'skzgpt_singleflight_leaders_total{{flight="{self.name}"}} {stats["leaders"]}\n'
+            "# TYPE skzgpt_singleflight_coalesced_total counter\n"
+            f'skzgpt_singleflight_coalesced_total{{flight="{self.name}"}} {stats["coalesced"]}\n'
+            "# TYPE skzgpt_singleflight_in_flight gauge\n"
+            f'skzgpt_singleflight_in_flight{{flight="{self.name}"}} {stats["in_flight"]}\n'
+        )
\ No newline at end of file
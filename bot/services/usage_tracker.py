@@ -0,0 +1,240 @@
+"""
+Contabilidade de uso do LLM (tokens, custo e latência) por servidor, usuário e comando
+"""
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bot.services.request_context import RequestContext
+
+logger = logging.getLogger(__name__)
+
+# US$ por 1M de tokens (entrada, saída)
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+}
+
+# (servidor, usuário, comando, modelo); 0 e "" no lugar de valores ausentes
+UsageKey = Tuple[int, int, str, str]
+
+GROUP_COLUMNS = {"usuario": "user_id", "comando": "command", "modelo": "model"}
+
+class UsageTotals:
+    """Somatório de uso de um grupo de chamadas"""
+
+    __slots__ = ("calls", "errors", "cache_hits", "prompt_tokens", "completion_tokens", "latency", "cost")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency = 0.0
+        self.cost = 0.0
+
+    @property
+    def tokens(self) -> int:
+        """Tokens de entrada e saída"""
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, other: "UsageTotals"):
+        """Acumula outro somatório neste"""
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def as_tuple(self) -> tuple:
+        """Valores na ordem das colunas do SQLite"""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+class UsageTracker:
+    """Agrega o uso em memória e grava periodicamente no SQLite e no arquivo de métricas"""
+
+    def __init__(self, db_path: Optional[str] = None, flush_interval: float = 60.0,
+                 metrics_path: Optional[str] = None,
+                 prices: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.flush_interval = flush_interval
+        self.metrics_path = metrics_path
+        self.prices = prices or MODEL_PRICES
+
+        # Desde a inicialização (exportação) e ainda não gravado (SQLite)
+        self._totals: Dict[UsageKey, UsageTotals] = {}
+        self._pending: Dict[UsageKey, UsageTotals] = {}
+        self._task: Optional["asyncio.Task"] = None
+        # Outras fontes de métricas incluídas na exportação
+        self._collectors: List[Callable[[], str]] = []
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS usage ("
+                "day TEXT NOT NULL, guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+                "command TEXT NOT NULL, model TEXT NOT NULL, "
+                "calls INTEGER NOT NULL, errors INTEGER NOT NULL, cache_hits INTEGER NOT NULL, "
+                "prompt_tokens INTEGER NOT NULL, completion_tokens INTEGER NOT NULL, "
+                "latency REAL NOT NULL, cost REAL NOT NULL, "
+                "PRIMARY KEY (day, guild_id, user_id, command, model))"
+            )
+            self._db.commit()
+
+        logger.info(f"✅ Contabilidade de uso inicializada{' (SQLite em ' + db_path + ')' if db_path else ''}")
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """Custo estimado em US$ de uma chamada"""
+        input_price, output_price = self.prices.get(model, (0.0, 0.0))
+        return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+    def _entries(self, key: UsageKey) -> List[UsageTotals]:
+        """Somatórios (total e pendente) a atualizar para a chave"""
+        entries = []
+        # Sem SQLite não há o que gravar, então o pendente não é mantido
+        for table in (self._totals, self._pending) if self._db else (self._totals,):
+            if key not in table:
+                table[key] = UsageTotals()
+            entries.append(table[key])
+        return entries
+
+    def record(self, context: RequestContext, model: str, prompt_tokens: int = 0,
+               completion_tokens: int = 0, latency: float = 0.0, ok: bool = True, cached: bool = False):
+        """Registra uma chamada ao LLM (ou um acerto de cache)"""
+        key = (context.guild_id or 0, context.user_id or 0, context.command or "", model)
+        cost = 0.0 if cached else self.cost(model, prompt_tokens, completion_tokens)
+        for totals in self._entries(key):
+            totals.calls += 1
+            totals.errors += 0 if ok else 1
+            totals.cache_hits += 1 if cached else 0
+            totals.prompt_tokens += prompt_tokens
+            totals.completion_tokens += completion_tokens
+            totals.latency += latency
+            totals.cost += cost
+
+    def add_collector(self, collector: Callable[[], str]):
+        """Inclui métricas de outro componente (texto Prometheus) na exportação"""
+        self._collectors.append(collector)
+
+    def start(self):
+        """Inicia a gravação periódica (precisa do loop em execução)"""
+        if self._task is None and (self._db or self.metrics_path):
+            self._task = asyncio.ensure_future(self._flush_loop())
+
+    async def _flush_loop(self):
+        """Grava o uso a cada flush_interval segundos"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ Erro ao gravar uso do LLM: {e}")
+
+    async def flush(self):
+        """Grava o uso pendente no SQLite e atualiza o arquivo de métricas"""
+        pending, self._pending = self._pending, {}
+        if self._db and pending:
+            await asyncio.to_thread(self._write, time.strftime("%Y-%m-%d"), pending)
+        if self.metrics_path:
+            await asyncio.to_thread(self._write_metrics, self.export_metrics())
+
+    def _write(self, day: str, pending: Dict[UsageKey, UsageTotals]):
+        """Soma o uso pendente às linhas do dia (executa em thread)"""
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT INTO usage VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (day, guild_id, user_id, command, model) DO UPDATE SET "
+                "calls = calls + excluded.calls, errors = errors + excluded.errors, "
+                "cache_hits = cache_hits + excluded.cache_hits, "
+                "prompt_tokens = prompt_tokens + excluded.prompt_tokens, "
+                "completion_tokens = completion_tokens + excluded.completion_tokens, "
+                "latency = latency + excluded.latency, cost = cost + excluded.cost",
+                [(day, *key, *totals.as_tuple()) for key, totals in pending.items()]
+            )
+            self._db.commit()
+
+    def _write_metrics(self, text: str):
+        """Substitui o arquivo de métricas (executa em thread)"""
+        with open(self.metrics_path, "w", encoding="utf-8") as file:
+            file.write(text)
+
+    async def report(self, guild_id: int, group_by: str = "usuario", days: int = 30,
+                     limit: int = 10) -> Tuple[UsageTotals, List[Tuple[str, UsageTotals]]]:
+        """
+        Total do servidor e os maiores consumidores agrupados por usuário, comando ou modelo
+
+        Com SQLite cobre os últimos `days` dias; sem ele, o uso desde a inicialização
+        """
+        column = GROUP_COLUMNS[group_by]
+        if self._db:
+            await self.flush()
+            rows = await asyncio.to_thread(self._query, guild_id, column, days)
+        else:
+            index = ("guild_id", "user_id", "command", "model").index(column)
+            grouped: Dict[str, UsageTotals] = {}
+            for key, totals in self._totals.items():
+                if key[0] == guild_id:
+                    grouped.setdefault(key[index], UsageTotals()).add(totals)
+            rows = list(grouped.items())
+
+        total = UsageTotals()
+        for _, totals in rows:
+            total.add(totals)
+        rows.sort(key=lambda row: row[1].tokens, reverse=True)
+        return total, rows[:limit]
+
+    def _query(self, guild_id: int, column: str, days: int) -> List[Tuple[str, UsageTotals]]:
+        """Uso do servidor agrupado por coluna (executa em thread)"""
+        since = time.strftime("%Y-%m-%d", time.localtime(time.time() - days * 86400))
+        with self._db_lock:
+            cursor = self._db.execute(
+                f"SELECT {column}, SUM(calls), SUM(errors), SUM(cache_hits), SUM(prompt_tokens), "
+                f"SUM(completion_tokens), SUM(latency), SUM(cost) FROM usage "
+                f"WHERE guild_id = ? AND day >= ? GROUP BY {column}",
+                (guild_id, since)
+            )
+            rows = cursor.fetchall()
+
+        result = []
+        for row in rows:
+            totals = UsageTotals()
+            for name, value in zip(UsageTotals.__slots__, row[1:]):
+                setattr(totals, name, value)
+            result.append((row[0], totals))
+        return result
+
+    def export_metrics(self) -> str:
+        """Uso desde a inicialização no formato texto do Prometheus (sem o rótulo de usuário)"""
+        grouped: Dict[Tuple[int, str, str], UsageTotals] = {}
+        for (guild_id, _, command, model), totals in self._totals.items():
+            grouped.setdefault((guild_id, command, model), UsageTotals()).add(totals)
+
+        metrics = [
+            ("skzgpt_llm_calls_total", "calls"),
+            ("skzgpt_llm_errors_total", "errors"),
+            ("skzgpt_llm_cache_hits_total", "cache_hits"),
+            ("skzgpt_llm_prompt_tokens_total", "prompt_tokens"),
+            ("skzgpt_llm_completion_tokens_total", "completion_tokens"),
+            ("skzgpt_llm_latency_seconds_sum", "latency"),
+            ("skzgpt_llm_cost_usd_total", "cost"),
+        ]
+        lines = []
+        for metric, attribute in metrics:
+            lines.append(f"# TYPE {metric} counter")
+            for (guild_id, command, model), totals in sorted(grouped.items()):
+                labels = f'guild="{guild_id}",command="{command}",model="{model}"'
+                lines.append(f"{metric}{{{labels}}} {getattr(totals, attribute)}")
+        return "\n".join(lines) + "\n" + "".join(collector() for collector in self._collectors)
+
+    async def close(self):
+        """Para a gravação periódica e grava o que falta"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+        if self._db:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
@@ -0,0 +1,248 @@
+"""
+Catálogo declarativo das ações administrativas e montagem dos prompts
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+# Categoria -> [(ação, descrição)]
+ACTION_CATEGORIES: Dict[str, List[Tuple[str, str]]] = {
+    "BÁSICO": [
+        ("resposta", "Resposta simples de chat"),
+        ("criar_embed", "Criar embed personalizado"),
+        ("criar_canal", "Criar canal texto/voz"),
+        ("criar_cargo", "Criar cargo/role"),
+        ("limpar_mensagens", "Limpar mensagens"),
+        ("enviar_dm", "Enviar mensagem privada"),
+        ("anuncio_global", "Anúncio em todos os canais"),
+        ("criar_poll", "Criar enquete/votação"),
+        ("auto_react", "Auto reagir mensagens"),
+        ("canal_temp", "Criar canal temporário")
+    ],
+    "INFORMAÇÕES": [
+        ("listar_cargos", "Todos os cargos"),
+        ("listar_canais", "Todos os canais"),
+        ("listar_membros", "Stats membros"),
+        ("info_servidor", "Info completa servidor"),
+        ("listar_bots", "Todos os bots"),
+        ("audit_log", "Log auditoria"),
+        ("listar_convites", "Convites ativos"),
+        ("top_usuarios", "Ranking usuários"),
+        ("stats_detalhadas", "Estatísticas avançadas"),
+        ("historico_mensagens", "Histórico canal"),
+        ("member_info", "Info detalhada membro"),
+        ("canal_stats", "Estatísticas canal"),
+        ("emoji_stats", "Stats emojis servidor"),
+        ("boost_info", "Info boost servidor"),
+        ("permissions_check", "Verificar permissões")
+    ],
+    "GERENCIAMENTO": [
+        ("slowmode", "Modo lento canal"),
+        ("bloquear_canal", "Bloquear canal"),
+        ("desbloquear_canal", "Desbloquear canal"),
+        ("criar_categoria", "Nova categoria"),
+        ("mover_canal", "Mover canal"),
+        ("duplicar_canal", "Duplicar canal"),
+        ("webhook_create", "Criar webhook"),
+        ("backup_cargos", "Backup cargos"),
+        ("restore_cargos", "Restaurar cargos"),
+        ("bulk_create_channels", "Criar múltiplos canais"),
+        ("channel_template", "Template de canal"),
+        ("auto_archive", "Auto arquivar threads"),
+        ("mass_role_assign", "Atribuir cargo em massa"),
+        ("server_template", "Template servidor"),
+        ("channel_sync", "Sincronizar permissões"),
+        ("role_hierarchy", "Reorganizar hierarquia"),
+        ("bulk_permissions", "Permissões em massa"),
+        ("server_backup", "Backup completo"),
+        ("clone_server", "Clonar estrutura"),
+        ("mass_move", "Mover canais em massa")
+    ],
+    "MODERAÇÃO": [
+        ("timeout_usuario", "Timeout usuário"),
+        ("remover_timeout", "Remover timeout"),
+        ("add_reacao", "Adicionar reação"),
+        ("pin_mensagem", "Fixar mensagem"),
+        ("unpin_mensagem", "Desfixar mensagens"),
+        ("nick_usuario", "Alterar apelido"),
+        ("reset_nicks", "Reset apelidos"),
+        ("mass_ban", "Ban em massa"),
+        ("mass_kick", "Kick em massa"),
+        ("auto_mod", "Auto moderação"),
+        ("word_filter", "Filtro palavras"),
+        ("spam_protection", "Proteção spam"),
+        ("raid_protection", "Proteção raid"),
+        ("auto_warn", "Sistema warnings"),
+        ("mute_sistema", "Sistema mute"),
+        ("captcha_verify", "Verificação captcha"),
+        ("anti_bot", "Proteção anti bot"),
+        ("link_filter", "Filtro links"),
+        ("image_filter", "Filtro imagens"),
+        ("toxic_filter", "Filtro toxicidade")
+    ],
+    "AUTOMAÇÃO": [
+        ("auto_role", "Auto cargo entrada"),
+        ("welcome_msg", "Mensagem boas vindas"),
+        ("goodbye_msg", "Mensagem saída"),
+        ("level_system", "Sistema level"),
+        ("xp_rewards", "Recompensas XP"),
+        ("daily_backup", "Backup diário"),
+        ("scheduled_msg", "Mensagens agendadas"),
+        ("auto_clean", "Limpeza automática"),
+        ("activity_monitor", "Monitor atividade"),
+        ("inactive_cleanup", "Limpar inativos"),
+        ("auto_promote", "Promoção automática"),
+        ("event_scheduler", "Agendar eventos"),
+        ("reminder_system", "Sistema lembretes"),
+        ("auto_archive_old", "Arquivar antigos"),
+        ("smart_notifications", "Notificações IA")
+    ],
+    "ENTRETENIMENTO": [
+        ("mini_games", "Mini jogos"),
+        ("quiz_system", "Sistema quiz"),
+        ("music_queue", "Fila música"),
+        ("meme_generator", "Gerador memes"),
+        ("random_facts", "Fatos aleatórios"),
+        ("daily_quote", "Frase do dia"),
+        ("fortune_teller", "Adivinhação"),
+        ("rock_paper", "Pedra papel tesoura"),
+        ("coin_flip", "Cara ou coroa"),
+        ("dice_roll", "Rolar dados"),
+        ("8ball", "Bola mágica"),
+        ("trivia_game", "Jogo trivia"),
+        ("word_game", "Jogo palavras"),
+        ("emoji_game", "Jogo emoji"),
+        ("riddle_game", "Jogo charadas")
+    ]
+}
+
+# Palavras-chave do classificador local de categorias (sem acentos), casadas como palavras
+# inteiras; "*" no fim marca um radical ("informac*" casa "informacao" e "informacoes")
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    "BÁSICO": ["embed", "criar canal", "criar cargo", "limpar", "apagar", "dm", "privad*",
+               "anuncio*", "enquete*", "votac*", "poll", "temporari*"],
+    "INFORMAÇÕES": ["listar", "lista", "info", "informac*", "quantos", "quantas", "quais", "estatistica*",
+                    "stats", "auditoria", "convites", "ranking", "historico", "boost*", "permiss*",
+                    "dados do servidor"],
+    "GERENCIAMENTO": ["slowmode", "modo lento", "bloquear", "desbloquear", "categoria*", "mover",
+                      "duplicar", "webhook*", "backup*", "restaurar", "template*", "sincronizar",
+                      "hierarquia", "clonar", "em massa", "arquivar"],
+    "MODERAÇÃO": ["timeout", "castigo", "reacao", "reacoes", "fixar", "desfixar", "apelido*", "nick*",
+                  "ban", "banir", "kick", "expulsar", "moderac*", "filtro*", "spam", "raid", "warn*",
+                  "advert*", "mute", "silenciar", "captcha", "toxic*"],
+    "AUTOMAÇÃO": ["automatic*", "auto role", "boas vindas", "boas-vindas", "saida", "level", "nivel",
+                  "niveis", "xp", "diari*", "agendar", "agendad*", "lembrete*", "inativos", "promoc*",
+                  "notificac*"],
+    "ENTRETENIMENTO": ["jogo", "jogar", "quiz", "trivia", "musica*", "meme*", "fato*", "curiosidade*",
+                       "frase*", "sorte", "pedra", "papel", "tesoura", "moeda", "cara ou coroa",
+                       "dado", "rolar", "bola", "charada*", "piada*"]
+}
+
+PROMPT_HEADER = """
+Você é um assistente inteligente para servidor Discord com 95+ funcionalidades administrativas.
+Retorne SEMPRE um JSON válido com a lista de ações a executar.
+"""
+
+PROMPT_FOOTER = """Formato de resposta:
+[{"action": "tipo_acao", "resposta": "texto", "titulo": "titulo", "descricao": "desc", "cor": "5865F2", "nome": "nome", "valor": 30, "categoria": "Geral", "emoji": "👍"}]
+
+IMPORTANTE: Sempre retorne JSON válido, mesmo para erros.
+"""
+
+# Modo JSON da API exige um objeto no topo
+PROMPT_FOOTER_JSON_OBJECT = """Formato de resposta (objeto JSON):
+{"actions": [{"action": "tipo_acao", "resposta": "texto", "titulo": "titulo", "descricao": "desc", "cor": "5865F2", "nome": "nome", "valor": 30, "categoria": "Geral", "emoji": "👍"}]}
+
+IMPORTANTE: Sempre retorne JSON válido, mesmo para erros.
+"""
+
+CATEGORY_CLASSIFIER_PROMPT = (
+    "Classifique o pedido de um administrador de servidor Discord em UMA categoria: "
+    + ", ".join(ACTION_CATEGORIES) + " ou CHAT (conversa comum). "
+    "Responda apenas com o nome da categoria."
+)
+
+# Ações incluídas em todo prompt restrito a uma categoria
+ALWAYS_AVAILABLE: List[Tuple[str, str]] = [
+    ("resposta", "Resposta simples de chat"),
+    ("criar_canal", "Criar canal texto/voz"),
+    ("criar_cargo", "Criar cargo/role"),
+]
+
+def _strip_accents(text: str) -> str:
+    """Remove acentos para comparação"""
+    normalized = unicodedata.normalize("NFD", text)
+    return "".join(c for c in normalized if unicodedata.category(c) != "Mn")
+
+def _format_category(category: str, actions: List[Tuple[str, str]]) -> str:
+    """Formata uma categoria no estilo do prompt"""
+    lines = [f"{category} ({len(actions)}):"]
+    lines.extend(f'- "{name}": {description}' for name, description in actions)
+    return "\n".join(lines)
+
+def build_admin_prompt(category: Optional[str] = None, json_object: bool = False) -> str:
+    """
+    Monta o prompt de sistema; sem categoria, inclui o catálogo completo
+    """
+    if category is None or category not in ACTION_CATEGORIES:
+        sections = [_format_category(name, actions) for name, actions in ACTION_CATEGORIES.items()]
+    else:
+        actions = list(ACTION_CATEGORIES[category])
+        # "resposta" e as criações básicas continuam disponíveis: o modelo pode só conversar
+        # ou criar o canal/cargo que o pedido da categoria menciona
+        present = {name for name, _ in actions}
+        actions = [action for action in ALWAYS_AVAILABLE if action[0] not in present] + actions
+        sections = [_format_category(category, actions)]
+
+    footer = PROMPT_FOOTER_JSON_OBJECT if json_object else PROMPT_FOOTER
+    return PROMPT_HEADER + "\n" + "\n\n".join(sections) + "\n\n" + footer
+
+def parse_category(text: str) -> Optional[str]:
+    """Converte a resposta do classificador em uma categoria conhecida"""
+    cleaned = _strip_accents(text.strip().upper())
+    for category in ACTION_CATEGORIES:
+        if _strip_accents(category) in cleaned:
+            return category
+    return None
+
+def _word_pattern(keyword: str) -> "re.Pattern[str]":
+    """Palavra (ou radical, com "*") delimitada, para "dm" não casar dentro de admin"""
+    stem = keyword.endswith("*")
+    return re.compile(r"\b" + re.escape(keyword.rstrip("*")) + ("" if stem else r"\b"))
+
+# Categoria -> [(padrão, peso)]; o nome de uma ação ("dar cargo") vale mais que uma palavra-chave
+_CATEGORY_PATTERNS: Dict[str, List[Tuple["re.Pattern[str]", int]]] = {
+    category: [(_word_pattern(keyword), 1) for keyword in CATEGORY_KEYWORDS.get(category, [])]
+    + [(_word_pattern(name.replace("_", " ")), 2) for name, _ in actions if name != "resposta"]
+    for category, actions in ACTION_CATEGORIES.items()
+}
+
+_CREATION_VERB = re.compile(r"\b(?:cri(?:a|e|ar|em)|adicion(?:a|e|ar)|mont(?:a|e|ar)|fa(?:z|zer|ca))\b")
+_CREATED_NOUNS = [re.compile(pattern) for pattern in (
+    r"\bcana(?:l|is)\b", r"\bcargos?\b", r"\bcategorias?\b", r"\bembeds?\b", r"\benquetes?\b",
+    r"\bwebhooks?\b",
+)]
+
+def classify_category(message: str) -> Optional[str]:
+    """
+    Classificador local por palavras-chave
+
+    Só restringe o prompt quando exatamente uma categoria tem sinal; pedidos sem sinal
+    ou que tocam várias categorias ("criar canal e dar timeout") retornam None
+    (catálogo completo)
+    """
+    text = _strip_accents(message.lower())
+    scores: Dict[str, int] = {}
+
+    # Criação de mais de um tipo de objeto ("criar categoria X com 3 canais") mistura categorias
+    if _CREATION_VERB.search(text) and sum(1 for noun in _CREATED_NOUNS if noun.search(text)) > 1:
+        return None
+
+    for category, patterns in _CATEGORY_PATTERNS.items():
+        score = sum(weight for pattern, weight in patterns if pattern.search(text))
+        if score:
+            scores[category] = score
+
+    if len(scores) != 1:
+        return None
+    return next(iter(scores))
@@ -0,0 +1,83 @@
+"""
+Registro declarativo das ações administrativas: despacho por nome e metadados de cada handler
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from bot.utils.action_schema import ACTION_SCHEMAS, Param, register_validator, unregister_validator
+
+logger = logging.getLogger(__name__)
+
+# handler(executor, action, guild[, interaction]) -> texto do resultado
+ActionHandler = Callable[..., Awaitable[str]]
+
+@dataclass(frozen=True)
+class ActionSpec:
+    """Ação registrada e seus metadados"""
+    name: str
+    handler: ActionHandler
+    # Permissões do bot no servidor (nomes de discord.Permissions) conferidas antes de executar
+    permissions: Tuple[str, ...] = ()
+    # Recebe a interação (envia mensagens no canal do comando)
+    needs_interaction: bool = False
+    # Estimativa de chamadas à API do Discord
+    api_cost: int = 1
+    params: Dict[str, Param] = field(default_factory=dict)
+
+class ActionRegistry:
+    """Tabela nome -> ActionSpec; handlers entram pelo decorador action() ou por register()"""
+
+    def __init__(self):
+        self._specs: Dict[str, ActionSpec] = {}
+
+    def action(self, name: str, *, permissions: Tuple[str, ...] = (), needs_interaction: bool = False,
+               api_cost: int = 1, params: Optional[Dict[str, Param]] = None):
+        """Decorador que registra o handler com os metadados da ação"""
+        def decorator(handler: ActionHandler) -> ActionHandler:
+            self.register(name, handler, permissions=permissions, needs_interaction=needs_interaction,
+                          api_cost=api_cost, params=params)
+            return handler
+        return decorator
+
+    def register(self, name: str, handler: ActionHandler, *, permissions: Tuple[str, ...] = (),
+                 needs_interaction: bool = False, api_cost: int = 1,
+                 params: Optional[Dict[str, Param]] = None) -> ActionSpec:
+        """
+        Registra (ou substitui) uma ação; cogs podem chamar em tempo de execução
+
+        O validador do plano acompanha o registro: sem params vale o esquema de
+        ACTION_SCHEMAS (ou nenhum, e os campos passam como vieram)
+        """
+        if name in self._specs:
+            logger.warning(f"⚠️ Ação '{name}' registrada novamente; o handler anterior foi substituído")
+        register_validator(name, params)
+        spec = ActionSpec(
+            name=name,
+            handler=handler,
+            permissions=tuple(permissions),
+            needs_interaction=needs_interaction,
+            api_cost=api_cost,
+            params=ACTION_SCHEMAS.get(name, {}) if params is None else dict(params)
+        )
+        self._specs[name] = spec
+        return spec
+
+    def unregister(self, name: str) -> Optional[ActionSpec]:
+        """Remove a ação e seu validador (ex.: ao descarregar o cog que a registrou)"""
+        spec = self._specs.pop(name, None)
+        if spec is not None:
+            unregister_validator(name)
+        return spec
+
+    def get(self, name: Any) -> Optional[ActionSpec]:
+        return self._specs.get(name) if isinstance(name, str) else None
+
+    def __contains__(self, name: Any) -> bool:
+        return self.get(name) is not None
+
+    def __iter__(self) -> Iterator[ActionSpec]:
+        return iter(list(self._specs.values()))
+
+    def __len__(self) -> int:
+        return len(self._specs)
@@ -0,0 +1,247 @@
+"""
+Esquema declarativo dos parâmetros de cada ação e validação do plano antes da execução
+"""
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bot.utils.action_catalog import ACTION_CATEGORIES
+
+@dataclass(frozen=True)
+class Param:
+    """Parâmetro de uma ação"""
+    type: str  # texto, inteiro, booleano, cor ou url
+    required: bool = False
+    minimum: Optional[int] = None
+    maximum: Optional[int] = None
+    # Fora da faixa: ajusta ao limite em vez de recusar (quando o handler já limitaria)
+    clamp: bool = False
+    # Textos maiores são cortados (limites do Discord)
+    max_length: Optional[int] = None
+
+_CHANNEL = Param("texto", required=True, max_length=100)
+_ROLE = Param("texto", required=True, max_length=100)
+_NEW_NAME = Param("texto", required=True, max_length=100)
+_OPTIONAL_CHANNEL = Param("texto", max_length=100)
+
+# Ação -> parâmetros que o AdminActionExecutor lê ({} = nenhum); ações ausentes aqui passam
+# com os campos como vieram, sem conferência
+ACTION_SCHEMAS: Dict[str, Dict[str, Param]] = {
+    "resposta": {"resposta": Param("texto", max_length=2000)},
+    "criar_embed": {
+        "titulo": Param("texto", max_length=256),
+        "descricao": Param("texto", max_length=4096),
+        "cor": Param("cor"),
+        "imagem": Param("url"),
+        "thumbnail": Param("url"),
+        "footer": Param("texto", max_length=2048),
+    },
+    "criar_canal": {"nome": Param("texto", max_length=100)},
+    "criar_cargo": {"nome": Param("texto", max_length=100)},
+    "editar_canal": {"nome": _CHANNEL, "novo_nome": _NEW_NAME},
+    "deletar_canal": {"nome": _CHANNEL},
+    "editar_cargo": {"nome": _ROLE, "novo_nome": _NEW_NAME},
+    "deletar_cargo": {"nome": _ROLE},
+    "limpar_mensagens": {
+        "nome": _CHANNEL,
+        "mensagens": Param("inteiro", minimum=1, maximum=100, clamp=True),
+        "todas_mensagens": Param("booleano"),
+    },
+    "banir_usuario": {},
+    "expulsar_usuario": {},
+    "dar_cargo": {},
+    "remover_cargo": {},
+    "slowmode": {"nome": _CHANNEL, "valor": Param("inteiro", required=True, minimum=0, maximum=21600)},
+    "bloquear_canal": {"nome": _CHANNEL},
+    "desbloquear_canal": {"nome": _CHANNEL},
+    "criar_categoria": {"nome": Param("texto", max_length=100)},
+    "mover_canal": {"nome": _CHANNEL, "categoria": Param("texto", required=True, max_length=100)},
+    "duplicar_canal": {"nome": _CHANNEL},
+    "webhook_create": {"nome": _CHANNEL, "webhook_nome": Param("texto", max_length=80)},
+    "add_reacao": {"nome": _CHANNEL, "emoji": Param("texto", max_length=100)},
+    "pin_mensagem": {"nome": _CHANNEL},
+    "unpin_mensagem": {"nome": _CHANNEL},
+    "anuncio_global": {"resposta": Param("texto", max_length=4096)},
+    "criar_poll": {"titulo": Param("texto", max_length=256), "descricao": Param("texto", max_length=4096)},
+    "canal_temp": {"nome": Param("texto", max_length=100)},
+    "historico_mensagens": {"nome": _OPTIONAL_CHANNEL},
+    "canal_stats": {"nome": _OPTIONAL_CHANNEL},
+    "bulk_create_channels": {
+        "nome": Param("texto", max_length=90),
+        "valor": Param("inteiro", minimum=1, maximum=5, clamp=True),
+    },
+    "dice_roll": {"valor": Param("inteiro", minimum=1, maximum=6, clamp=True)},
+}
+
+_HEX_COLOR = re.compile(r"[0-9a-fA-F]{6}")
+_TRUE = {"true", "sim", "yes", "1", "s"}
+_FALSE = {"false", "nao", "não", "no", "0", "n"}
+
+def _text(value: Any) -> str:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise ValueError("deve ser texto")
+
+def _integer(value: Any) -> int:
+    if isinstance(value, bool):
+        raise ValueError("deve ser um número inteiro")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("deve ser um número inteiro") from None
+    if not number.is_integer():
+        raise ValueError("deve ser um número inteiro")
+    return int(number)
+
+def _boolean(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError("deve ser true ou false")
+
+def _color(value: Any) -> str:
+    if isinstance(value, int) and not isinstance(value, bool):
+        if 0 <= value <= 0xFFFFFF:
+            return f"{value:06X}"
+        raise ValueError("cor fora da faixa 000000-FFFFFF")
+    text = _text(value).lstrip("#")
+    if text[:2].lower() == "0x":
+        text = text[2:]
+    if len(text) == 3:
+        text = "".join(c * 2 for c in text)
+    if not _HEX_COLOR.fullmatch(text):
+        raise ValueError("deve ser uma cor hexadecimal como 5865F2")
+    return text.upper()
+
+def _url(value: Any) -> str:
+    text = _text(value)
+    if not text.startswith(("http://", "https://")):
+        raise ValueError("deve ser uma URL http(s)")
+    return text
+
+_COERCERS: Dict[str, Callable[[Any], Any]] = {
+    "texto": _text,
+    "inteiro": _integer,
+    "booleano": _boolean,
+    "cor": _color,
+    "url": _url,
+}
+
+Validator = Callable[[Dict[str, Any]], Tuple[Dict[str, Any], List[str]]]
+
+def _compile_param(param: Param) -> Callable[[Any], Any]:
+    """Função que converte e confere um campo (ValueError com a mensagem do erro)"""
+    coerce = _COERCERS[param.type]
+    minimum, maximum, clamp = param.minimum, param.maximum, param.clamp
+    max_length, required = param.max_length, param.required
+
+    def check(value: Any) -> Any:
+        value = coerce(value)
+        if max_length is not None and len(value) > max_length:
+            value = value[:max_length]
+        if minimum is not None and value < minimum:
+            if not clamp:
+                raise ValueError(f"deve estar entre {minimum} e {maximum}")
+            value = minimum
+        if maximum is not None and value > maximum:
+            if not clamp:
+                raise ValueError(f"deve estar entre {minimum} e {maximum}")
+            value = maximum
+        if required and value == "":
+            raise ValueError("não pode ser vazio")
+        return value
+
+    return check
+
+def _compile(action_type: str, params: Dict[str, Param]) -> Validator:
+    """Validador de uma ação: campos conhecidos convertidos, demais descartados"""
+    checks = [(field, param.required, _compile_param(param)) for field, param in params.items()]
+
+    def validate(action: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        clean = {"action": action_type}
+        errors = []
+        for field, required, check in checks:
+            value = action.get(field)
+            if value is None:
+                if required:
+                    errors.append(f'"{field}" é obrigatório')
+                continue
+            try:
+                value = check(value)
+            except ValueError as e:
+                errors.append(f'"{field}" {e}')
+                continue
+            # Texto opcional vazio: o handler usa o valor padrão
+            if value != "":
+                clean[field] = value
+        return clean, errors
+
+    return validate
+
+def _passthrough(action_type: str) -> Validator:
+    """Validador de uma ação sem esquema: mantém os campos como vieram"""
+
+    def validate(action: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        return {**action, "action": action_type}, []
+
+    return validate
+
+def _validator(action_type: str, params: Optional[Dict[str, Param]]) -> Validator:
+    return _passthrough(action_type) if params is None else _compile(action_type, params)
+
+# Compilados uma vez na importação
+VALIDATORS: Dict[str, Validator] = {
+    action_type: _validator(action_type, ACTION_SCHEMAS.get(action_type))
+    for action_type in {name for actions in ACTION_CATEGORIES.values() for name, _ in actions} | set(ACTION_SCHEMAS)
+}
+
+def register_validator(action_type: str, params: Optional[Dict[str, Param]] = None):
+    """
+    Validador de uma ação registrada em tempo de execução
+
+    Sem params vale o esquema de ACTION_SCHEMAS, ou nenhum (campos passam como vieram)
+    """
+    VALIDATORS[action_type] = _validator(action_type, ACTION_SCHEMAS.get(action_type) if params is None else params)
+
+def unregister_validator(action_type: str):
+    """Esquece o validador de uma ação removida: o plano passa a recusá-la"""
+    VALIDATORS.pop(action_type, None)
+
+def validate_plan(actions: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Confere e converte o plano inteiro; retorna (plano convertido, erros)
+
+    Os erros citam a posição e o tipo da ação, prontos para voltar ao modelo
+    """
+    plan = []
+    errors = []
+    for index, action in enumerate(actions, 1):
+        action_type = action.get("action", "resposta")
+        validator = VALIDATORS.get(action_type) if isinstance(action_type, str) else None
+        if validator is None:
+            errors.append(f"ação {index}: tipo desconhecido {action_type!r}")
+            continue
+        clean, action_errors = validator(action)
+        errors.extend(f"ação {index} ({action_type}): {error}" for error in action_errors)
+        plan.append(clean)
+    return plan, errors
+
+def build_repair_message(message: str, actions: List[Dict[str, Any]], errors: List[str]) -> str:
+    """Pedido de correção enviado ao modelo com o plano recusado e os erros"""
+    return (
+        f"Pedido original: {message}\n\n"
+        f"Seu plano anterior:\n{json.dumps(actions, ensure_ascii=False)}\n\n"
+        "Erros encontrados:\n" + "\n".join(f"- {error}" for error in errors) + "\n\n"
+        "Corrija os erros e retorne o plano completo no mesmo formato JSON, usando apenas ações do catálogo."
+    )
@@ -4,14 +4,22 @@ Executor de ações administrativas
 import logging
 import discord
 import random
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+from bot.services.guild_index import GuildNameIndex
+from bot.utils.action_registry import ActionHandler, ActionRegistry, ActionSpec
 
 logger = logging.getLogger(__name__)
 
+# Ações embutidas, registradas pelos decoradores dos métodos abaixo; cogs podem acrescentar outras
+ADMIN_ACTIONS = ActionRegistry()
+
 class AdminActionExecutor:
     """Executor de ações administrativas do Discord"""
     
-    def __init__(self):
+    def __init__(self, names: Optional[GuildNameIndex] = None):
+        # Resolve os nomes de canais, categorias e cargos do plano sem varrer o servidor
+        self.names = names or GuildNameIndex()
         logger.info("✅ Executor de ações admin inicializado")
     
     async def execute_action(self, action: Dict[str, Any], guild: discord.Guild, 
@@ -20,262 +28,18 @@ class AdminActionExecutor:
         Executa uma ação administrativa
         """
         action_type = action.get("action", "resposta")
+        spec = ADMIN_ACTIONS.get(action_type)
+        if spec is None:
+            return f"❌ Ação não reconhecida: {action_type}"
+        
+        missing = self._missing_permissions(spec, guild)
+        if missing:
+            return f"❌ Sem permissão para executar {action_type}: falta {', '.join(missing)}"
         
         try:
-            if action_type == "resposta":
-                return await self._handle_response(action, interaction)
-            
-            elif action_type == "criar_embed":
-                return await self._create_embed(action, interaction)
-            
-            elif action_type == "criar_canal":
-                return await self._create_channel(action, guild)
-            
-            elif action_type == "criar_cargo":
-                return await self._create_role(action, guild)
-            
-            elif action_type == "editar_canal":
-                return await self._edit_channel(action, guild)
-            
-            elif action_type == "deletar_canal":
-                return await self._delete_channel(action, guild)
-            
-            elif action_type == "editar_cargo":
-                return await self._edit_role(action, guild)
-            
-            elif action_type == "deletar_cargo":
-                return await self._delete_role(action, guild)
-            
-            elif action_type == "limpar_mensagens":
-                return await self._clear_messages(action, guild)
-            
-            elif action_type == "listar_cargos":
-                return await self._list_roles(action, guild, interaction)
-            
-            elif action_type == "listar_canais":
-                return await self._list_channels(action, guild, interaction)
-            
-            elif action_type == "listar_membros":
-                return await self._list_members(action, guild, interaction)
-            
-            elif action_type == "info_servidor":
-                return await self._server_info(action, guild, interaction)
-            
-            elif action_type == "banir_usuario":
-                return await self._ban_user(action, guild)
-            
-            elif action_type == "expulsar_usuario":
-                return await self._kick_user(action, guild)
-            
-            elif action_type == "dar_cargo":
-                return await self._give_role(action, guild)
-            
-            elif action_type == "remover_cargo":
-                return await self._remove_role(action, guild)
-            
-            # NOVAS FUNCIONALIDADES DE INFORMAÇÃO
-            elif action_type == "listar_bots":
-                return await self._list_bots(action, guild, interaction)
-            
-            elif action_type == "audit_log":
-                return await self._audit_log(action, guild, interaction)
-            
-            elif action_type == "listar_convites":
-                return await self._list_invites(action, guild, interaction)
-            
-            elif action_type == "top_usuarios":
-                return await self._top_users(action, guild, interaction)
-            
-            # FUNCIONALIDADES DE GERENCIAMENTO
-            elif action_type == "slowmode":
-                return await self._set_slowmode(action, guild)
-            
-            elif action_type == "bloquear_canal":
-                return await self._lock_channel(action, guild)
-            
-            elif action_type == "desbloquear_canal":
-                return await self._unlock_channel(action, guild)
-            
-            elif action_type == "criar_categoria":
-                return await self._create_category(action, guild)
-            
-            elif action_type == "mover_canal":
-                return await self._move_channel(action, guild)
-            
-            elif action_type == "duplicar_canal":
-                return await self._duplicate_channel(action, guild)
-            
-            elif action_type == "webhook_create":
-                return await self._create_webhook(action, guild)
-            
-            elif action_type == "backup_cargos":
-                return await self._backup_roles(action, guild, interaction)
-            
-            elif action_type == "restore_cargos":
-                return await self._restore_roles(action, guild)
-            
-            # FUNCIONALIDADES DE MODERAÇÃO
-            elif action_type == "timeout_usuario":
-                return await self._timeout_user(action, guild)
-            elif action_type == "remover_timeout":
-                return await self._remove_timeout(action, guild)
-            elif action_type == "add_reacao":
-                return await self._add_reaction(action, guild)
-            elif action_type == "pin_mensagem":
-                return await self._pin_message(action, guild)
-            elif action_type == "unpin_mensagem":
-                return await self._unpin_messages(action, guild)
-            elif action_type == "nick_usuario":
-                return await self._change_nickname(action, guild)
-            elif action_type == "reset_nicks":
-                return await self._reset_nicknames(action, guild)
-            
-            # NOVAS FUNCIONALIDADES BÁSICAS (10)
-            elif action_type == "enviar_dm":
-                return await self._send_dm(action, guild)
-            elif action_type == "anuncio_global":
-                return await self._global_announcement(action, guild, interaction)
-            elif action_type == "criar_poll":
-                return await self._create_poll(action, guild, interaction)
-            elif action_type == "auto_react":
-                return await self._auto_react_setup(action, guild)
-            elif action_type == "canal_temp":
-                return await self._create_temp_channel(action, guild)
-            
-            # NOVAS INFORMAÇÕES (15)
-            elif action_type == "stats_detalhadas":
-                return await self._detailed_stats(action, guild, interaction)
-            elif action_type == "historico_mensagens":
-                return await self._message_history(action, guild, interaction)
-            elif action_type == "member_info":
-                return await self._member_detailed_info(action, guild, interaction)
-            elif action_type == "canal_stats":
-                return await self._channel_stats(action, guild, interaction)
-            elif action_type == "emoji_stats":
-                return await self._emoji_stats(action, guild, interaction)
-            elif action_type == "boost_info":
-                return await self._boost_info(action, guild, interaction)
-            elif action_type == "permissions_check":
-                return await self._permissions_check(action, guild, interaction)
-            
-            # GERENCIAMENTO AVANÇADO (20)
-            elif action_type == "bulk_create_channels":
-                return await self._bulk_create_channels(action, guild)
-            elif action_type == "channel_template":
-                return await self._channel_template(action, guild)
-            elif action_type == "auto_archive":
-                return await self._auto_archive_threads(action, guild)
-            elif action_type == "mass_role_assign":
-                return await self._mass_role_assign(action, guild)
-            elif action_type == "server_template":
-                return await self._server_template(action, guild, interaction)
-            elif action_type == "channel_sync":
-                return await self._sync_channel_permissions(action, guild)
-            elif action_type == "role_hierarchy":
-                return await self._reorganize_roles(action, guild)
-            elif action_type == "bulk_permissions":
-                return await self._bulk_permissions(action, guild)
-            elif action_type == "server_backup":
-                return await self._complete_server_backup(action, guild, interaction)
-            elif action_type == "clone_server":
-                return await self._clone_server_structure(action, guild)
-            elif action_type == "mass_move":
-                return await self._mass_move_channels(action, guild)
-            
-            # MODERAÇÃO AVANÇADA (20)
-            elif action_type == "mass_ban":
-                return await self._mass_ban(action, guild)
-            elif action_type == "mass_kick":
-                return await self._mass_kick(action, guild)
-            elif action_type == "auto_mod":
-                return await self._setup_auto_moderation(action, guild)
-            elif action_type == "word_filter":
-                return await self._word_filter_setup(action, guild)
-            elif action_type == "spam_protection":
-                return await self._spam_protection(action, guild)
-            elif action_type == "raid_protection":
-                return await self._raid_protection(action, guild)
-            elif action_type == "auto_warn":
-                return await self._auto_warn_system(action, guild)
-            elif action_type == "mute_sistema":
-                return await self._mute_system(action, guild)
-            elif action_type == "captcha_verify":
-                return await self._captcha_verification(action, guild)
-            elif action_type == "anti_bot":
-                return await self._anti_bot_protection(action, guild)
-            elif action_type == "link_filter":
-                return await self._link_filter(action, guild)
-            elif action_type == "image_filter":
-                return await self._image_filter(action, guild)
-            elif action_type == "toxic_filter":
-                return await self._toxicity_filter(action, guild)
-            
-            # AUTOMAÇÃO (15)
-            elif action_type == "auto_role":
-                return await self._auto_role_system(action, guild)
-            elif action_type == "welcome_msg":
-                return await self._welcome_message(action, guild)
-            elif action_type == "goodbye_msg":
-                return await self._goodbye_message(action, guild)
-            elif action_type == "level_system":
-                return await self._level_system(action, guild)
-            elif action_type == "xp_rewards":
-                return await self._xp_rewards(action, guild)
-            elif action_type == "daily_backup":
-                return await self._daily_backup(action, guild)
-            elif action_type == "scheduled_msg":
-                return await self._scheduled_messages(action, guild)
-            elif action_type == "auto_clean":
-                return await self._auto_cleanup(action, guild)
-            elif action_type == "activity_monitor":
-                return await self._activity_monitor(action, guild)
-            elif action_type == "inactive_cleanup":
-                return await self._inactive_cleanup(action, guild)
-            elif action_type == "auto_promote":
-                return await self._auto_promotion(action, guild)
-            elif action_type == "event_scheduler":
-                return await self._event_scheduler(action, guild)
-            elif action_type == "reminder_system":
-                return await self._reminder_system(action, guild)
-            elif action_type == "auto_archive_old":
-                return await self._auto_archive_old(action, guild)
-            elif action_type == "smart_notifications":
-                return await self._smart_notifications(action, guild)
-            
-            # ENTRETENIMENTO (15)
-            elif action_type == "mini_games":
-                return await self._mini_games(action, guild, interaction)
-            elif action_type == "quiz_system":
-                return await self._quiz_system(action, guild, interaction)
-            elif action_type == "music_queue":
-                return await self._music_queue(action, guild)
-            elif action_type == "meme_generator":
-                return await self._meme_generator(action, guild, interaction)
-            elif action_type == "random_facts":
-                return await self._random_facts(action, guild, interaction)
-            elif action_type == "daily_quote":
-                return await self._daily_quote(action, guild, interaction)
-            elif action_type == "fortune_teller":
-                return await self._fortune_teller(action, guild, interaction)
-            elif action_type == "rock_paper":
-                return await self._rock_paper_scissors(action, guild, interaction)
-            elif action_type == "coin_flip":
-                return await self._coin_flip(action, guild, interaction)
-            elif action_type == "dice_roll":
-                return await self._dice_roll(action, guild, interaction)
-            elif action_type == "8ball":
-                return await self._magic_8ball(action, guild, interaction)
-            elif action_type == "trivia_game":
-                return await self._trivia_game(action, guild, interaction)
-            elif action_type == "word_game":
-                return await self._word_game(action, guild, interaction)
-            elif action_type == "emoji_game":
-                return await self._emoji_game(action, guild, interaction)
-            elif action_type == "riddle_game":
-                return await self._riddle_game(action, guild, interaction)
-            
-            else:
-                return f"❌ Ação não reconhecida: {action_type}"
+            if spec.needs_interaction:
+                return await spec.handler(self, action, guild, interaction)
+            return await spec.handler(self, action, guild)
                 
         except discord.Forbidden:
             return f"❌ Sem permissão para executar: {action_type}"
@@ -285,14 +49,39 @@ class AdminActionExecutor:
             logger.error(f"❌ Erro ao executar {action_type}: {e}")
             return f"❌ Erro interno ao executar: {action_type}"
     
-    async def _handle_response(self, action: Dict[str, Any], 
+    @staticmethod
+    def _missing_permissions(spec: ActionSpec, guild: discord.Guild) -> List[str]:
+        """Permissões exigidas pela ação que o bot não tem no servidor (evita a chamada que daria 403)"""
+        me = getattr(guild, "me", None)
+        if not spec.permissions or me is None:
+            return []
+        granted = me.guild_permissions
+        return [name for name in spec.permissions if not getattr(granted, name, False)]
+    
+    @staticmethod
+    def register_action(name: str, handler: ActionHandler, **metadata) -> ActionSpec:
+        """Registra uma ação extra em tempo de execução (ex.: por um cog); ver ActionRegistry.register"""
+        return ADMIN_ACTIONS.register(name, handler, **metadata)
+    
+    @staticmethod
+    def plan_cost(actions: List[Dict[str, Any]]) -> int:
+        """Estimativa de chamadas à API do Discord para executar o plano"""
+        total = 0
+        for action in actions:
+            spec = ADMIN_ACTIONS.get(action.get("action", "resposta"))
+            total += spec.api_cost if spec else 0
+        return total
+    
+    @ADMIN_ACTIONS.action("resposta", needs_interaction=True)
+    async def _handle_response(self, action: Dict[str, Any], guild: discord.Guild,
                               interaction: discord.Interaction) -> str:
         """Envia resposta simples"""
         response_text = action.get("resposta", "🤖 Sem resposta definida.")
         await interaction.followup.send(response_text)
         return "✅ Resposta enviada"
     
-    async def _create_embed(self, action: Dict[str, Any], 
+    @ADMIN_ACTIONS.action("criar_embed", needs_interaction=True)
+    async def _create_embed(self, action: Dict[str, Any], guild: discord.Guild,
                            interaction: discord.Interaction) -> str:
         """Cria e envia embed"""
         embed = discord.Embed(
@@ -312,6 +101,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Embed criado e enviado"
     
+    @ADMIN_ACTIONS.action("criar_canal", permissions=("manage_channels",))
     async def _create_channel(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Cria canal de texto"""
         name = action.get("nome", "novo-canal")
@@ -322,18 +112,20 @@ class AdminActionExecutor:
         channel = await guild.create_text_channel(name)
         return f"✅ Canal criado: {channel.mention}"
     
+    @ADMIN_ACTIONS.action("criar_cargo", permissions=("manage_roles",))
     async def _create_role(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Cria cargo/role"""
         name = action.get("nome", "Novo Cargo")
         role = await guild.create_role(name=name)
         return f"✅ Cargo criado: {role.name}"
     
+    @ADMIN_ACTIONS.action("editar_canal", permissions=("manage_channels",))
     async def _edit_channel(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Edita canal existente"""
         channel_name = action.get("nome", "")
         new_name = action.get("novo_nome", "")
         
-        channel = discord.utils.get(guild.channels, name=channel_name)
+        channel = self.names.channel(guild, channel_name, fuzzy=False)
         if not channel:
             return f"❌ Canal não encontrado: {channel_name}"
         
@@ -345,10 +137,11 @@ class AdminActionExecutor:
         
         return f"❌ Novo nome não especificado"
     
+    @ADMIN_ACTIONS.action("deletar_canal", permissions=("manage_channels",))
     async def _delete_channel(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Deleta canal"""
         channel_name = action.get("nome", "")
-        channel = discord.utils.get(guild.channels, name=channel_name)
+        channel = self.names.channel(guild, channel_name, fuzzy=False)
         
         if not channel:
             return f"❌ Canal não encontrado: {channel_name}"
@@ -356,12 +149,13 @@ class AdminActionExecutor:
         await channel.delete()
         return f"✅ Canal deletado: {channel_name}"
     
+    @ADMIN_ACTIONS.action("editar_cargo", permissions=("manage_roles",))
     async def _edit_role(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Edita cargo existente"""
         role_name = action.get("nome", "")
         new_name = action.get("novo_nome", "")
         
-        role = discord.utils.get(guild.roles, name=role_name)
+        role = self.names.role(guild, role_name, fuzzy=False)
         if not role:
             return f"❌ Cargo não encontrado: {role_name}"
         
@@ -371,10 +165,11 @@ class AdminActionExecutor:
         
         return f"❌ Novo nome não especificado"
     
+    @ADMIN_ACTIONS.action("deletar_cargo", permissions=("manage_roles",))
     async def _delete_role(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Deleta cargo"""
         role_name = action.get("nome", "")
-        role = discord.utils.get(guild.roles, name=role_name)
+        role = self.names.role(guild, role_name, fuzzy=False)
         
         if not role:
             return f"❌ Cargo não encontrado: {role_name}"
@@ -386,13 +181,14 @@ class AdminActionExecutor:
         await role.delete()
         return f"✅ Cargo deletado: {role_name}"
     
+    @ADMIN_ACTIONS.action("limpar_mensagens", permissions=("manage_messages", "read_message_history"), api_cost=2)
     async def _clear_messages(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Limpa mensagens de um canal"""
         channel_name = action.get("nome", "")
         todas_mensagens = action.get("todas_mensagens", False)
         limit = action.get("mensagens", 10)
         
-        channel = discord.utils.get(guild.channels, name=channel_name)
+        channel = self.names.channel(guild, channel_name, fuzzy=False)
         if not channel:
             return f"❌ Canal não encontrado: {channel_name}"
         
@@ -420,6 +216,7 @@ class AdminActionExecutor:
         except Exception as e:
             return f"❌ Erro ao deletar mensagens: {e}"
     
+    @ADMIN_ACTIONS.action("listar_cargos", needs_interaction=True)
     async def _list_roles(self, action: Dict[str, Any], guild: discord.Guild, 
                          interaction: discord.Interaction) -> str:
         """Lista todos os cargos do servidor"""
@@ -446,6 +243,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Lista de cargos enviada"
     
+    @ADMIN_ACTIONS.action("listar_canais", needs_interaction=True)
     async def _list_channels(self, action: Dict[str, Any], guild: discord.Guild,
                             interaction: discord.Interaction) -> str:
         """Lista todos os canais do servidor"""
@@ -489,6 +287,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Lista de canais enviada"
     
+    @ADMIN_ACTIONS.action("listar_membros", needs_interaction=True)
     async def _list_members(self, action: Dict[str, Any], guild: discord.Guild,
                            interaction: discord.Interaction) -> str:
         """Mostra estatísticas dos membros"""
@@ -510,6 +309,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Estatísticas de membros enviadas"
     
+    @ADMIN_ACTIONS.action("info_servidor", needs_interaction=True)
     async def _server_info(self, action: Dict[str, Any], guild: discord.Guild,
                           interaction: discord.Interaction) -> str:
         """Mostra informações do servidor"""
@@ -532,24 +332,29 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Informações do servidor enviadas"
     
+    @ADMIN_ACTIONS.action("banir_usuario", api_cost=0)
     async def _ban_user(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Banir usuário (funcionalidade administrativa sensível)"""
         return "❌ Comando de banimento desabilitado por segurança. Use os comandos nativos do Discord."
     
+    @ADMIN_ACTIONS.action("expulsar_usuario", api_cost=0)
     async def _kick_user(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Expulsar usuário (funcionalidade administrativa sensível)"""  
         return "❌ Comando de expulsão desabilitado por segurança. Use os comandos nativos do Discord."
     
+    @ADMIN_ACTIONS.action("dar_cargo", api_cost=0)
     async def _give_role(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Dar cargo a usuário (funcionalidade administrativa sensível)"""
         return "❌ Comando de dar cargo desabilitado por segurança. Use os comandos nativos do Discord."
     
+    @ADMIN_ACTIONS.action("remover_cargo", api_cost=0)
     async def _remove_role(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Remover cargo de usuário (funcionalidade administrativa sensível)"""
         return "❌ Comando de remover cargo desabilitado por segurança. Use os comandos nativos do Discord."
     
     # ========== NOVAS FUNCIONALIDADES DE INFORMAÇÃO ==========
     
+    @ADMIN_ACTIONS.action("listar_bots", needs_interaction=True)
     async def _list_bots(self, action: Dict[str, Any], guild: discord.Guild,
                         interaction: discord.Interaction) -> str:
         """Lista todos os bots do servidor"""
@@ -577,6 +382,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Lista de bots enviada"
     
+    @ADMIN_ACTIONS.action("audit_log", permissions=("view_audit_log",), needs_interaction=True, api_cost=2)
     async def _audit_log(self, action: Dict[str, Any], guild: discord.Guild,
                         interaction: discord.Interaction) -> str:
         """Mostra log de auditoria recente"""
@@ -597,6 +403,7 @@ class AdminActionExecutor:
         except discord.Forbidden:
             return "❌ Sem permissão para ver log de auditoria"
     
+    @ADMIN_ACTIONS.action("listar_convites", permissions=("manage_guild",), needs_interaction=True, api_cost=2)
     async def _list_invites(self, action: Dict[str, Any], guild: discord.Guild,
                            interaction: discord.Interaction) -> str:
         """Lista convites ativos do servidor"""
@@ -625,6 +432,7 @@ class AdminActionExecutor:
         except discord.Forbidden:
             return "❌ Sem permissão para ver convites"
     
+    @ADMIN_ACTIONS.action("top_usuarios", needs_interaction=True)
     async def _top_users(self, action: Dict[str, Any], guild: discord.Guild,
                         interaction: discord.Interaction) -> str:
         """Mostra usuários mais ativos (por cargo mais alto)"""
@@ -650,12 +458,13 @@ class AdminActionExecutor:
     
     # ========== FUNCIONALIDADES DE GERENCIAMENTO ==========
     
+    @ADMIN_ACTIONS.action("slowmode", permissions=("manage_channels",))
     async def _set_slowmode(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Ativar/desativar modo lento em canal"""
         channel_name = action.get("nome", "")
         delay = action.get("valor", 0)
         
-        channel = discord.utils.get(guild.channels, name=channel_name)
+        channel = self.names.channel(guild, channel_name, kind=discord.TextChannel, fuzzy=False)
         if not channel or not isinstance(channel, discord.TextChannel):
             return f"❌ Canal de texto não encontrado: {channel_name}"
         
@@ -668,11 +477,12 @@ class AdminActionExecutor:
         except discord.Forbidden:
             return f"❌ Sem permissão para editar {channel.mention}"
     
+    @ADMIN_ACTIONS.action("bloquear_canal", permissions=("manage_channels", "manage_roles"))
     async def _lock_channel(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Bloquear canal para @everyone"""
         channel_name = action.get("nome", "")
         
-        channel = discord.utils.get(guild.channels, name=channel_name)
+        channel = self.names.channel(guild, channel_name, kind=discord.TextChannel, fuzzy=False)
         if not channel or not isinstance(channel, discord.TextChannel):
             return f"❌ Canal de texto não encontrado: {channel_name}"
         
@@ -684,11 +494,12 @@ class AdminActionExecutor:
         except discord.Forbidden:
             return f"❌ Sem permissão para bloquear {channel.mention}"
     
+    @ADMIN_ACTIONS.action("desbloquear_canal", permissions=("manage_channels", "manage_roles"))
     async def _unlock_channel(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Desbloquear canal"""
         channel_name = action.get("nome", "")
         
-        channel = discord.utils.get(guild.channels, name=channel_name)
+        channel = self.names.channel(guild, channel_name, kind=discord.TextChannel, fuzzy=False)
         if not channel or not isinstance(channel, discord.TextChannel):
             return f"❌ Canal de texto não encontrado: {channel_name}"
         
@@ -700,6 +511,7 @@ class AdminActionExecutor:
         except discord.Forbidden:
             return f"❌ Sem permissão para desbloquear {channel.mention}"
     
+    @ADMIN_ACTIONS.action("criar_categoria", permissions=("manage_channels",))
     async def _create_category(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Criar categoria de canais"""
         name = action.get("nome", "Nova Categoria")
@@ -712,13 +524,14 @@ class AdminActionExecutor:
         except discord.HTTPException:
             return "❌ Erro ao criar categoria (limite atingido?)"
     
+    @ADMIN_ACTIONS.action("mover_canal", permissions=("manage_channels",))
     async def _move_channel(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Mover canal para categoria"""
         channel_name = action.get("nome", "")
         category_name = action.get("categoria", "")
         
-        channel = discord.utils.get(guild.channels, name=channel_name)
-        category = discord.utils.get(guild.categories, name=category_name)
+        channel = self.names.channel(guild, channel_name, fuzzy=False)
+        category = self.names.category(guild, category_name, fuzzy=False)
         
         if not channel:
             return f"❌ Canal não encontrado: {channel_name}"
@@ -731,11 +544,12 @@ class AdminActionExecutor:
         except discord.Forbidden:
             return "❌ Sem permissão para mover canal"
     
+    @ADMIN_ACTIONS.action("duplicar_canal", permissions=("manage_channels",))
     async def _duplicate_channel(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Duplicar canal existente"""
         channel_name = action.get("nome", "")
         
-        channel = discord.utils.get(guild.channels, name=channel_name)
+        channel = self.names.channel(guild, channel_name, kind=discord.TextChannel, fuzzy=False)
         if not channel or not isinstance(channel, discord.TextChannel):
             return f"❌ Canal de texto não encontrado: {channel_name}"
         
@@ -745,12 +559,13 @@ class AdminActionExecutor:
         except discord.Forbidden:
             return "❌ Sem permissão para duplicar canal"
     
+    @ADMIN_ACTIONS.action("webhook_create", permissions=("manage_webhooks",))
     async def _create_webhook(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Criar webhook em canal"""
         channel_name = action.get("nome", "")
         webhook_name = action.get("webhook_nome", "Bot Webhook")
         
-        channel = discord.utils.get(guild.channels, name=channel_name)
+        channel = self.names.channel(guild, channel_name, kind=discord.TextChannel, fuzzy=False)
         if not channel or not isinstance(channel, discord.TextChannel):
             return f"❌ Canal de texto não encontrado: {channel_name}"
         
@@ -760,6 +575,7 @@ class AdminActionExecutor:
         except discord.Forbidden:
             return f"❌ Sem permissão para criar webhook em {channel.mention}"
     
+    @ADMIN_ACTIONS.action("backup_cargos", needs_interaction=True)
     async def _backup_roles(self, action: Dict[str, Any], guild: discord.Guild,
                            interaction: discord.Interaction) -> str:
         """Fazer backup dos cargos do servidor"""
@@ -783,26 +599,30 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return f"✅ Backup de {len(roles_backup)} cargos criado"
     
+    @ADMIN_ACTIONS.action("restore_cargos", api_cost=0)
     async def _restore_roles(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Restaurar cargos do backup"""
         return "❌ Funcionalidade de restaurar cargos não implementada por segurança. Use backups manuais."
     
     # ========== FUNCIONALIDADES DE MODERAÇÃO ==========
     
+    @ADMIN_ACTIONS.action("timeout_usuario", api_cost=0)
     async def _timeout_user(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Dar timeout em usuário (funcionalidade sensível)"""
         return "❌ Comando de timeout desabilitado por segurança. Use os comandos nativos do Discord."
     
+    @ADMIN_ACTIONS.action("remover_timeout", api_cost=0)
     async def _remove_timeout(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Remover timeout de usuário (funcionalidade sensível)"""
         return "❌ Comando de remover timeout desabilitado por segurança. Use os comandos nativos do Discord."
     
+    @ADMIN_ACTIONS.action("add_reacao", permissions=("add_reactions", "read_message_history"), api_cost=2)
     async def _add_reaction(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Adicionar reação a última mensagem"""
         channel_name = action.get("nome", "")
         emoji = action.get("emoji", "👍")
         
-        channel = discord.utils.get(guild.channels, name=channel_name)
+        channel = self.names.channel(guild, channel_name, kind=discord.TextChannel, fuzzy=False)
         if not channel or not isinstance(channel, discord.TextChannel):
             return f"❌ Canal de texto não encontrado: {channel_name}"
         
@@ -818,11 +638,12 @@ class AdminActionExecutor:
         except discord.HTTPException:
             return f"❌ Emoji inválido ou erro ao adicionar reação"
     
+    @ADMIN_ACTIONS.action("pin_mensagem", permissions=("manage_messages", "read_message_history"), api_cost=2)
     async def _pin_message(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Fixar última mensagem de um canal"""
         channel_name = action.get("nome", "")
         
-        channel = discord.utils.get(guild.channels, name=channel_name)
+        channel = self.names.channel(guild, channel_name, kind=discord.TextChannel, fuzzy=False)
         if not channel or not isinstance(channel, discord.TextChannel):
             return f"❌ Canal de texto não encontrado: {channel_name}"
         
@@ -837,11 +658,12 @@ class AdminActionExecutor:
         except discord.HTTPException:
             return f"❌ Limite de mensagens fixadas atingido"
     
+    @ADMIN_ACTIONS.action("unpin_mensagem", permissions=("manage_messages",), api_cost=5)
     async def _unpin_messages(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Desfixar todas as mensagens de um canal"""
         channel_name = action.get("nome", "")
         
-        channel = discord.utils.get(guild.channels, name=channel_name)
+        channel = self.names.channel(guild, channel_name, kind=discord.TextChannel, fuzzy=False)
         if not channel or not isinstance(channel, discord.TextChannel):
             return f"❌ Canal de texto não encontrado: {channel_name}"
         
@@ -856,20 +678,24 @@ class AdminActionExecutor:
         except discord.Forbidden:
             return f"❌ Sem permissão para desfixar mensagens em {channel.mention}"
     
+    @ADMIN_ACTIONS.action("nick_usuario", api_cost=0)
     async def _change_nickname(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Alterar apelido de usuário (funcionalidade sensível)"""
         return "❌ Comando de alterar apelido desabilitado por segurança. Use os comandos nativos do Discord."
     
+    @ADMIN_ACTIONS.action("reset_nicks", api_cost=0)
     async def _reset_nicknames(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Resetar todos os apelidos (funcionalidade sensível)"""
         return "❌ Comando de resetar apelidos desabilitado por segurança. Use os comandos nativos do Discord."
     
     # ========== NOVAS FUNCIONALIDADES BÁSICAS (10) ==========
     
+    @ADMIN_ACTIONS.action("enviar_dm", api_cost=0)
     async def _send_dm(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Enviar mensagem privada (funcionalidade sensível)"""
         return "❌ Comando de DM desabilitado por segurança e privacidade."
     
+    @ADMIN_ACTIONS.action("anuncio_global", needs_interaction=True, api_cost=10)
     async def _global_announcement(self, action: Dict[str, Any], guild: discord.Guild,
                                   interaction: discord.Interaction) -> str:
         """Anúncio em todos os canais de texto"""
@@ -892,6 +718,7 @@ class AdminActionExecutor:
         
         return f"✅ Anúncio enviado para {count} canais"
     
+    @ADMIN_ACTIONS.action("criar_poll", needs_interaction=True, api_cost=4)
     async def _create_poll(self, action: Dict[str, Any], guild: discord.Guild,
                           interaction: discord.Interaction) -> str:
         """Criar enquete/votação"""
@@ -917,10 +744,12 @@ class AdminActionExecutor:
         
         return "✅ Enquete criada com reações"
     
+    @ADMIN_ACTIONS.action("auto_react", api_cost=0)
     async def _auto_react_setup(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Configurar auto reação (simulação)"""
         return "✅ Sistema de auto reação configurado (simulação ativa)"
     
+    @ADMIN_ACTIONS.action("canal_temp", permissions=("manage_channels",))
     async def _create_temp_channel(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Criar canal temporário"""
         nome = action.get("nome", "temp-channel")
@@ -936,6 +765,7 @@ class AdminActionExecutor:
     
     # ========== NOVAS INFORMAÇÕES (15) ==========
     
+    @ADMIN_ACTIONS.action("stats_detalhadas", needs_interaction=True)
     async def _detailed_stats(self, action: Dict[str, Any], guild: discord.Guild,
                              interaction: discord.Interaction) -> str:
         """Estatísticas detalhadas do servidor"""
@@ -973,11 +803,12 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Estatísticas detalhadas enviadas"
     
+    @ADMIN_ACTIONS.action("historico_mensagens", permissions=("read_message_history",), needs_interaction=True, api_cost=2)
     async def _message_history(self, action: Dict[str, Any], guild: discord.Guild,
                               interaction: discord.Interaction) -> str:
         """Histórico de mensagens do canal"""
         channel_name = action.get("nome", interaction.channel.name)
-        channel = discord.utils.get(guild.channels, name=channel_name)
+        channel = self.names.channel(guild, channel_name, kind=discord.TextChannel)
         
         if not channel or not isinstance(channel, discord.TextChannel):
             return f"❌ Canal não encontrado: {channel_name}"
@@ -998,16 +829,18 @@ class AdminActionExecutor:
         except discord.Forbidden:
             return f"❌ Sem permissão para ver histórico de {channel.mention}"
     
+    @ADMIN_ACTIONS.action("member_info", needs_interaction=True, api_cost=0)
     async def _member_detailed_info(self, action: Dict[str, Any], guild: discord.Guild,
                                    interaction: discord.Interaction) -> str:
         """Informações detalhadas de membro"""
         return "ℹ️ Use o comando nativo do Discord para ver perfil de membros com segurança."
     
+    @ADMIN_ACTIONS.action("canal_stats", needs_interaction=True)
     async def _channel_stats(self, action: Dict[str, Any], guild: discord.Guild,
                             interaction: discord.Interaction) -> str:
         """Estatísticas de canal específico"""
         channel_name = action.get("nome", interaction.channel.name)
-        channel = discord.utils.get(guild.channels, name=channel_name)
+        channel = self.names.channel(guild, channel_name)
         
         if not channel:
             return f"❌ Canal não encontrado: {channel_name}"
@@ -1029,6 +862,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Estatísticas do canal enviadas"
     
+    @ADMIN_ACTIONS.action("emoji_stats", needs_interaction=True)
     async def _emoji_stats(self, action: Dict[str, Any], guild: discord.Guild,
                           interaction: discord.Interaction) -> str:
         """Estatísticas de emojis do servidor"""
@@ -1065,6 +899,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Estatísticas de emojis enviadas"
     
+    @ADMIN_ACTIONS.action("boost_info", needs_interaction=True)
     async def _boost_info(self, action: Dict[str, Any], guild: discord.Guild,
                          interaction: discord.Interaction) -> str:
         """Informações de boost do servidor"""
@@ -1102,6 +937,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Informações de boost enviadas"
     
+    @ADMIN_ACTIONS.action("permissions_check", needs_interaction=True)
     async def _permissions_check(self, action: Dict[str, Any], guild: discord.Guild,
                                 interaction: discord.Interaction) -> str:
         """Verificar permissões do bot"""
@@ -1138,6 +974,7 @@ class AdminActionExecutor:
     
     # ========== GERENCIAMENTO AVANÇADO (20) ==========
     
+    @ADMIN_ACTIONS.action("bulk_create_channels", permissions=("manage_channels",), api_cost=5)
     async def _bulk_create_channels(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Criar múltiplos canais"""
         base_name = action.get("nome", "canal")
@@ -1153,18 +990,22 @@ class AdminActionExecutor:
         
         return f"✅ {created} canais criados com base '{base_name}'"
     
+    @ADMIN_ACTIONS.action("channel_template", api_cost=0)
     async def _channel_template(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Aplicar template de canal (simulação)"""
         return "✅ Template de canal configurado (simulação)"
     
+    @ADMIN_ACTIONS.action("auto_archive", api_cost=0)
     async def _auto_archive_threads(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Auto arquivar threads antigas"""
         return "✅ Sistema de auto arquivamento de threads ativado"
     
+    @ADMIN_ACTIONS.action("mass_role_assign", api_cost=0)
     async def _mass_role_assign(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Atribuir cargo em massa (funcionalidade sensível)"""
         return "❌ Atribuição em massa desabilitada por segurança"
     
+    @ADMIN_ACTIONS.action("server_template", permissions=("manage_guild",), needs_interaction=True, api_cost=2)
     async def _server_template(self, action: Dict[str, Any], guild: discord.Guild,
                               interaction: discord.Interaction) -> str:
         """Template do servidor"""
@@ -1176,18 +1017,22 @@ class AdminActionExecutor:
         except discord.HTTPException:
             return "❌ Já existe um template ou erro ao criar"
     
+    @ADMIN_ACTIONS.action("channel_sync", api_cost=0)
     async def _sync_channel_permissions(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Sincronizar permissões de canal"""
         return "✅ Permissões de canais sincronizadas"
     
+    @ADMIN_ACTIONS.action("role_hierarchy", api_cost=0)
     async def _reorganize_roles(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Reorganizar hierarquia de cargos (funcionalidade sensível)"""
         return "❌ Reorganização de hierarquia desabilitada por segurança"
     
+    @ADMIN_ACTIONS.action("bulk_permissions", api_cost=0)
     async def _bulk_permissions(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Permissões em massa (funcionalidade sensível)"""
         return "❌ Permissões em massa desabilitadas por segurança"
     
+    @ADMIN_ACTIONS.action("server_backup", needs_interaction=True)
     async def _complete_server_backup(self, action: Dict[str, Any], guild: discord.Guild,
                                      interaction: discord.Interaction) -> str:
         """Backup completo do servidor"""
@@ -1201,132 +1046,163 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Backup completo criado (demonstração)"
     
+    @ADMIN_ACTIONS.action("clone_server", api_cost=0)
     async def _clone_server_structure(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Clonar estrutura do servidor (funcionalidade sensível)"""
         return "❌ Clonagem de servidor desabilitada por segurança"
     
+    @ADMIN_ACTIONS.action("mass_move", api_cost=0)
     async def _mass_move_channels(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Mover canais em massa"""
         return "✅ Sistema de movimentação em massa configurado"
     
     # ========== MODERAÇÃO AVANÇADA (20) ==========
     
+    @ADMIN_ACTIONS.action("mass_ban", api_cost=0)
     async def _mass_ban(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Ban em massa (funcionalidade sensível)"""
         return "❌ Ban em massa desabilitado por segurança"
     
+    @ADMIN_ACTIONS.action("mass_kick", api_cost=0)
     async def _mass_kick(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Kick em massa (funcionalidade sensível)"""
         return "❌ Kick em massa desabilitado por segurança"
     
+    @ADMIN_ACTIONS.action("auto_mod", api_cost=0)
     async def _setup_auto_moderation(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Configurar auto moderação"""
         return "✅ Sistema de auto moderação ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("word_filter", api_cost=0)
     async def _word_filter_setup(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Configurar filtro de palavras"""
         return "✅ Filtro de palavras ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("spam_protection", api_cost=0)
     async def _spam_protection(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Proteção anti-spam"""
         return "✅ Proteção anti-spam ativada (simulação)"
     
+    @ADMIN_ACTIONS.action("raid_protection", api_cost=0)
     async def _raid_protection(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Proteção anti-raid"""
         return "✅ Proteção anti-raid ativada (simulação)"
     
+    @ADMIN_ACTIONS.action("auto_warn", api_cost=0)
     async def _auto_warn_system(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Sistema de avisos automáticos"""
         return "✅ Sistema de warnings ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("mute_sistema", api_cost=0)
     async def _mute_system(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Sistema de mute"""
         return "✅ Sistema de mute configurado (simulação)"
     
+    @ADMIN_ACTIONS.action("captcha_verify", api_cost=0)
     async def _captcha_verification(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Verificação captcha"""
         return "✅ Sistema de captcha ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("anti_bot", api_cost=0)
     async def _anti_bot_protection(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Proteção anti-bot"""
         return "✅ Proteção anti-bot ativada (simulação)"
     
+    @ADMIN_ACTIONS.action("link_filter", api_cost=0)
     async def _link_filter(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Filtro de links"""
         return "✅ Filtro de links ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("image_filter", api_cost=0)
     async def _image_filter(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Filtro de imagens"""
         return "✅ Filtro de imagens ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("toxic_filter", api_cost=0)
     async def _toxicity_filter(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Filtro de toxicidade"""
         return "✅ Filtro de toxicidade ativado (simulação)"
     
     # ========== AUTOMAÇÃO (15) ==========
     
+    @ADMIN_ACTIONS.action("auto_role", api_cost=0)
     async def _auto_role_system(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Sistema de auto cargo na entrada"""
         return "✅ Sistema de auto cargo ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("welcome_msg", api_cost=0)
     async def _welcome_message(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Configurar mensagem de boas vindas"""
         return "✅ Mensagem de boas vindas configurada (simulação)"
     
+    @ADMIN_ACTIONS.action("goodbye_msg", api_cost=0)
     async def _goodbye_message(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Configurar mensagem de saída"""
         return "✅ Mensagem de despedida configurada (simulação)"
     
+    @ADMIN_ACTIONS.action("level_system", api_cost=0)
     async def _level_system(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Sistema de níveis"""
         return "✅ Sistema de níveis ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("xp_rewards", api_cost=0)
     async def _xp_rewards(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Recompensas de XP"""
         return "✅ Sistema de recompensas XP ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("daily_backup", api_cost=0)
     async def _daily_backup(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Backup diário automático"""
         return "✅ Backup diário agendado (simulação)"
     
+    @ADMIN_ACTIONS.action("scheduled_msg", api_cost=0)
     async def _scheduled_messages(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Mensagens agendadas"""
         return "✅ Sistema de mensagens agendadas ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("auto_clean", api_cost=0)
     async def _auto_cleanup(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Limpeza automática"""
         return "✅ Limpeza automática configurada (simulação)"
     
+    @ADMIN_ACTIONS.action("activity_monitor", api_cost=0)
     async def _activity_monitor(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Monitor de atividade"""
         return "✅ Monitor de atividade ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("inactive_cleanup", api_cost=0)
     async def _inactive_cleanup(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Limpeza de membros inativos"""
         return "✅ Limpeza de inativos configurada (simulação)"
     
+    @ADMIN_ACTIONS.action("auto_promote", api_cost=0)
     async def _auto_promotion(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Promoção automática"""
         return "✅ Sistema de promoção automática ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("event_scheduler", api_cost=0)
     async def _event_scheduler(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Agendador de eventos"""
         return "✅ Agendador de eventos configurado (simulação)"
     
+    @ADMIN_ACTIONS.action("reminder_system", api_cost=0)
     async def _reminder_system(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Sistema de lembretes"""
         return "✅ Sistema de lembretes ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("auto_archive_old", api_cost=0)
     async def _auto_archive_old(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Auto arquivar mensagens antigas"""
         return "✅ Auto arquivamento ativado (simulação)"
     
+    @ADMIN_ACTIONS.action("smart_notifications", api_cost=0)
     async def _smart_notifications(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Notificações inteligentes"""
         return "✅ Notificações inteligentes ativadas (simulação)"
     
     # ========== ENTRETENIMENTO (15) ==========
     
+    @ADMIN_ACTIONS.action("mini_games", needs_interaction=True)
     async def _mini_games(self, action: Dict[str, Any], guild: discord.Guild,
                          interaction: discord.Interaction) -> str:
         """Mini jogos"""
@@ -1342,6 +1218,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Mini jogo iniciado"
     
+    @ADMIN_ACTIONS.action("quiz_system", needs_interaction=True)
     async def _quiz_system(self, action: Dict[str, Any], guild: discord.Guild,
                           interaction: discord.Interaction) -> str:
         """Sistema de quiz"""
@@ -1361,10 +1238,12 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Quiz iniciado"
     
+    @ADMIN_ACTIONS.action("music_queue", api_cost=0)
     async def _music_queue(self, action: Dict[str, Any], guild: discord.Guild) -> str:
         """Fila de música (simulação)"""
         return "✅ Sistema de fila de música configurado (simulação)"
     
+    @ADMIN_ACTIONS.action("meme_generator", needs_interaction=True)
     async def _meme_generator(self, action: Dict[str, Any], guild: discord.Guild,
                              interaction: discord.Interaction) -> str:
         """Gerador de memes"""
@@ -1385,6 +1264,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Meme gerado"
     
+    @ADMIN_ACTIONS.action("random_facts", needs_interaction=True)
     async def _random_facts(self, action: Dict[str, Any], guild: discord.Guild,
                            interaction: discord.Interaction) -> str:
         """Fatos aleatórios"""
@@ -1406,6 +1286,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Fato aleatório enviado"
     
+    @ADMIN_ACTIONS.action("daily_quote", needs_interaction=True)
     async def _daily_quote(self, action: Dict[str, Any], guild: discord.Guild,
                           interaction: discord.Interaction) -> str:
         """Frase do dia"""
@@ -1426,6 +1307,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Frase inspiradora enviada"
     
+    @ADMIN_ACTIONS.action("fortune_teller", needs_interaction=True)
     async def _fortune_teller(self, action: Dict[str, Any], guild: discord.Guild,
                              interaction: discord.Interaction) -> str:
         """Adivinhação"""
@@ -1447,6 +1329,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Predição revelada"
     
+    @ADMIN_ACTIONS.action("rock_paper", needs_interaction=True, api_cost=4)
     async def _rock_paper_scissors(self, action: Dict[str, Any], guild: discord.Guild,
                                   interaction: discord.Interaction) -> str:
         """Pedra, papel, tesoura"""
@@ -1469,6 +1352,7 @@ class AdminActionExecutor:
         
         return "✅ Jogo de pedra, papel, tesoura iniciado"
     
+    @ADMIN_ACTIONS.action("coin_flip", needs_interaction=True)
     async def _coin_flip(self, action: Dict[str, Any], guild: discord.Guild,
                         interaction: discord.Interaction) -> str:
         """Cara ou coroa"""
@@ -1484,6 +1368,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return f"✅ Moeda lançada: {result}"
     
+    @ADMIN_ACTIONS.action("dice_roll", needs_interaction=True)
     async def _dice_roll(self, action: Dict[str, Any], guild: discord.Guild,
                         interaction: discord.Interaction) -> str:
         """Rolar dados"""
@@ -1507,6 +1392,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return f"✅ Dados rolados: {total}"
     
+    @ADMIN_ACTIONS.action("8ball", needs_interaction=True)
     async def _magic_8ball(self, action: Dict[str, Any], guild: discord.Guild,
                           interaction: discord.Interaction) -> str:
         """Bola mágica 8"""
@@ -1531,11 +1417,13 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Bola mágica consultada"
     
+    @ADMIN_ACTIONS.action("trivia_game", needs_interaction=True)
     async def _trivia_game(self, action: Dict[str, Any], guild: discord.Guild,
                           interaction: discord.Interaction) -> str:
         """Jogo de trivia"""
         return await self._quiz_system(action, guild, interaction)
     
+    @ADMIN_ACTIONS.action("word_game", needs_interaction=True)
     async def _word_game(self, action: Dict[str, Any], guild: discord.Guild,
                         interaction: discord.Interaction) -> str:
         """Jogo de palavras"""
@@ -1552,6 +1440,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Jogo de palavras iniciado"
     
+    @ADMIN_ACTIONS.action("emoji_game", needs_interaction=True)
     async def _emoji_game(self, action: Dict[str, Any], guild: discord.Guild,
                          interaction: discord.Interaction) -> str:
         """Jogo de emoji"""
@@ -1573,6 +1462,7 @@ class AdminActionExecutor:
         await interaction.followup.send(embed=embed)
         return "✅ Jogo de emoji iniciado"
     
+    @ADMIN_ACTIONS.action("riddle_game", needs_interaction=True)
     async def _riddle_game(self, action: Dict[str, Any], guild: discord.Guild,
                           interaction: discord.Interaction) -> str:
         """Jogo de charadas"""
@@ -0,0 +1,185 @@
+"""
+Roteador local de intenções para frases administrativas comuns
+"""
+import re
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Slots convertidos para inteiro antes de montar a ação
+INT_SLOTS = {"valor", "mensagens"}
+
+# Referência a canal: "#geral" ou "geral"
+CHANNEL = r"#?(?P<nome>[\w-]+)"
+
+# Nome de categoria/cargo: uma palavra ou um nome entre aspas ("Jogos Online");
+# qualquer coisa depois do nome (cor, permissões...) fica para o LLM
+NAME = r"(?:[\"“](?P<nome_aspas>[^\"”]+)[\"”]|(?P<nome>[\w-]+))"
+
+# Slot alternativo -> slot da ação
+SLOT_ALIASES = {"nome_aspas": "nome"}
+
+_POLITE_PREFIX = re.compile(r"^(?:(?:por\s+favor|pode|poderia|bot|skgpt)[\s,]+)+", re.IGNORECASE)
+_POLITE_SUFFIX = re.compile(r"[\s,]*(?:por\s+favor)?[\s.!?]*$", re.IGNORECASE)
+
+@dataclass
+class IntentRule:
+    """Regra de intenção: padrão regex e ação produzida"""
+    action: str
+    pattern: Pattern[str]
+    defaults: Dict[str, Any] = field(default_factory=dict)
+    needs_channel: bool = False
+    # Altera ou apaga dados: só vale se a frase inteira casar com o padrão
+    mutating: bool = False
+
+def _rule(action: str, pattern: str, needs_channel: bool = False, mutating: bool = False,
+          **defaults) -> IntentRule:
+    """Compila uma regra (sem diferenciar maiúsculas)"""
+    return IntentRule(action, re.compile(pattern, re.IGNORECASE), defaults, needs_channel, mutating)
+
+RULES: List[IntentRule] = [
+    # ENTRETENIMENTO
+    _rule("coin_flip", r"(?:cara\s+ou\s+coroa|(?:jogar|lan[cç]ar|girar)\s+(?:uma\s+)?moeda)"),
+    _rule("dice_roll", r"(?:rolar|jogar|lan[cç]ar)\s+(?:(?P<valor>\d+)\s+)?dados?"),
+    _rule("8ball", r"bola\s+(?:m[aá]gica|8)"),
+    _rule("rock_paper", r"(?:jogar\s+)?pedra,?\s+papel,?\s+(?:e\s+)?tesoura"),
+    _rule("random_facts", r"(?:me\s+(?:conte|diga)\s+)?(?:um\s+)?(?:fatos?\s+aleat[oó]rios?|curiosidade)"),
+    _rule("daily_quote", r"frase\s+do\s+dia"),
+    _rule("riddle_game", r"(?:me\s+(?:conte|d[eê])\s+)?(?:uma\s+)?charada"),
+    _rule("word_game", r"jogo\s+de\s+palavras"),
+    _rule("emoji_game", r"jogo\s+de\s+emojis?"),
+    _rule("trivia_game", r"(?:jogo\s+de\s+)?(?:trivia|quiz)"),
+
+    # INFORMAÇÕES
+    _rule("info_servidor", r"(?:info(?:rma[cç](?:[aã]o|[oõ]es))?|dados)\s+do\s+servidor"),
+    _rule("listar_cargos", r"(?:listar|lista|mostrar|ver)\s+(?:todos\s+)?(?:os\s+)?cargos"),
+    _rule("listar_canais", r"(?:listar|lista|mostrar|ver)\s+(?:todos\s+)?(?:os\s+)?canais"),
+    _rule("listar_bots", r"(?:listar|lista|mostrar|ver)\s+(?:todos\s+)?(?:os\s+)?bots"),
+    _rule("listar_membros", r"(?:listar|lista|mostrar|ver)\s+(?:todos\s+)?(?:os\s+)?membros"),
+    _rule("listar_convites", r"(?:listar|lista|mostrar|ver)\s+(?:todos\s+)?(?:os\s+)?convites"),
+    _rule("boost_info", r"(?:info(?:rma[cç](?:[aã]o|[oõ]es))?\s+(?:de\s+|do\s+)?)?boosts?(?:\s+do\s+servidor)?"),
+    _rule("emoji_stats", r"(?:estat[ií]sticas|stats)\s+(?:de|dos)\s+emojis?"),
+    _rule("stats_detalhadas", r"(?:estat[ií]sticas|stats)(?:\s+detalhadas)?(?:\s+do\s+servidor)?"),
+
+    # GERENCIAMENTO / MODERAÇÃO
+    _rule("limpar_mensagens",
+          r"(?:limpar|apagar|deletar)\s+(?:as\s+)?(?P<mensagens>\d+)\s+(?:[uú]ltimas\s+)?mensagens?"
+          r"(?:\s+(?:em|no|do|de|na)\s+" + CHANNEL + r")?",
+          needs_channel=True, mutating=True),
+    _rule("limpar_mensagens",
+          r"(?:limpar|apagar|deletar)\s+todas\s+(?:as\s+)?mensagens"
+          r"(?:\s+(?:em|no|do|de|na)\s+" + CHANNEL + r")?",
+          needs_channel=True, mutating=True, todas_mensagens=True),
+    _rule("criar_canal",
+          r"criar\s+(?:um\s+)?canal(?:\s+de\s+texto)?\s+(?:chamado\s+|com\s+(?:o\s+)?nome\s+)?#?(?P<nome>[\w-]+)",
+          mutating=True),
+    _rule("criar_categoria",
+          r"criar\s+(?:uma\s+)?categoria\s+(?:chamada\s+|com\s+(?:o\s+)?nome\s+)?" + NAME, mutating=True),
+    _rule("criar_cargo",
+          r"criar\s+(?:um\s+)?cargo\s+(?:chamado\s+|com\s+(?:o\s+)?nome\s+)?" + NAME, mutating=True),
+    _rule("slowmode",
+          r"(?:ativar\s+)?(?:slowmode|modo\s+lento)\s+(?:de\s+)?(?P<valor>\d+)\s*(?:s|seg|segundos)?"
+          r"(?:\s+(?:em|no|na)\s+" + CHANNEL + r")?",
+          needs_channel=True, mutating=True),
+    _rule("bloquear_canal", r"(?:bloquear|trancar)\s+(?:o\s+)?canal(?:\s+" + CHANNEL + r")?",
+          needs_channel=True, mutating=True),
+    _rule("desbloquear_canal", r"(?:desbloquear|destrancar)\s+(?:o\s+)?canal(?:\s+" + CHANNEL + r")?",
+          needs_channel=True, mutating=True),
+]
+
+class IntentRouter:
+    """Mapeia frases comuns direto para ações, sem passar pelo LLM"""
+
+    def __init__(self, threshold: float = 0.75, rules: Optional[List[IntentRule]] = None):
+        self.threshold = threshold
+        self.rules = rules if rules is not None else RULES
+        self.total = 0
+        self.routed = 0
+        self.routed_by_action: Counter = Counter()
+        logger.info(f"✅ Roteador de intenções inicializado ({len(self.rules)} regras)")
+
+    @staticmethod
+    def _clean(message: str) -> str:
+        """Remove cortesias e pontuação das pontas"""
+        text = _POLITE_PREFIX.sub("", message.strip())
+        return _POLITE_SUFFIX.sub("", text)
+
+    def _match(self, text: str) -> Tuple[float, Optional[IntentRule], Optional[re.Match]]:
+        """Encontra a regra de maior confiança para o texto"""
+        best: Tuple[float, Optional[IntentRule], Optional[re.Match]] = (0.0, None, None)
+        if not text:
+            return best
+
+        for rule in self.rules:
+            match = rule.pattern.fullmatch(text)
+            if match:
+                return 1.0, rule, match
+
+            # Ações que alteram o servidor não são adivinhadas a partir de parte da frase
+            if rule.mutating:
+                continue
+
+            match = rule.pattern.search(text)
+            if match:
+                # Confiança proporcional à parte da frase explicada pela regra
+                confidence = (match.end() - match.start()) / len(text)
+                if confidence > best[0]:
+                    best = (confidence, rule, match)
+
+        return best
+
+    def route(self, message: str, channel_name: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Retorna a lista de ações se a frase for reconhecida com confiança, senão None
+        """
+        self.total += 1
+        if self.total % 100 == 0:
+            logger.info(f"📊 Roteador local: {self.routed}/{self.total} mensagens sem LLM "
+                        f"({self.routed / self.total:.0%})")
+
+        confidence, rule, match = self._match(self._clean(message))
+
+        if rule is None or confidence < self.threshold:
+            return None
+
+        action: Dict[str, Any] = {"action": rule.action, **rule.defaults}
+        for slot, value in match.groupdict().items():
+            if value is None:
+                continue
+            slot = SLOT_ALIASES.get(slot, slot)
+            action[slot] = int(value) if slot in INT_SLOTS else value.strip()
+
+        if rule.needs_channel and "nome" not in action:
+            if not channel_name:
+                return None
+            action["nome"] = channel_name
+
+        self.routed += 1
+        self.routed_by_action[rule.action] += 1
+        logger.info(f"⚡ Intenção local: {rule.action} (confiança {confidence:.2f})")
+        return [action]
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de quanto tráfego evitou o LLM"""
+        return {
+            "total": self.total,
+            "routed": self.routed,
+            "fallback_llm": self.total - self.routed,
+            "skip_ratio": self.routed / self.total if self.total else 0.0,
+            "by_action": dict(self.routed_by_action)
+        }
+
+    def export_metrics(self) -> str:
+        """Mensagens resolvidas localmente e enviadas ao LLM no formato texto do Prometheus"""
+        lines = [
+            "# TYPE skzgpt_intent_router_messages_total counter",
+            f'skzgpt_intent_router_messages_total{{route="local"}} {self.routed}',
+            f'skzgpt_intent_router_messages_total{{route="llm"}} {self.total - self.routed}',
+            "# TYPE skzgpt_intent_router_actions_total counter",
+        ]
+        lines.extend(f'skzgpt_intent_router_actions_total{{action="{action}"}} {count}'
+                     for action, count in sorted(self.routed_by_action.items()))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,225 @@
+"""
+Execução de planos com várias ações: independentes em paralelo, dependentes em ordem
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import discord
+
+from bot.utils.action_registry import ActionRegistry
+
+logger = logging.getLogger(__name__)
+
+# Recurso tocado por uma ação: (tipo, nome normalizado); nome "*" = todos do tipo
+Resource = Tuple[str, str]
+
+# Tocado por ações de efeito desconhecido: conflita com tudo
+EVERYTHING: Resource = ("*", "*")
+# Mensagens no canal do comando saem na ordem do plano
+INTERACTION: Resource = ("interacao", "")
+
+ALL_CHANNELS: Resource = ("canal", "*")
+ALL_CATEGORIES: Resource = ("categoria", "*")
+ALL_ROLES: Resource = ("cargo", "*")
+
+# Ações que só tocam um canal pelo nome
+_CHANNEL_TARGETED = {
+    "deletar_canal", "limpar_mensagens", "slowmode", "bloquear_canal", "desbloquear_canal",
+    "webhook_create", "add_reacao", "pin_mensagem", "unpin_mensagem",
+}
+# Ações que leem ou alteram a estrutura inteira de um tipo
+_WHOLE_STRUCTURE = {
+    "listar_canais": {ALL_CHANNELS, ALL_CATEGORIES},
+    "listar_cargos": {ALL_ROLES},
+    "backup_cargos": {ALL_ROLES},
+    "info_servidor": {ALL_CHANNELS, ALL_ROLES},
+    "stats_detalhadas": {ALL_CHANNELS, ALL_CATEGORIES, ALL_ROLES},
+    "server_backup": {ALL_CHANNELS, ALL_CATEGORIES, ALL_ROLES},
+    "server_template": {ALL_CHANNELS, ALL_CATEGORIES, ALL_ROLES},
+    "anuncio_global": {ALL_CHANNELS},
+    "bulk_create_channels": {ALL_CHANNELS},
+    "mass_role_assign": {ALL_ROLES},
+    "dar_cargo": {ALL_ROLES},
+    "remover_cargo": {ALL_ROLES},
+}
+
+def _channel_name(value: Any) -> str:
+    """Nome de canal como o Discord (e _create_channel) o grava"""
+    name = str(value or "").lower().replace(" ", "-")
+    return "".join(c for c in name if c.isalnum() or c in "-_")
+
+def _plain_name(value: Any) -> str:
+    return " ".join(str(value or "").casefold().split())
+
+def action_footprint(action: Dict[str, Any], needs_interaction: bool, api_cost: int) -> Tuple[FrozenSet[Resource], str]:
+    """
+    Recursos que a ação toca e a rota da API do Discord que ela usa
+
+    Duas ações com recursos em comum executam na ordem do plano; a rota agrupa ações
+    que caem no mesmo bucket de rate limit do Discord
+    """
+    action_type = action.get("action", "resposta")
+    resources = set()
+    route = "servidor"
+
+    if action_type in ("criar_canal", "canal_temp", "duplicar_canal"):
+        name = _channel_name(action.get("nome"))
+        if action_type == "canal_temp":
+            name = f"{name}-temp"
+        elif action_type == "duplicar_canal":
+            resources.add(("canal", name))
+            name = f"{name}-copia"
+        resources.add(("canal", name))
+        route = "criar_canais"
+    elif action_type == "criar_categoria":
+        resources.add(("categoria", _plain_name(action.get("nome"))))
+        route = "criar_canais"
+    elif action_type == "editar_canal":
+        resources.update({("canal", _channel_name(action.get("nome"))),
+                          ("canal", _channel_name(action.get("novo_nome")))})
+        route = f"canal:{_channel_name(action.get('nome'))}"
+    elif action_type == "mover_canal":
+        resources.update({("canal", _channel_name(action.get("nome"))),
+                          ("categoria", _plain_name(action.get("categoria")))})
+        route = f"canal:{_channel_name(action.get('nome'))}"
+    elif action_type in _CHANNEL_TARGETED:
+        name = _channel_name(action.get("nome"))
+        resources.add(("canal", name))
+        route = f"canal:{name}"
+    elif action_type in ("historico_mensagens", "canal_stats"):
+        # Sem nome, vale o canal do comando (desconhecido aqui)
+        name = _channel_name(action.get("nome"))
+        resources.add(("canal", name) if name else ALL_CHANNELS)
+        route = f"canal:{name}"
+    elif action_type in ("criar_cargo", "editar_cargo", "deletar_cargo"):
+        resources.add(("cargo", _plain_name(action.get("nome"))))
+        if action.get("novo_nome"):
+            resources.add(("cargo", _plain_name(action.get("novo_nome"))))
+        route = "cargos"
+    elif action_type in _WHOLE_STRUCTURE:
+        resources.update(_WHOLE_STRUCTURE[action_type])
+    elif api_cost and not needs_interaction:
+        # Efeito no servidor que não sabemos delimitar: executa sozinha
+        resources.add(EVERYTHING)
+
+    if needs_interaction:
+        resources.add(INTERACTION)
+        if route == "servidor":
+            route = "interacao"
+    return frozenset(resources), route
+
+def conflicts(first: FrozenSet[Resource], second: FrozenSet[Resource]) -> bool:
+    """Há recurso em comum (com "*" valendo para todos do tipo)?"""
+    if not first or not second:
+        return False
+    if EVERYTHING in first or EVERYTHING in second:
+        return True
+    for kind, name in first:
+        for other_kind, other_name in second:
+            if kind == other_kind and (name == other_name or "*" in (name, other_name)):
+                return True
+    return False
+
+class PlanExecutor:
+    """
+    Executa as ações de um plano conforme chegam, em paralelo limitado
+
+    Cada ação espera só as anteriores que tocam os mesmos recursos; as demais começam
+    de imediato, até max_concurrency ao mesmo tempo e route_concurrency por rota do
+    Discord. Os resultados voltam na ordem do plano.
+    """
+
+    def __init__(self, registry: ActionRegistry, max_concurrency: int = 4, route_concurrency: int = 2):
+        self.registry = registry
+        self.max_concurrency = max(1, max_concurrency)
+        self.route_concurrency = max(1, route_concurrency)
+        self.plans = 0
+        self.parallel_actions = 0
+        logger.info(f"✅ Execução paralela de planos ativa ({self.max_concurrency} ações, "
+                    f"{self.route_concurrency} por rota)")
+
+    async def run(self, actions: AsyncIterator[Dict[str, Any]], execute: Callable[[Dict[str, Any]], Awaitable[str]],
+                  reject: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None) -> List[str]:
+        """
+        Executa o plano e retorna os resultados na ordem das ações
+
+        reject(ação) devolve o texto de recusa de uma ação que não deve executar. Uma ação
+        que falha vira uma linha "❌" e não interrompe as outras. Se a execução for
+        cancelada, as ações em curso terminam e as pendentes não começam.
+        """
+        self.plans += 1
+        limit = asyncio.Semaphore(self.max_concurrency)
+        routes: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self.route_concurrency))
+        scheduled: List[Tuple[FrozenSet[Resource], "asyncio.Future"]] = []
+        started = set()
+        running = 0
+
+        async def run_action(index: int, action: Dict[str, Any], route: str, dependencies: List["asyncio.Future"]) -> str:
+            nonlocal running
+            if dependencies:
+                await asyncio.wait(dependencies)
+            async with routes[route], limit:
+                started.add(index)
+                running += 1
+                if running > 1:
+                    self.parallel_actions += 1
+                try:
+                    return await execute(action)
+                except discord.NotFound as e:
+                    logger.warning(f"⚠️ {action.get('action')}: objeto não encontrado ({e})")
+                    return f"❌ Não encontrado ao executar: {action.get('action')}"
+                except Exception as e:
+                    logger.error(f"❌ Erro ao executar {action.get('action')}: {e}")
+                    return f"❌ Erro interno ao executar: {action.get('action')}"
+                finally:
+                    running -= 1
+
+        try:
+            async for action in actions:
+                refusal = reject(action) if reject else None
+                if refusal is not None:
+                    scheduled.append((frozenset(), self._done(refusal)))
+                    continue
+
+                spec = self.registry.get(action.get("action", "resposta"))
+                if spec is None:
+                    resources, route = frozenset(), "servidor"
+                else:
+                    resources, route = action_footprint(action, spec.needs_interaction, spec.api_cost)
+                dependencies = [task for previous, task in scheduled if conflicts(previous, resources)]
+                task = asyncio.ensure_future(run_action(len(scheduled), action, route, dependencies))
+                scheduled.append((resources, task))
+
+            if scheduled:
+                await asyncio.wait([task for _, task in scheduled])
+        except asyncio.CancelledError:
+            # As que já começaram seguem até o fim; as que ainda esperam são descartadas
+            for index, (_, task) in enumerate(scheduled):
+                if index not in started:
+                    task.cancel()
+            raise
+
+        return [self._result(task) for _, task in scheduled]
+
+    @staticmethod
+    def _result(task: "asyncio.Future") -> str:
+        """Resultado de uma ação; uma falha vira linha de erro sem derrubar as demais"""
+        if task.cancelled():
+            return "❌ Ação cancelada"
+        error = task.exception()
+        if error is not None:
+            logger.error(f"❌ Erro ao executar ação do plano: {error}")
+            return "❌ Erro interno ao executar ação"
+        return task.result()
+
+    @staticmethod
+    def _done(result: str) -> "asyncio.Future":
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(result)
+        return future
+
+    def stats(self) -> Dict[str, int]:
+        """Planos executados e ações que rodaram junto com outras"""
+        return {"plans": self.plans, "parallel_actions": self.parallel_actions}
@@ -0,0 +1,67 @@
+"""
+Renderização progressiva de respostas em streaming
+"""
+import time
+import logging
+import discord
+from typing import AsyncIterator, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Webhooks de interação aceitam ~5 edições a cada 5 segundos
+DEFAULT_EDIT_INTERVAL = 1.2
+
+# Exibido quando o stream termina sem nenhum texto
+EMPTY_RESPONSE = "❌ Não recebi resposta da IA. Tente novamente."
+
+class StreamingRenderer:
+    """Acumula tokens e atualiza a mensagem em uma cadência limitada"""
+
+    def __init__(self, render: Callable[[str, bool], Awaitable[None]],
+                 edit_interval: float = DEFAULT_EDIT_INTERVAL, max_length: int = 4000):
+        """
+        render(texto, final) envia ou edita a mensagem com o texto acumulado
+        """
+        self.render = render
+        self.edit_interval = edit_interval
+        self.max_length = max_length
+        self.text = ""
+        self._last_render = 0.0
+        self._rendered_text = ""
+
+    def _visible_text(self, final: bool) -> str:
+        """Texto exibido, truncado e com cursor enquanto não terminou"""
+        text = self.text
+        if final and not text.strip():
+            return EMPTY_RESPONSE
+        if len(text) > self.max_length:
+            text = text[:self.max_length - 3] + "..."
+        return text if final else text + " ▌"
+
+    async def _flush(self, final: bool):
+        """Envia o texto atual se houver algo novo (a renderização final sempre sai, tirando o placeholder)"""
+        visible = self._visible_text(final)
+        if visible == self._rendered_text and not final:
+            return
+
+        try:
+            await self.render(visible, final)
+            self._rendered_text = visible
+        except discord.HTTPException as e:
+            # Edição perdida (rate limit ou mensagem expirada); a próxima tentativa repõe o texto
+            logger.warning(f"⚠️ Falha ao atualizar mensagem em streaming: {e}")
+        self._last_render = time.monotonic()
+
+    async def consume(self, tokens: AsyncIterator[str]) -> str:
+        """
+        Consome o stream de tokens e retorna o texto completo
+        """
+        async for token in tokens:
+            self.text += token
+
+            # Primeira renderização imediata, depois respeitando o intervalo
+            if not self._last_render or time.monotonic() - self._last_render >= self.edit_interval:
+                await self._flush(final=False)
+
+        await self._flush(final=True)
+        return self.text
\ No newline at end of file
@@ -23,6 +23,7 @@ async def main():
     """Função principal do bot"""
     setup_logging()
     logger = logging.getLogger(__name__)
+    bot = None
     
     try:
         # Carrega a configuração
@@ -39,6 +40,8 @@ async def main():
     except Exception as e:
         logger.error(f"❌ Erro fatal: {e}")
     finally:
+        if bot:
+            await bot.close()
         logger.info("🛑 Bot finalizado")
 
 if __name__ == "__main__":
@@ -0,0 +1,7 @@
+"""
+Configuração do pytest: permite importar o pacote bot a partir da raiz do repositório
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,36 @@
+"""
+Testes do classificador local de categorias admin
+"""
+from bot.utils.action_catalog import build_admin_prompt, classify_category
+
+def test_single_category_is_scoped():
+    assert classify_category("mostre os dados do servidor") == "INFORMAÇÕES"
+    assert classify_category("me mostra as informações do servidor") == "INFORMAÇÕES"
+    assert classify_category("ativar slowmode de 5s no geral") == "GERENCIAMENTO"
+    assert classify_category("cara ou coroa") == "ENTRETENIMENTO"
+
+def test_keywords_match_whole_words_only():
+    # "dm" dentro de "admin" não é pedido de mensagem privada
+    assert classify_category("dar o cargo admin para o joao") != "BÁSICO"
+    # "xp" dentro de "expulsar" não é automação
+    assert classify_category("quero expulsar o joao") == "MODERAÇÃO"
+    # "ban" dentro de "banco" não é moderação
+    assert classify_category("abrir conta no banco") is None
+
+def test_several_categories_send_the_full_catalog():
+    assert classify_category("criar canal jogos e timeout no joao por 10 minutos") is None
+
+def test_no_signal_returns_none():
+    assert classify_category("bom dia") is None
+
+def test_creating_several_object_types_sends_the_full_catalog():
+    assert classify_category("criar categoria Jogos com 3 canais") is None
+    assert classify_category("cria um cargo VIP e um canal vip") is None
+    assert classify_category("criar categoria Jogos") == "GERENCIAMENTO"
+
+def test_scoped_prompt_keeps_basic_creation_actions():
+    prompt = build_admin_prompt("GERENCIAMENTO")
+    for action in ("resposta", "criar_canal", "criar_cargo", "criar_categoria"):
+        assert f'"{action}"' in prompt
+    assert '"timeout_usuario"' not in prompt
+    assert build_admin_prompt("BÁSICO").count('"criar_canal"') == 1
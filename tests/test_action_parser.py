@@ -0,0 +1,40 @@
+"""
+Testes do parser incremental de ações
+"""
+from bot.services.action_parser import ActionStreamParser, parse_actions
+
+def _feed_in_chunks(text: str, size: int = 3):
+    parser = ActionStreamParser()
+    streamed = []
+    for start in range(0, len(text), size):
+        streamed.extend(parser.feed(text[start:start + size]))
+    return streamed, parser.close()
+
+def test_top_level_list_is_emitted_per_object():
+    streamed, rest = _feed_in_chunks('[{"action": "criar_canal", "nome": "a"}, {"action": "coin_flip"}]')
+    assert streamed == [{"action": "criar_canal", "nome": "a"}, {"action": "coin_flip"}]
+    assert rest == []
+
+def test_arrays_inside_listed_objects_stay_in_the_object():
+    text = '[{"action": "bulk_create_channels", "canais": [{"nome": "a"}, {"nome": "b"}]}]'
+    streamed, rest = _feed_in_chunks(text)
+    assert streamed == [{"action": "bulk_create_channels", "canais": [{"nome": "a"}, {"nome": "b"}]}]
+    assert rest == []
+
+def test_single_object_with_array_param_is_returned_whole():
+    text = '{"action":"bulk_create_channels","canais":[{"nome":"a"}]}'
+    streamed, rest = _feed_in_chunks(text)
+    assert streamed == []
+    assert rest == [{"action": "bulk_create_channels", "canais": [{"nome": "a"}]}]
+
+def test_json_mode_wrapper_is_decoded_on_close():
+    assert parse_actions('{"actions": [{"action": "coin_flip"}, {"action": "dice_roll", "valor": 2}]}') == [
+        {"action": "coin_flip"}, {"action": "dice_roll", "valor": 2}
+    ]
+
+def test_brackets_inside_strings_are_ignored():
+    streamed, _ = _feed_in_chunks('[{"action": "resposta", "resposta": "use [x] ou {y}"}]')
+    assert streamed == [{"action": "resposta", "resposta": "use [x] ou {y}"}]
+
+def test_plain_text_becomes_a_chat_reply():
+    assert parse_actions("Olá! Como posso ajudar?") == [{"action": "resposta", "resposta": "Olá! Como posso ajudar?"}]
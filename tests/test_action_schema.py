@@ -0,0 +1,52 @@
+"""
+Testes da validação do plano admin
+"""
+from bot.utils.action_registry import ActionRegistry
+from bot.utils.action_schema import Param, validate_plan
+
+async def _handler(executor, action, guild):
+    return "✅"
+
+def test_fields_are_converted_and_clamped():
+    plan, errors = validate_plan([
+        {"action": "slowmode", "nome": "geral", "valor": "30"},
+        {"action": "dice_roll", "valor": 10},
+        {"action": "criar_embed", "cor": "#abc", "titulo": "Oi"},
+    ])
+    assert errors == []
+    assert plan == [
+        {"action": "slowmode", "nome": "geral", "valor": 30},
+        {"action": "dice_roll", "valor": 6},
+        {"action": "criar_embed", "cor": "AABBCC", "titulo": "Oi"},
+    ]
+
+def test_errors_cite_position_and_action():
+    _, errors = validate_plan([
+        {"action": "resposta", "resposta": "ok"},
+        {"action": "slowmode", "valor": "rápido"},
+        {"action": "inexistente"},
+    ])
+    assert errors == [
+        'ação 2 (slowmode): "nome" é obrigatório',
+        'ação 2 (slowmode): "valor" deve ser um número inteiro',
+        "ação 3: tipo desconhecido 'inexistente'",
+    ]
+
+def test_actions_without_schema_keep_their_fields():
+    plan, errors = validate_plan([{"action": "mass_ban", "motivo": "spam"}])
+    assert errors == []
+    assert plan == [{"action": "mass_ban", "motivo": "spam"}]
+
+def test_registry_keeps_validators_in_sync():
+    registry = ActionRegistry()
+    registry.register("acao_de_teste", _handler)
+    assert validate_plan([{"action": "acao_de_teste", "extra": 1}]) == ([{"action": "acao_de_teste", "extra": 1}], [])
+
+    registry.register("acao_de_teste", _handler, params={"valor": Param("inteiro", required=True)})
+    assert validate_plan([{"action": "acao_de_teste", "valor": "2", "extra": 1}]) == (
+        [{"action": "acao_de_teste", "valor": 2}], []
+    )
+
+    registry.unregister("acao_de_teste")
+    _, errors = validate_plan([{"action": "acao_de_teste"}])
+    assert errors == ["ação 1: tipo desconhecido 'acao_de_teste'"]
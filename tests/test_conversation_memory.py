@@ -0,0 +1,34 @@
+"""
+Testes da ConversationMemory
+"""
+import asyncio
+
+from bot.services.conversation_memory import ConversationMemory
+
+async def _summarize_while_appending():
+    calls = []
+    release = asyncio.Event()
+
+    async def summarizer(summary, turns):
+        calls.append([turn["content"] for turn in turns])
+        if len(calls) == 1:
+            await release.wait()
+        return " | ".join(filter(None, [summary] + [turn["content"] for turn in turns]))
+
+    memory = ConversationMemory(max_turns=2, summarizer=summarizer)
+    key = (1, 10)
+    memory.append(key, "p1", "r1")
+    memory.append(key, "p2", "r2")
+    await asyncio.sleep(0)
+    # Resumo de p1/r1 em andamento; p2/r2 saem do buffer enquanto ele espera
+    memory.append(key, "p3", "r3")
+    release.set()
+    for _ in range(5):
+        await asyncio.sleep(0)
+    return calls, memory.history(key)
+
+def test_turns_removed_during_summarization_are_summarized_afterwards():
+    calls, history = asyncio.run(_summarize_while_appending())
+    assert calls == [["p1", "r1"], ["p2", "r2"]]
+    assert history[0] == {"role": "system", "content": "Resumo da conversa até aqui: p1 | r1 | p2 | r2"}
+    assert [turn["content"] for turn in history[1:]] == ["p3", "r3"]
@@ -0,0 +1,49 @@
+"""
+Testes dos perfis de geração
+"""
+import asyncio
+
+from benchmarks.mock_groq_server import MockGroqServer, parse_distribution
+from bot.services.generation_profiles import BASELINE, PROFILES, GenerationProfiles
+from bot.services.groq_service import TRUNCATED_NOTICE, GroqService
+from bot.services.request_context import RequestContext
+
+def test_admin_plans_are_not_capped_below_the_baseline():
+    for name, profile in PROFILES.items():
+        if name.startswith("admin"):
+            assert profile.max_tokens >= BASELINE.max_tokens, name
+
+def test_long_chat_fits_the_rendered_embed():
+    # ~4 caracteres por token; o StreamingRenderer corta em 4000 caracteres
+    assert PROFILES["chat_longo"].max_tokens * 4 <= 4000
+
+def test_admin_profile_by_category():
+    profiles = GenerationProfiles()
+    assert profiles.for_admin("MODERAÇÃO") == "admin:MODERAÇÃO"
+    assert profiles.for_admin(None) == "admin"
+    assert profiles.for_admin("DESCONHECIDA") == "admin"
+
+def test_short_profile_is_chosen_by_intent_not_length():
+    profiles = GenerationProfiles()
+    assert profiles.for_chat("oi, tudo bem?") == "chat_curto"
+    assert profiles.for_chat("Bom dia galera!!") == "chat_curto"
+    assert profiles.for_chat("Qual a história do Brasil?") == "chat"
+    assert profiles.for_chat("explique recursão") == "chat_longo"
+
+async def _truncated_replies():
+    server = MockGroqServer(ttft=parse_distribution("fixed:0"), token_rate=10000.0)
+    url = await server.start(port=0)
+    service = GroqService("chave", base_url=url, profiles=GenerationProfiles())
+    try:
+        context = RequestContext(guild_id=1, user_id=10)
+        reply = await service.chat_completion("oi", context=context, max_tokens=10)
+        parts = [part async for part in service.stream_completion("olá", context=context, max_tokens=10)]
+        return reply, parts
+    finally:
+        await service.close()
+        await server.stop()
+
+def test_truncated_chat_replies_tell_the_user():
+    reply, parts = asyncio.run(_truncated_replies())
+    assert reply.endswith(TRUNCATED_NOTICE)
+    assert parts[-1] == TRUNCATED_NOTICE
@@ -0,0 +1,67 @@
+"""
+Testes do índice de prefixos do autocomplete de GIFs
+"""
+import asyncio
+
+from bot.services.gif_suggestions import GifSuggestions, PrefixTrie, normalize_term
+
+def test_normalize_term():
+    assert normalize_term("  Ação   Feliz ") == "acao feliz"
+
+def test_complete_orders_by_weight_and_ignores_accents():
+    trie = PrefixTrie()
+    trie.add("gato", 1.0)
+    trie.add("gatinho", 3.0)
+    trie.add("Gato Dançando", 2.0)
+    trie.add("cachorro", 5.0)
+    assert trie.complete("GAT") == ["gatinho", "Gato Dançando", "gato"]
+    assert trie.complete("gato danc") == ["Gato Dançando"]
+    assert trie.complete("x") == []
+    assert trie.complete("gat", limit=1) == ["gatinho"]
+
+def test_repeated_term_adds_weight():
+    trie = PrefixTrie()
+    trie.add("gato", 1.0)
+    trie.add("gatinho", 1.5)
+    trie.add("Gato", 1.0)
+    assert len(trie) == 2
+    assert trie.complete("gat") == ["gato", "gatinho"]
+
+def test_full_index_evicts_only_for_heavier_terms():
+    trie = PrefixTrie(max_terms=2)
+    trie.add("a1", 1.0)
+    trie.add("a2", 2.0)
+    trie.add("a3", 0.5)
+    assert sorted(trie.complete("a")) == ["a1", "a2"]
+    trie.add("a4", 3.0)
+    assert trie.complete("a") == ["a4", "a2"]
+
+def test_remove():
+    trie = PrefixTrie()
+    trie.add("gato", 1.0)
+    trie.remove("gato")
+    trie.remove("inexistente")
+    assert len(trie) == 0
+    assert trie.complete("ga") == []
+
+class _FakeGifService:
+    def __init__(self):
+        self.prefixes = []
+
+    async def autocomplete_terms(self, prefix):
+        self.prefixes.append(prefix)
+        return [f"{prefix} engraçado"]
+
+def test_short_results_fetch_the_prefix_once():
+    async def scenario():
+        service = _FakeGifService()
+        suggestions = GifSuggestions(service)
+        assert suggestions.complete("Gato") == []
+        assert suggestions.complete("gato") == []
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return service, suggestions
+
+    service, suggestions = asyncio.run(scenario())
+    assert service.prefixes == ["gato"]
+    assert suggestions.trie.complete("gato") == ["gato engraçado"]
@@ -0,0 +1,59 @@
+"""
+Testes do agrupamento de requisições no GroqService
+"""
+import asyncio
+import contextlib
+
+from bot.services.groq_service import GroqService
+from bot.services.request_context import RequestContext
+from bot.services.response_cache import ResponseCache
+
+class _RecordingScheduler:
+    """Escalonador falso que anota de quem é cada vaga"""
+
+    def __init__(self):
+        self.slots = []
+
+    @contextlib.asynccontextmanager
+    async def slot(self, context):
+        self.slots.append(context.user_id)
+        yield
+
+def _service(**kwargs):
+    service = GroqService("chave", scheduler=_RecordingScheduler(), **kwargs)
+    calls = []
+
+    async def complete(message, system_prompt, context, *args, **options):
+        calls.append(context.user_id)
+        await asyncio.sleep(0.01)
+        return "resposta"
+
+    service._complete = complete
+    return service, calls
+
+def test_coalesced_requests_take_a_slot_per_user():
+    service, calls = _service()
+
+    async def scenario():
+        return await asyncio.gather(*(
+            service.chat_completion("olá", context=RequestContext(guild_id=1, user_id=user))
+            for user in (10, 20, 30)
+        ))
+
+    assert asyncio.run(scenario()) == ["resposta"] * 3
+    assert len(calls) == 1
+    assert sorted(service.scheduler.slots) == [10, 20, 30]
+
+def test_cache_opt_out_is_part_of_the_flight_key():
+    service, calls = _service(cache=ResponseCache(disabled_guilds=[2]))
+
+    async def scenario():
+        return await asyncio.gather(
+            service.chat_completion("olá", context=RequestContext(guild_id=1, user_id=10)),
+            service.chat_completion("olá", context=RequestContext(guild_id=2, user_id=20)),
+            service.chat_completion("olá", context=RequestContext(guild_id=3, user_id=30)),
+        )
+
+    asyncio.run(scenario())
+    # Os servidores 1 e 3 compartilham a chamada; o 2 desativou o cache e chama sozinho
+    assert sorted(calls) in ([10, 20], [20, 30])
@@ -0,0 +1,46 @@
+"""
+Testes do índice de nomes dos servidores
+"""
+from types import SimpleNamespace
+
+from bot.services.guild_index import GuildNameIndex, fold_name
+
+class _Guild:
+    """Servidor falso com só o que o índice lê"""
+
+    def __init__(self, *channel_names):
+        self.id = 1
+        self.channels = [SimpleNamespace(id=index, name=name, guild=self)
+                         for index, name in enumerate(channel_names, 1)]
+        self.roles = []
+        self.members = []
+
+    def get_channel(self, channel_id):
+        return next((channel for channel in self.channels if channel.id == channel_id), None)
+
+def test_fold_name():
+    assert fold_name("#Bate Papo") == "bate-papo"
+    assert fold_name("anúncios_gerais") == "anuncios-gerais"
+
+def test_exact_and_folded_lookups():
+    guild = _Guild("geral", "bate-papo")
+    index = GuildNameIndex()
+    assert index.channel(guild, "geral").id == 1
+    assert index.channel(guild, "#Bate Papo").id == 2
+
+def test_fuzzy_only_when_allowed():
+    guild = _Guild("anuncios")
+    index = GuildNameIndex()
+    assert index.channel(guild, "anuncio", fuzzy=False) is None
+    assert index.channel(guild, "anuncio").name == "anuncios"
+    assert index.stats()["fuzzy_hits"] == 1
+
+def test_stale_hit_rebuilds_the_table():
+    guild = _Guild("geral")
+    index = GuildNameIndex()
+    assert index.channel(guild, "geral") is not None
+    # Renomeado sem o evento chegar: o acerto vencido reconstrói o servidor
+    guild.channels[0].name = "principal"
+    assert index.channel(guild, "geral", fuzzy=False) is None
+    assert index.stats()["rebuilds"] == 1
+    assert index.channel(guild, "principal", fuzzy=False).id == 1
@@ -0,0 +1,93 @@
+"""
+Testes das requisições de reserva (Hedger)
+"""
+import asyncio
+
+import pytest
+
+from bot.services.hedging import Hedger
+
+class _Outcomes:
+    """Anota o que o Hedger informa sobre as tentativas que não foram retornadas"""
+
+    def __init__(self):
+        self.recorded = []
+        self.released = []
+
+    def record(self, model, latency, ok):
+        self.recorded.append((model, ok))
+
+    def release(self, model):
+        self.released.append(model)
+
+def _race(attempt, hedge_model="reserva"):
+    hedger = Hedger(default_delay=0.01, min_delay=0.0)
+    outcomes = _Outcomes()
+    result = asyncio.run(hedger.race("principal", attempt, "complete", hedge_model,
+                                     record=outcomes.record, release=outcomes.release))
+    return hedger, outcomes, result
+
+def test_cancelled_loser_is_released():
+    async def attempt(model):
+        await asyncio.sleep(3600 if model == "principal" else 0.01)
+        return model
+
+    hedger, outcomes, result = _race(attempt)
+    assert result == ("reserva", "reserva")
+    assert outcomes.released == ["principal"]
+    assert outcomes.recorded == []
+    assert hedger.hedge_wins == 1
+
+def test_failed_loser_is_recorded():
+    async def attempt(model):
+        if model == "principal":
+            await asyncio.sleep(0.02)
+            raise RuntimeError("falhou")
+        await asyncio.sleep(0.05)
+        return model
+
+    _, outcomes, result = _race(attempt)
+    assert result == ("reserva", "reserva")
+    assert outcomes.recorded == [("principal", False)]
+    assert outcomes.released == []
+
+def test_every_finished_attempt_is_sampled():
+    discarded = []
+
+    async def scenario():
+        hedger = Hedger(default_delay=0.01, min_delay=0.0)
+        outcomes = _Outcomes()
+        ready = asyncio.Event()
+
+        async def attempt(model):
+            if model == "reserva":
+                asyncio.get_running_loop().call_later(0.01, ready.set)
+            await ready.wait()
+            return model
+
+        async def discard(result):
+            discarded.append(result)
+
+        result = await hedger.race("principal", attempt, "complete", "reserva", discard,
+                                   record=outcomes.record, release=outcomes.release)
+        return hedger, outcomes, result
+
+    hedger, outcomes, (result, winner) = asyncio.run(scenario())
+    loser = "reserva" if winner == "principal" else "principal"
+    assert discarded == [loser]
+    assert outcomes.recorded == [(loser, True)]
+    assert len(hedger._samples[("principal", "complete")]) == 1
+    assert len(hedger._samples[("reserva", "complete")]) == 1
+
+def test_all_failed_reports_only_the_hedge():
+    async def attempt(model):
+        await asyncio.sleep(0.02)
+        raise RuntimeError(model)
+
+    hedger = Hedger(default_delay=0.01, min_delay=0.0)
+    outcomes = _Outcomes()
+    with pytest.raises(RuntimeError):
+        asyncio.run(hedger.race("principal", attempt, "complete", "reserva",
+                                record=outcomes.record, release=outcomes.release))
+    # A falha do modelo pedido fica com quem chama
+    assert outcomes.recorded == [("reserva", False)]
@@ -0,0 +1,56 @@
+"""
+Testes do roteador local de intenções
+"""
+import pytest
+
+from bot.utils.intent_router import IntentRouter
+
+@pytest.fixture
+def router():
+    return IntentRouter()
+
+@pytest.mark.parametrize("message, expected", [
+    ("cara ou coroa", {"action": "coin_flip"}),
+    ("rolar 3 dados", {"action": "dice_roll", "valor": 3}),
+    ("por favor, criar canal #anuncios!", {"action": "criar_canal", "nome": "anuncios"}),
+    ("criar cargo VIP", {"action": "criar_cargo", "nome": "VIP"}),
+    ('criar categoria "Jogos Online"', {"action": "criar_categoria", "nome": "Jogos Online"}),
+    ("limpar 10 mensagens no #geral", {"action": "limpar_mensagens", "mensagens": 10, "nome": "geral"}),
+    ("slowmode de 5 segundos", {"action": "slowmode", "valor": 5, "nome": "chat"}),
+])
+def test_routes_common_phrases(router, message, expected):
+    assert router.route(message, channel_name="chat") == [expected]
+
+@pytest.mark.parametrize("message", [
+    # Modificadores depois do nome precisam do LLM
+    "criar cargo Admin com permissão de administrador",
+    "criar um cargo chamado VIP com a cor vermelha",
+    "criar categoria Jogos com 3 canais de voz",
+    # Ações que alteram dados não casam com parte da frase
+    "limpar 10 mensagens do usuario joao",
+    "criar canal jogos e timeout no joao por 10 minutos",
+    "bloquear o canal geral até amanhã às 10h",
+])
+def test_mutating_phrases_with_extra_text_fall_back_to_llm(router, message):
+    assert router.route(message, channel_name="chat") is None
+
+def test_channel_defaults_to_current_channel(router):
+    assert router.route("bloquear canal", channel_name="geral") == [{"action": "bloquear_canal", "nome": "geral"}]
+    assert router.route("bloquear canal") is None
+
+def test_read_only_intents_accept_partial_matches(router):
+    assert router.route("me conte uma charada legal") == [{"action": "riddle_game"}]
+
+def test_stats_count_routed_messages(router):
+    router.route("cara ou coroa")
+    router.route("explique a teoria da relatividade")
+    stats = router.stats()
+    assert (stats["total"], stats["routed"], stats["by_action"]) == (2, 1, {"coin_flip": 1})
+
+def test_metrics_count_local_routes_and_fallbacks(router):
+    router.route("cara ou coroa")
+    router.route("explique a história do servidor")
+    text = router.export_metrics()
+    assert 'skzgpt_intent_router_messages_total{route="local"} 1' in text
+    assert 'skzgpt_intent_router_messages_total{route="llm"} 1' in text
+    assert 'skzgpt_intent_router_actions_total{action="coin_flip"} 1' in text
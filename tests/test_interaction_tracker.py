@@ -0,0 +1,29 @@
+"""
+Testes do InteractionTracker
+"""
+import asyncio
+
+from bot.services.interaction_tracker import SUPERSEDED, InteractionTracker
+from bot.services.request_context import RequestContext
+
+def _context(command: str) -> RequestContext:
+    return RequestContext(guild_id=1, user_id=10, channel_id=100, command=command)
+
+async def _run_pair(first: str, second: str):
+    tracker = InteractionTracker()
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(0.05)
+
+    older = asyncio.ensure_future(tracker.run(_context(first), slow()))
+    await started.wait()
+    newer = await tracker.run(_context(second), asyncio.sleep(0))
+    return await older, newer
+
+def test_repeated_command_supersedes_the_previous_one():
+    assert asyncio.run(_run_pair("chat", "chat")) == (SUPERSEDED, None)
+
+def test_other_command_in_the_same_channel_does_not_supersede():
+    assert asyncio.run(_run_pair("skgpt", "chat")) == (None, None)
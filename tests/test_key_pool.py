@@ -0,0 +1,43 @@
+"""
+Testes do KeyPool
+"""
+import httpx
+from groq import AuthenticationError, RateLimitError
+
+from bot.services.key_pool import KeyPool
+
+def _error(cls, status: int):
+    request = httpx.Request("POST", "http://groq.test/openai/v1/chat/completions")
+    return cls("erro", response=httpx.Response(status, request=request), body=None)
+
+def _pool(count: int = 2) -> KeyPool:
+    return KeyPool([(f"chave-{i}", object()) for i in range(count)], hard_limit_seconds=60.0)
+
+def test_hard_rate_limit_blocks_only_that_model():
+    pool = _pool()
+    key = pool.keys[0]
+    assert not pool.record_error(key, "llama-3.3-70b-versatile", _error(RateLimitError, 429), retry_after=600.0)
+    assert not key.is_quarantined()
+    assert key.budget("llama-3.3-70b-versatile").wait_time(0) > 500
+    assert key.budget("llama-3.1-8b-instant").wait_time(0) == 0
+    chosen, wait = pool.choose("llama-3.3-70b-versatile", 0)
+    assert chosen is pool.keys[1] and wait == 0
+
+def test_auth_quarantine_grows_and_spares_the_last_active_key():
+    pool = _pool()
+    first, second = pool.keys
+    assert pool.record_error(first, "m", _error(AuthenticationError, 401))
+    short = first.quarantined_until
+    assert not pool.record_error(second, "m", _error(AuthenticationError, 401))
+    assert not second.is_quarantined()
+
+    first.quarantined_until = 0.0
+    assert pool.record_error(first, "m", _error(AuthenticationError, 401))
+    assert first.quarantined_until - short > 25
+
+def test_success_records_actual_tokens():
+    pool = _pool(1)
+    key = pool.keys[0]
+    pool.record_success(key, "m", {}, 42)
+    pool.record_tokens(key, 8)
+    assert key.tokens == 50
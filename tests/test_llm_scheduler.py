@@ -0,0 +1,45 @@
+"""
+Testes do LLMScheduler
+"""
+import asyncio
+
+import pytest
+
+from bot.services.llm_scheduler import LLMScheduler, QueueFullError
+from bot.services.request_context import RequestContext
+
+def _context(user_id: int, positions=None) -> RequestContext:
+    async def on_queued(position: int):
+        if positions is not None:
+            positions.append(position)
+
+    return RequestContext(guild_id=1, user_id=user_id, on_queued=on_queued)
+
+async def _cancelled_waiters_leave_the_queue():
+    scheduler = LLMScheduler(global_limit=1, guild_limit=1, max_guild_queue=2, user_rate_per_minute=0)
+    running = _context(1)
+    await scheduler.acquire(running)
+
+    waiters = [asyncio.ensure_future(scheduler.acquire(_context(user))) for user in (2, 3)]
+    await asyncio.sleep(0)
+    with pytest.raises(QueueFullError):
+        await scheduler.acquire(_context(4))
+
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    queued_after_cancel = scheduler._queued
+
+    positions = []
+    late = asyncio.ensure_future(scheduler.acquire(_context(5, positions)))
+    await asyncio.sleep(0)
+    scheduler.release(running)
+    await late
+    scheduler.release(_context(5))
+    return queued_after_cancel, positions, scheduler._guilds
+
+def test_cancelled_waiters_free_queue_slots_and_positions():
+    queued, positions, guilds = asyncio.run(_cancelled_waiters_leave_the_queue())
+    assert queued == 0
+    assert positions == [1]
+    assert guilds == {}
@@ -0,0 +1,57 @@
+"""
+Testes do disjuntor do ModelRouter
+"""
+import asyncio
+
+from bot.services.groq_service import GroqService
+from bot.services.model_router import ModelRouter
+from bot.services.request_context import RequestContext
+
+def _open_router() -> ModelRouter:
+    router = ModelRouter("grande", "pequeno", failure_streak=1, cooldown=0, tiering=False)
+    router.record("grande", 0.1, False)
+    assert not router.is_healthy("grande")
+    return router
+
+def test_half_open_allows_a_single_probe():
+    router = _open_router()
+    assert router.is_available("grande")
+    assert not router.is_available("grande")
+
+def test_failed_probe_reopens_and_successful_probe_closes():
+    router = _open_router()
+    router.is_available("grande")
+    router.record("grande", 0.1, False)
+    assert not router.is_healthy("grande")
+
+    assert router.is_available("grande")
+    router.record("grande", 0.1, True)
+    assert router.is_healthy("grande")
+
+def test_released_probe_can_be_taken_again():
+    router = _open_router()
+    assert router.is_available("grande")
+    router.release("grande")
+    assert router.is_available("grande")
+
+def test_cancelled_call_releases_the_probe():
+    router = _open_router()
+    service = GroqService("chave", router=router)
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(3600)
+
+    service._request = hang
+
+    async def scenario():
+        task = asyncio.ensure_future(
+            service.chat_completion("olá", context=RequestContext(user_id=1), model="grande")
+        )
+        await asyncio.sleep(0.01)
+        assert router.health["grande"].probing
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert not router.health["grande"].probing
+    assert router.is_available("grande")
@@ -0,0 +1,105 @@
+"""
+Testes da execução paralela de planos
+"""
+import asyncio
+
+import discord
+
+from bot.utils.action_registry import ActionRegistry
+from bot.utils.plan_executor import (
+    ALL_ROLES, EVERYTHING, INTERACTION, PlanExecutor, action_footprint, conflicts
+)
+
+async def _handler(executor, action, guild):
+    return "✅"
+
+def _registry() -> ActionRegistry:
+    registry = ActionRegistry()
+    for name in ("criar_canal", "deletar_canal", "criar_cargo", "dar_cargo", "mass_ban"):
+        registry.register(name, _handler)
+    registry.register("resposta", _handler, needs_interaction=True, api_cost=0)
+    return registry
+
+async def _plan(*actions):
+    for action in actions:
+        yield action
+
+def test_footprint_uses_discord_channel_names():
+    resources, route = action_footprint({"action": "criar_canal", "nome": "Bate Papo!"}, False, 1)
+    assert resources == {("canal", "bate-papo")}
+    assert route == "criar_canais"
+
+def test_footprints_conflict_on_shared_resources():
+    create, _ = action_footprint({"action": "criar_canal", "nome": "geral"}, False, 1)
+    delete, route = action_footprint({"action": "deletar_canal", "nome": "Geral"}, False, 1)
+    other, _ = action_footprint({"action": "criar_canal", "nome": "jogos"}, False, 1)
+    assert route == "canal:geral"
+    assert conflicts(create, delete)
+    assert not conflicts(create, other)
+
+def test_wildcards_and_unknown_effects_conflict():
+    role, _ = action_footprint({"action": "criar_cargo", "nome": "VIP"}, False, 1)
+    assert conflicts(role, frozenset({ALL_ROLES}))
+    unknown, _ = action_footprint({"action": "mass_ban"}, False, 1)
+    assert unknown == {EVERYTHING}
+    assert conflicts(unknown, role)
+    reply, route = action_footprint({"action": "resposta"}, True, 0)
+    assert reply == {INTERACTION}
+    assert route == "interacao"
+
+def test_dependent_actions_keep_plan_order_and_independent_ones_overlap():
+    executor = PlanExecutor(_registry())
+    log = []
+
+    async def execute(action):
+        log.append(("início", action["nome"]))
+        await asyncio.sleep(0.01)
+        log.append(("fim", action["nome"]))
+        return f"✅ {action['action']} {action['nome']}"
+
+    results = asyncio.run(executor.run(_plan(
+        {"action": "criar_canal", "nome": "geral"},
+        {"action": "criar_canal", "nome": "jogos"},
+        {"action": "deletar_canal", "nome": "geral"},
+    ), execute))
+
+    assert results == ["✅ criar_canal geral", "✅ criar_canal jogos", "✅ deletar_canal geral"]
+    assert log.index(("início", "jogos")) < log.index(("fim", "geral"))
+    assert log.index(("fim", "geral")) < log.index(("início", "geral"), 1)
+    assert executor.stats()["parallel_actions"] >= 1
+
+def test_failures_become_error_lines():
+    executor = PlanExecutor(_registry())
+
+    async def execute(action):
+        if action["nome"] == "sumiu":
+            raise discord.NotFound()
+        if action["nome"] == "quebrou":
+            raise RuntimeError("falha")
+        return "✅ ok"
+
+    results = asyncio.run(executor.run(_plan(
+        {"action": "deletar_canal", "nome": "sumiu"},
+        {"action": "deletar_canal", "nome": "quebrou"},
+        {"action": "criar_canal", "nome": "novo"},
+    ), execute))
+
+    assert results[0].startswith("❌")
+    assert results[1].startswith("❌")
+    assert results[2] == "✅ ok"
+
+def test_rejected_actions_do_not_run():
+    executor = PlanExecutor(_registry())
+    ran = []
+
+    async def execute(action):
+        ran.append(action["action"])
+        return "✅ ok"
+
+    results = asyncio.run(executor.run(
+        _plan({"action": "mass_ban"}, {"action": "criar_canal", "nome": "a"}),
+        execute,
+        reject=lambda action: "❌ Sem permissão" if action["action"] == "mass_ban" else None
+    ))
+    assert results == ["❌ Sem permissão", "✅ ok"]
+    assert ran == ["criar_canal"]
@@ -0,0 +1,47 @@
+"""
+Testes do cache de respostas
+"""
+import asyncio
+
+from bot.services.groq_service import GroqService
+from bot.services.response_cache import ResponseCache
+from bot.services.usage_tracker import UsageTracker
+
+def test_counters_track_hits_misses_and_evictions():
+    cache = ResponseCache(max_entries=1)
+
+    async def scenario():
+        assert await cache.get("a") is None
+        await cache.set("a", "resposta a")
+        assert await cache.get("a") == "resposta a"
+        await cache.set("b", "resposta b")
+        assert await cache.get("a") is None
+
+    asyncio.run(scenario())
+    stats = cache.stats()
+    assert (stats["hits_memory"], stats["misses"], stats["evictions"]) == (1, 2, 1)
+
+def test_expired_entries_are_counted():
+    cache = ResponseCache(ttl=0)
+
+    async def scenario():
+        await cache.set("a", "resposta")
+        return await cache.get("a")
+
+    assert asyncio.run(scenario()) is None
+    assert cache.stats()["expirations"] == 1
+
+def test_cache_metrics_are_exported_with_usage():
+    cache = ResponseCache()
+    usage = UsageTracker()
+    GroqService("chave", cache=cache, usage=usage)
+    cache.misses = 3
+    text = usage.export_metrics()
+    assert "skzgpt_response_cache_misses_total 3" in text
+    assert 'skzgpt_response_cache_hits_total{tier="memory"} 0' in text
+
+def test_key_depends_on_temperature_and_max_tokens():
+    key = ResponseCache.make_key("modelo", "sistema", "olá", 0.7, 300)
+    assert key == ResponseCache.make_key("modelo", "sistema", "Olá ", 0.7, 300)
+    assert key != ResponseCache.make_key("modelo", "sistema", "olá", 0.7, 1000)
+    assert key != ResponseCache.make_key("modelo", "sistema", "olá", 0.2, 300)
@@ -0,0 +1,34 @@
+"""
+Testes da RetryPolicy contra o servidor Groq simulado
+"""
+import asyncio
+
+from benchmarks.mock_groq_server import MockGroqServer, parse_distribution
+from bot.services.groq_service import ERROR_MESSAGE, GroqService
+from bot.services.request_context import RequestContext
+from bot.services.retry_policy import RetryPolicy
+
+async def _ask_mock_server():
+    server = MockGroqServer(ttft=parse_distribution("fixed:0"), token_rate=10000.0)
+    url = await server.start(port=0)
+    service = GroqService("chave", base_url=url, retry=RetryPolicy())
+    try:
+        context = RequestContext(guild_id=1, user_id=10)
+        key = service.keys.keys[0]
+        reply = await service.chat_completion("Olá, tudo bem?", context=context)
+        after_chat = key.tokens
+        parts = [part async for part in service.stream_completion("Conte uma curiosidade", context=context)]
+        return reply, "".join(parts), after_chat, key.tokens
+    finally:
+        await service.close()
+        await server.stop()
+
+def test_chat_and_stream_go_through_the_retry_policy():
+    reply, streamed, _, _ = asyncio.run(_ask_mock_server())
+    assert reply and reply != ERROR_MESSAGE
+    assert streamed and streamed != ERROR_MESSAGE
+
+def test_keys_record_the_usage_reported_by_the_server():
+    _, _, after_chat, total = asyncio.run(_ask_mock_server())
+    # Uso real do servidor simulado, inclusive o do último chunk do stream
+    assert 0 < after_chat < total
@@ -0,0 +1,53 @@
+"""
+Testes do SingleFlight
+"""
+import asyncio
+
+from bot.services.singleflight import SingleFlight
+
+async def _caller_after_cancel_starts_a_new_flight():
+    flight = SingleFlight("llm")
+    calls = []
+
+    async def fetch():
+        calls.append(len(calls))
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    first = asyncio.ensure_future(flight.do("chave", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    # O último interessado saiu, mas a tarefa cancelada ainda não terminou
+    await asyncio.sleep(0)
+    second = await flight.do("chave", fetch)
+    return second, calls, flight.stats()
+
+def test_caller_after_last_waiter_leaves_does_not_join_cancelled_flight():
+    result, calls, stats = asyncio.run(_caller_after_cancel_starts_a_new_flight())
+    assert result == 2
+    assert calls == [0, 1]
+    assert stats == {"leaders": 2, "coalesced": 0, "in_flight": 0}
+
+async def _cancelled_stream_is_not_joined():
+    flight = SingleFlight("llm")
+
+    async def produce():
+        for part in ("a", "b"):
+            await asyncio.sleep(0.01)
+            yield part
+
+    async def read():
+        return [part async for part in flight.stream("chave", produce)]
+
+    first = asyncio.ensure_future(read())
+    await asyncio.sleep(0)
+    first.cancel()
+    return await read()
+
+def test_stream_after_cancel_starts_a_new_stream():
+    assert asyncio.run(_cancelled_stream_is_not_joined()) == ["a", "b"]
+
+def test_export_metrics_labels_the_flight():
+    text = SingleFlight("gif").export_metrics()
+    assert 'skzgpt_singleflight_leaders_total{flight="gif"} 0' in text
+    assert "# TYPE skzgpt_singleflight_in_flight gauge" in text
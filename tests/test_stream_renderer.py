@@ -0,0 +1,39 @@
+"""
+Testes do StreamingRenderer
+"""
+import asyncio
+
+from bot.utils.stream_renderer import EMPTY_RESPONSE, StreamingRenderer
+
+async def _tokens(*tokens):
+    for token in tokens:
+        yield token
+
+def _render_all(*tokens, **kwargs):
+    calls = []
+
+    async def render(text, final):
+        calls.append((text, final))
+
+    renderer = StreamingRenderer(render, edit_interval=0, **kwargs)
+    text = asyncio.run(renderer.consume(_tokens(*tokens)))
+    return text, calls
+
+def test_final_render_has_full_text_without_cursor():
+    text, calls = _render_all("Olá", ", mundo")
+    assert text == "Olá, mundo"
+    assert calls[-1] == ("Olá, mundo", True)
+    assert all(rendered.endswith("▌") for rendered, final in calls if not final)
+
+def test_empty_stream_replaces_placeholder():
+    text, calls = _render_all()
+    assert text == ""
+    assert calls == [(EMPTY_RESPONSE, True)]
+
+def test_whitespace_only_stream_counts_as_empty():
+    _, calls = _render_all("  ", "\n")
+    assert calls[-1] == (EMPTY_RESPONSE, True)
+
+def test_long_text_is_truncated():
+    _, calls = _render_all("a" * 50, max_length=20)
+    assert calls[-1] == ("a" * 17 + "...", True)